@@ -0,0 +1,171 @@
+"""Benchmark the streaming bronze layer against the previous pandas implementation
+
+Every implementation runs in a fresh process so its peak memory can be measured.
+
+Usage:
+    python -m benchmarks.bronze_streaming --launches 1000000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from spacex_data_platform.ingestion.bronze.bronze_data import SpaceXBronze
+from spacex_data_platform.ingestion.constants import DATE_FORMAT, SPACEX_PROVIDER_CODE
+
+LAUNCH = {
+    "fairings": {
+        "reused": True,
+        "recovery_attempt": True,
+        "recovered": True,
+        "ships": ["5ea6ed2e080df4000697c909", "5ea6ed2f080df4000697c90c"],
+    },
+    "links": {
+        "patch": {
+            "small": "https://images2.imgbox.com/3b/c3/kd7H9FTQ_o.png",
+            "large": "https://images2.imgbox.com/79/1f/hBdiixIW_o.png",
+        },
+        "webcast": "https://youtu.be/UZkaE_9zwQQ",
+        "youtube_id": "UZkaE_9zwQQ",
+        "wikipedia": "https://en.wikipedia.org/wiki/Starlink",
+    },
+    "static_fire_date_utc": "2020-07-11T17:58:00.000Z",
+    "static_fire_date_unix": 1594490280,
+    "net": False,
+    "window": 0,
+    "rocket": "5e9d0d95eda69973a809d1ec",
+    "success": True,
+    "failures": [],
+    "details": "This mission will launch the twelfth batch of operational Starlink satellites",
+    "crew": [],
+    "ships": ["5ea6ed2f080df4000697c910", "5ee68c683c228f36bd5809b5"],
+    "capsules": [],
+    "payloads": ["5eb0e4d3b6c3bb0006eeb262"],
+    "launchpad": "5e9e4502f509092b78566f87",
+    "flight_number": 1,
+    "name": "Starlink-12 (v1.0)",
+    "date_utc": "2020-10-06T11:29:00.000Z",
+    "date_unix": 1601983740,
+    "date_local": "2020-10-06T07:29:00-04:00",
+    "date_precision": "hour",
+    "upcoming": False,
+    "cores": [
+        {
+            "core": "5e9e28a6f35918c0803b265c",
+            "flight": 7,
+            "gridfins": True,
+            "legs": True,
+            "reused": True,
+            "landing_attempt": True,
+            "landing_success": True,
+            "landing_type": "ASDS",
+            "landpad": "5e9e3032383ecb6bb234e7ca",
+        }
+    ],
+    "auto_update": True,
+    "tbd": False,
+    "launch_library_id": None,
+}
+
+
+def write_synthetic_launches(raw_data_path: str, launches: int) -> None:
+    """Write a raw launches file repeating a real launch with unique ids
+
+    Args:
+        raw_data_path (str): path of the raw file
+        launches (int): number of launches
+    """
+    os.makedirs(os.path.dirname(raw_data_path), exist_ok=True)
+    with open(raw_data_path, "w") as file:
+        file.write("[")
+        for number in range(launches):
+            launch = {**LAUNCH, "id": f"{number:024x}", "flight_number": number}
+            file.write(("," if number else "") + json.dumps(launch))
+        file.write("]")
+
+
+def pandas_bronze(raw_data_path: str) -> str:
+    """Previous bronze implementation loading the whole raw file with pandas
+
+    Args:
+        raw_data_path (str): path of the raw file
+
+    Returns:
+        str: path of the bronze file
+    """
+    df = pd.read_json(raw_data_path)
+    bronzified_df = df.set_index("id", verify_integrity=True)
+    bronzified_df["create_date"] = datetime.now().strftime(DATE_FORMAT)
+    bronzified_df["provider_code"] = SPACEX_PROVIDER_CODE
+    data_path = raw_data_path.replace("raw", "bronze").replace(
+        ".json", "_pandas.parquet"
+    )
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    bronzified_df.reset_index().to_parquet(data_path)
+    return data_path
+
+
+def streaming_bronze(raw_data_path: str) -> str:
+    """Streaming bronze implementation
+
+    Args:
+        raw_data_path (str): path of the raw file
+
+    Returns:
+        str: path of the bronze file
+    """
+    return SpaceXBronze().create_bronze(raw_data_path)
+
+
+def measure(implementation, raw_data_path: str, results) -> None:
+    """Run an implementation and report its wall time and peak memory
+
+    Args:
+        implementation (_type_): bronze implementation
+        raw_data_path (str): path of the raw file
+        results (_type_): queue where the measures are put
+    """
+    start = time.perf_counter()
+    implementation(raw_data_path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((elapsed, peak_mb))
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--launches", type=int, default=1_000_000)
+    parser.add_argument("--implementations", nargs="+", default=["pandas", "streaming"])
+    args = parser.parse_args()
+    implementations = {"pandas": pandas_bronze, "streaming": streaming_bronze}
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as data_path:
+        raw_data_path = f"{data_path}/raw/benchmark/spacex_data.json"
+        write_synthetic_launches(raw_data_path, args.launches)
+        size_mb = os.path.getsize(raw_data_path) / 1024**2
+        print(f"{args.launches} launches, raw file of {size_mb:.0f} MB")
+        for name in args.implementations:
+            results = context.Queue()
+            process = context.Process(
+                target=measure, args=(implementations[name], raw_data_path, results)
+            )
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"{name:>10}: failed with exit code {process.exitcode}")
+                continue
+            elapsed, peak_mb = results.get()
+            print(f"{name:>10}: {elapsed:8.2f} s, peak memory {peak_mb:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark the vectorized cores flattening against the previous `explode` and
+`apply(pd.Series)` implementation
+
+Every implementation runs in a fresh process so its peak memory can be measured.
+
+Usage:
+    python -m benchmarks.cores_flattening --launches 10000 100000 1000000
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+from datetime import datetime, timezone
+
+import pandas as pd
+import pandera
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from benchmarks.bronze_streaming import LAUNCH, measure
+from spacex_data_platform.ingestion.bronze.schemas.launches import BRONZE_SCHEMA
+from spacex_data_platform.ingestion.constants import SPACEX_PROVIDER_CODE
+from spacex_data_platform.ingestion.silver.cores_data import SpaceXCores
+from spacex_data_platform.ingestion.silver.schemas.cores_flights import (
+    CoresFlightsSchema,
+)
+
+BRONZE_COLUMNS = ["id", "create_date", "provider_code", "cores"]
+# The previous implementation has no surrogate keys, the rest of the schema is the
+# same
+LEGACY_SCHEMA = CoresFlightsSchema.to_schema().remove_columns(list(SpaceXCores.id_keys))
+
+
+def write_synthetic_bronze(bronze_data_path: str, launches: int) -> None:
+    """Write the bronze columns used by the cores, every twentieth launch is a
+    Falcon Heavy with three cores and every fiftieth one has an unknown core
+
+    Args:
+        bronze_data_path (str): path of the bronze file
+        launches (int): number of launches
+    """
+    core = LAUNCH["cores"][0]
+    cores = []
+    for number in range(launches):
+        launch_cores = [{**core, "core": f"{number:024x}"}]
+        if number % 20 == 0:
+            launch_cores += [{**core, "core": f"{number:023x}{side}"} for side in "ab"]
+        if number % 50 == 1:
+            launch_cores = [{**core, "core": None}]
+        cores.append(launch_cores)
+    schema = pa.schema([BRONZE_SCHEMA.field(name) for name in BRONZE_COLUMNS])
+    table = pa.Table.from_pydict(
+        {
+            "id": [f"{number:024x}" for number in range(launches)],
+            "create_date": [datetime.now(timezone.utc)] * launches,
+            "provider_code": pa.array(
+                [SPACEX_PROVIDER_CODE] * launches
+            ).dictionary_encode(),
+            "cores": cores,
+        },
+        schema=schema,
+    )
+    pq.write_table(table, bronze_data_path)
+
+
+@pandera.check_output(LEGACY_SCHEMA)
+def legacy_cores_flight_data(bronze_df: pd.DataFrame) -> pd.DataFrame:
+    """Previous cores flattening with `explode` and `apply(pd.Series)`
+
+    Args:
+        bronze_df (pd.DataFrame): bronze data
+
+    Returns:
+        pd.DataFrame: cores flight data
+    """
+    cores_flight_data = bronze_df[BRONZE_COLUMNS].explode("cores")
+    cores_dict = cores_flight_data["cores"].apply(pd.Series)
+    cores_flight_data = pd.concat(
+        [cores_flight_data.drop("cores", axis=1), cores_dict], axis=1
+    )
+    return cores_flight_data.dropna(subset=["core"])
+
+
+def legacy_cores(bronze_data_path: str) -> pd.DataFrame:
+    """Read the bronze data and flatten the cores with the previous implementation
+
+    Args:
+        bronze_data_path (str): path of the bronze file
+
+    Returns:
+        pd.DataFrame: cores flight data
+    """
+    return legacy_cores_flight_data(pd.read_parquet(bronze_data_path))
+
+
+def vectorized_cores(bronze_data_path: str) -> pd.DataFrame:
+    """Read the bronze data and flatten the cores with the vectorized implementation
+
+    Args:
+        bronze_data_path (str): path of the bronze file
+
+    Returns:
+        pd.DataFrame: cores flight data
+    """
+    return SpaceXCores.generate_cores_flight_data(pd.read_parquet(bronze_data_path))
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--launches", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--implementations", nargs="+", default=["legacy", "vectorized"]
+    )
+    args = parser.parse_args()
+    implementations = {"legacy": legacy_cores, "vectorized": vectorized_cores}
+
+    context = multiprocessing.get_context("spawn")
+    for launches in args.launches:
+        with tempfile.TemporaryDirectory() as data_path:
+            bronze_data_path = f"{data_path}/spacex_data.parquet"
+            write_synthetic_bronze(bronze_data_path, launches)
+            print(f"{launches} launches")
+            for name in args.implementations:
+                results = context.Queue()
+                process = context.Process(
+                    target=measure,
+                    args=(implementations[name], bronze_data_path, results),
+                )
+                process.start()
+                process.join()
+                if process.exitcode != 0:
+                    print(f"{name:>10}: failed with exit code {process.exitcode}")
+                    continue
+                elapsed, peak_mb = results.get()
+                print(f"{name:>10}: {elapsed:8.2f} s, peak memory {peak_mb:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
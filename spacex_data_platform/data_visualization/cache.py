@@ -0,0 +1,215 @@
+"""Module with the cache of the results of the dashboard queries, keyed by the
+content of the snapshot, the SQL and its parameters"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import duckdb
+import pyarrow as pa
+
+# Bytes of the results kept in memory and on disk, the least recently used results
+# are evicted beyond them
+MAX_MEMORY_BYTES = 64 * 2**20
+MAX_DISK_BYTES = 512 * 2**20
+# Extension of the Arrow IPC files of the results on disk
+RESULT_SUFFIX = ".arrow"
+
+
+def normalize_sql(sql: str) -> str:
+    """Normalize the whitespace of a query, so the same query with another
+    indentation has the same key. The values are bound as parameters, so there are
+    no literals whose spaces matter.
+
+    Args:
+        sql (str): The query
+
+    Returns:
+        str: The query with its whitespace collapsed into single spaces
+    """
+    return " ".join(sql.split())
+
+
+def result_key(snapshot_hash: str, sql: str, parameters: list | None = None) -> str:
+    """Get the key of the result of a query over a snapshot
+
+    Args:
+        snapshot_hash (str): The hash of the content of the snapshot
+        sql (str): The query
+        parameters (list | None, optional): The values of its `?` parameters.
+            Defaults to None.
+
+    Returns:
+        str: sha256 of the snapshot hash, the normalized query and the parameters
+    """
+    payload = json.dumps(
+        [snapshot_hash, normalize_sql(sql), parameters or []], default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class QueryCache:
+    """Class to cache the results of the queries as Arrow tables, in memory and in
+    Arrow IPC files on disk, both evicting the least recently used results beyond
+    their size
+
+    The snapshots are never modified once written, so a result is valid as long as
+    the content of its snapshot is the same and it is never invalidated. The results
+    on disk survive the restarts of the server. The cache is shared by the sessions
+    of the server, so it is safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = "data/cache/queries",
+        max_memory_bytes: int = MAX_MEMORY_BYTES,
+        max_disk_bytes: int = MAX_DISK_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, pa.Table] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            # The files used last were the last ones modified
+            files = sorted(
+                (entry for entry in os.scandir(cache_dir) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime_ns,
+            )
+            for entry in files:
+                if entry.name.endswith(RESULT_SUFFIX):
+                    self._disk[entry.name.removesuffix(RESULT_SUFFIX)] = (
+                        entry.stat().st_size
+                    )
+                    self._disk_bytes += entry.stat().st_size
+            self._evict_disk()
+
+    def fetch(
+        self,
+        connection: duckdb.DuckDBPyConnection,
+        snapshot_hash: str,
+        sql: str,
+        parameters: list | None = None,
+    ) -> pa.Table:
+        """Get the result of a query over a snapshot from the cache, running it only
+        if it is not cached
+
+        Args:
+            connection (duckdb.DuckDBPyConnection): The connection with the views of
+                the snapshot
+            snapshot_hash (str): The hash of the content of the snapshot
+            sql (str): The query
+            parameters (list | None, optional): The values of its `?` parameters.
+                Defaults to None.
+
+        Returns:
+            pa.Table: The result of the query
+        """
+        key = result_key(snapshot_hash, sql, parameters)
+        result = self.get(key)
+        if result is None:
+            result = connection.execute(sql, parameters).arrow()
+            self.put(key, result)
+        return result
+
+    def get(self, key: str) -> pa.Table | None:
+        """Get a result from memory or, promoting it to memory, from disk
+
+        Args:
+            key (str): The key of the result, see `result_key`
+
+        Returns:
+            pa.Table | None: The result, None if it is not cached
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return self._memory[key]
+            if key not in self._disk:
+                self.misses += 1
+                return None
+            try:
+                with pa.OSFile(self._result_path(key)) as file:
+                    result = pa.ipc.open_file(file).read_all()
+                os.utime(self._result_path(key))
+            except (OSError, pa.ArrowInvalid):
+                # Removed or truncated out of the cache
+                self._disk_bytes -= self._disk.pop(key)
+                self.misses += 1
+                return None
+            self._disk.move_to_end(key)
+            self.hits["disk"] += 1
+            self._put_memory(key, result)
+            return result
+
+    def put(self, key: str, result: pa.Table) -> None:
+        """Cache a result in memory and on disk, unless it is larger than the cache
+
+        Args:
+            key (str): The key of the result, see `result_key`
+            result (pa.Table): The result
+        """
+        with self._lock:
+            self._put_memory(key, result)
+            if self.cache_dir is None or key in self._disk:
+                return
+            part_path = f"{self._result_path(key)}.part"
+            with pa.OSFile(part_path, "wb") as file:
+                with pa.ipc.new_file(file, result.schema) as writer:
+                    writer.write_table(result)
+            size = os.path.getsize(part_path)
+            if size > self.max_disk_bytes:
+                os.remove(part_path)
+                return
+            os.replace(part_path, self._result_path(key))
+            self._disk[key] = size
+            self._disk_bytes += size
+            self._evict_disk()
+
+    def stats(self) -> dict[str, int]:
+        """Get the counters of the cache
+
+        Returns:
+            dict[str, int]: The hits in memory and on disk, the misses and the number
+                and bytes of the results in memory and on disk
+        """
+        with self._lock:
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "memory_results": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_results": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _result_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{RESULT_SUFFIX}")
+
+    def _put_memory(self, key: str, result: pa.Table) -> None:
+        if key in self._memory or result.nbytes > self.max_memory_bytes:
+            return
+        self._memory[key] = result
+        self._memory_bytes += result.nbytes
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._result_path(key))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,285 @@
+"""Module to compare the silver tables of two data versions with DuckDB, by the
+primary key of the tables and a hash of their rows"""
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+
+from spacex_data_platform.data_visualization.cache import QueryCache
+from spacex_data_platform.data_visualization.queries import (
+    execute,
+    get_table_location,
+    identifier,
+    parquet_source,
+)
+
+# Primary key of every silver table that can be compared
+DIFF_KEYS = {"fairings": ["id"], "cores_flight": ["id", "core"]}
+# Columns that change without a change of the launch: the date the row was created
+# and the partition columns of the partitioned datasets
+IGNORED_COLUMNS = ("create_date", "year", "month")
+# Kinds of the rows of a diff
+CHANGES = ("added", "removed", "changed")
+
+
+def source_columns(connection: duckdb.DuckDBPyConnection, source: str) -> list[str]:
+    """Get the columns of a parquet source without reading its rows
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection
+        source (str): The `read_parquet` call of the table
+
+    Returns:
+        list[str]: The columns of the table
+    """
+    return [
+        row[0]
+        for row in connection.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    ]
+
+
+def diff_query(
+    connection: duckdb.DuckDBPyConnection,
+    old_location: str,
+    new_location: str,
+    keys: list[str],
+    ignored_columns: tuple[str, ...] = IGNORED_COLUMNS,
+) -> tuple[str, list[str]]:
+    """Get the query of the diff of two versions of a table
+
+    The key and the hash of every row of both versions are compared first, so the
+    joins only keep those two columns. The added and removed rows are anti joins of
+    the keys and the changed rows are the keys with another hash, the only ones
+    whose whole rows are joined to flag their changed columns.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection
+        old_location (str): The parquet file or dataset of the old version
+        new_location (str): The parquet file or dataset of the new version
+        keys (list[str]): The primary key of the table
+        ignored_columns (tuple[str, ...], optional): The columns not compared.
+            Defaults to IGNORED_COLUMNS.
+
+    Returns:
+        tuple[str, list[str]]: The query and the compared columns, the columns of
+            both versions but the keys and the ignored ones
+    """
+    old_source, new_source = parquet_source(old_location), parquet_source(new_location)
+    old_columns = set(source_columns(connection, old_source))
+    columns = [
+        column
+        for column in source_columns(connection, new_source)
+        if column in old_columns
+        and column not in keys
+        and column not in ignored_columns
+    ]
+    key_list = ", ".join(identifier(key) for key in keys)
+    row_hash = f"hash({', '.join(identifier(column) for column in columns)})"
+    new_values = ", ".join(f"new.{identifier(column)}" for column in columns)
+    old_values = ", ".join(f"old.{identifier(column)}" for column in columns)
+    no_flags = ", ".join(
+        f"NULL::BOOLEAN AS {identifier(f'{column}_changed')}" for column in columns
+    )
+    flags = ", ".join(
+        f"old.{identifier(column)} IS DISTINCT FROM new.{identifier(column)} "
+        f"AS {identifier(f'{column}_changed')}"
+        for column in columns
+    )
+    query = f"""
+WITH old_hashes AS (SELECT {key_list}, {row_hash} AS row_hash FROM {old_source}),
+new_hashes AS (SELECT {key_list}, {row_hash} AS row_hash FROM {new_source}),
+changed_keys AS (
+    SELECT {key_list}
+    FROM new_hashes JOIN old_hashes USING ({key_list})
+    WHERE new_hashes.row_hash != old_hashes.row_hash
+)
+SELECT 'added' AS change, {key_list}, {new_values}, {no_flags}
+    FROM {new_source} AS new ANTI JOIN old_hashes USING ({key_list})
+UNION ALL
+SELECT 'removed' AS change, {key_list}, {old_values}, {no_flags}
+    FROM {old_source} AS old ANTI JOIN new_hashes USING ({key_list})
+UNION ALL
+SELECT 'changed' AS change, {key_list}, {new_values}, {flags}
+    FROM changed_keys
+    JOIN {new_source} AS new USING ({key_list})
+    JOIN {old_source} AS old USING ({key_list})
+"""
+    return query, columns
+
+
+def table_diff_query(
+    connection: duckdb.DuckDBPyConnection,
+    table: str,
+    old_create_date: str,
+    new_create_date: str,
+    data_dir: str = "data",
+) -> tuple[str, list[str]]:
+    """Get the query of the diff of a silver table in two data versions
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection
+        table (str): The silver table, one of `DIFF_KEYS`
+        old_create_date (str): The old data version
+        new_create_date (str): The new data version
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+
+    Raises:
+        ValueError: if the table cannot be compared
+
+    Returns:
+        tuple[str, list[str]]: The query and the compared columns
+    """
+    if table not in DIFF_KEYS:
+        raise ValueError(f"Unknown table {table!r}, use one of {list(DIFF_KEYS)}")
+    return diff_query(
+        connection,
+        get_table_location(old_create_date, table, data_dir),
+        get_table_location(new_create_date, table, data_dir),
+        DIFF_KEYS[table],
+    )
+
+
+def diff_table(
+    connection: duckdb.DuckDBPyConnection,
+    table: str,
+    old_create_date: str,
+    new_create_date: str,
+    batch_size: int = 10_000,
+    data_dir: str = "data",
+) -> pa.RecordBatchReader:
+    """Compare a silver table in two data versions, streaming the added, removed
+    and changed rows in batches so the diff of large tables runs in bounded memory
+
+    Every row has its `change`, its key, the values of the new version (of the old
+    one for the removed rows) and a `<column>_changed` flag for every compared
+    column, null for the added and removed rows.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection
+        table (str): The silver table, one of `DIFF_KEYS`
+        old_create_date (str): The old data version
+        new_create_date (str): The new data version
+        batch_size (int, optional): The rows of every batch. Defaults to 10_000.
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+
+    Raises:
+        ValueError: if the table cannot be compared
+
+    Returns:
+        pa.RecordBatchReader: The batches of the rows of the diff
+    """
+    query, _ = table_diff_query(
+        connection, table, old_create_date, new_create_date, data_dir
+    )
+    return connection.execute(query).fetch_record_batch(batch_size)
+
+
+def diff_hash(snapshot_hashes: tuple[str | None, str | None] | None) -> str | None:
+    """Get the key of the cached diffs of two snapshots
+
+    Args:
+        snapshot_hashes (tuple[str | None, str | None] | None): The hashes of the
+            content of the old and new snapshots
+
+    Returns:
+        str | None: Both hashes, None if any of them is unknown so the diff is not
+            cached
+    """
+    if snapshot_hashes is None or None in snapshot_hashes:
+        return None
+    return ":".join(snapshot_hashes)
+
+
+def diff_preview(
+    connection: duckdb.DuckDBPyConnection,
+    table: str,
+    old_create_date: str,
+    new_create_date: str,
+    rows: int,
+    data_dir: str = "data",
+    cache: QueryCache | None = None,
+    snapshot_hashes: tuple[str | None, str | None] | None = None,
+) -> pd.DataFrame:
+    """Get the first rows of the diff of a silver table in two data versions,
+    through the cache of the results as the versions never change
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection
+        table (str): The silver table, one of `DIFF_KEYS`
+        old_create_date (str): The old data version
+        new_create_date (str): The new data version
+        rows (int): The number of rows
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+        cache (QueryCache | None, optional): The cache of the results. Defaults to
+            None.
+        snapshot_hashes (tuple[str | None, str | None] | None, optional): The hashes
+            of the content of the old and new snapshots, the key of the cached
+            diff. Defaults to None, not cached.
+
+    Raises:
+        ValueError: if the table cannot be compared
+
+    Returns:
+        pd.DataFrame: The rows of the diff, see `diff_table`
+    """
+    query, _ = table_diff_query(
+        connection, table, old_create_date, new_create_date, data_dir
+    )
+    return execute(
+        connection,
+        f"SELECT * FROM ({query}) LIMIT ?",
+        [rows],
+        cache,
+        diff_hash(snapshot_hashes),
+    )
+
+
+def diff_summary(
+    connection: duckdb.DuckDBPyConnection,
+    table: str,
+    old_create_date: str,
+    new_create_date: str,
+    data_dir: str = "data",
+    cache: QueryCache | None = None,
+    snapshot_hashes: tuple[str | None, str | None] | None = None,
+) -> dict[str, int]:
+    """Count the added, removed and changed rows of a silver table in two data
+    versions, and the changed rows of every compared column
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection
+        table (str): The silver table, one of `DIFF_KEYS`
+        old_create_date (str): The old data version
+        new_create_date (str): The new data version
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+        cache (QueryCache | None, optional): The cache of the results. Defaults to
+            None.
+        snapshot_hashes (tuple[str | None, str | None] | None, optional): The hashes
+            of the content of the old and new snapshots, the key of the cached
+            diff. Defaults to None, not cached.
+
+    Raises:
+        ValueError: if the table cannot be compared
+
+    Returns:
+        dict[str, int]: The number of rows of every change and of every
+            `<column>_changed` flag
+    """
+    query, columns = table_diff_query(
+        connection, table, old_create_date, new_create_date, data_dir
+    )
+    names = [*CHANGES, *(f"{column}_changed" for column in columns)]
+    counts = [f"count_if(change = '{change}')" for change in CHANGES] + [
+        f"count_if({identifier(f'{column}_changed')})" for column in columns
+    ]
+    summary = execute(
+        connection,
+        "SELECT "
+        + ", ".join(
+            f"{count} AS {identifier(name)}" for count, name in zip(counts, names)
+        )
+        + f" FROM ({query})",
+        cache=cache,
+        snapshot_hash=diff_hash(snapshot_hashes),
+    )
+    return {name: int(summary[name].iloc[0]) for name in names}
@@ -0,0 +1,363 @@
+"""Module with the DuckDB views over the parquet files of a data version and the
+parameterized queries of the dashboard"""
+
+import os
+
+import duckdb
+import pandas as pd
+
+from spacex_data_platform.data_visualization.cache import QueryCache
+
+# Tables of every layer with a view in the schema of the layer, as `silver.fairings`
+LAYER_TABLES = {
+    "silver": ["fairings", "cores_flight", "core_timelines"],
+    "gold": ["launch_dates", "core_timelines", "core_usage", "monthly_launches"],
+}
+# Columns identifying the rows of every view, breaking the ties of the sort column
+TABLE_KEYS = {
+    "silver.fairings": ["id"],
+    "silver.cores_flight": ["id", "core_key"],
+    "silver.core_timelines": ["id", "core_key"],
+    "gold.launch_dates": ["id"],
+    "gold.core_timelines": ["id", "core_key"],
+    "gold.core_usage": ["core_key"],
+    "gold.monthly_launches": ["month"],
+}
+# SQL conditions of the column filters of the table pages, with the value bound
+FILTER_OPERATORS = {
+    "=": "{} = ?",
+    "!=": "{} != ?",
+    "<": "{} < ?",
+    "<=": "{} <= ?",
+    ">": "{} > ?",
+    ">=": "{} >= ?",
+    "contains": "contains(lower(CAST({} AS VARCHAR)), lower(?))",
+}
+# Queries of the assessment questions, with `?` parameters bound on execution
+QUERIES = {
+    "max_number_of_times_a_core_has_been_used": """
+SELECT core, max_flight AS max_number_of_times_used
+    FROM gold.core_usage
+ORDER BY max_flight DESC LIMIT 1
+""",
+    "cores_used_in_less_than_x_days": """
+SELECT id, core, date_utc, previous_id, previous_date_utc, gap_days
+    FROM gold.core_timelines
+WHERE gap_days < ?
+""",
+    "months_with_more_than_x_launches": """
+SELECT month, launches AS number_of_launches
+    FROM gold.monthly_launches
+WHERE launches > ?
+""",
+}
+
+
+def get_table_location(create_date: str, table: str, data_dir: str = "data") -> str:
+    """Get the location of a silver table, the directory of the dataset if it is
+    partitioned or its parquet file
+
+    Args:
+        create_date (str): The data version
+        table (str): The name of the table
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+
+    Returns:
+        str: The location of the table
+    """
+    location = f"{data_dir}/silver/{create_date}/{table}"
+    return location if os.path.isdir(location) else f"{location}.parquet"
+
+
+def get_gold_location(create_date: str, data_dir: str = "data") -> str:
+    """Get the location of the gold tables of a data version
+
+    Args:
+        create_date (str): The data version
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+
+    Returns:
+        str: The directory with a parquet file per gold table
+    """
+    return f"{data_dir}/gold/{create_date}/spacex_data"
+
+
+def parquet_source(location: str) -> str:
+    """Get the DuckDB table function reading a parquet file or a hive partitioned
+    dataset, so the filters on the partition columns skip the other files
+
+    Args:
+        location (str): The parquet file or the directory of the dataset
+
+    Returns:
+        str: The `read_parquet` call of the location
+    """
+    if os.path.isdir(location):
+        location = os.path.join(location, "**", "*.parquet")
+        return f"read_parquet('{quote(location)}', hive_partitioning = true)"
+    return f"read_parquet('{quote(location)}')"
+
+
+def quote(value: str) -> str:
+    """Escape a value for a SQL string literal, as the paths of the views cannot be
+    bound as parameters
+
+    Args:
+        value (str): The value
+
+    Returns:
+        str: The value with its single quotes doubled
+    """
+    return value.replace("'", "''")
+
+
+def create_views(
+    connection: duckdb.DuckDBPyConnection, create_date: str, data_dir: str = "data"
+) -> list[str]:
+    """Create the views of the silver and gold tables of a data version over their
+    parquet files, replacing the ones of the previous version. The tables are read
+    by DuckDB when queried, never loaded in memory.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection of the session
+        create_date (str): The data version
+        data_dir (str, optional): The directory of the data. Defaults to "data".
+
+    Returns:
+        list[str]: The views of the tables that exist in the data version
+    """
+    locations = {
+        f"silver.{table}": get_table_location(create_date, table, data_dir)
+        for table in LAYER_TABLES["silver"]
+    } | {
+        f"gold.{table}": os.path.join(
+            get_gold_location(create_date, data_dir), f"{table}.parquet"
+        )
+        for table in LAYER_TABLES["gold"]
+    }
+    views = []
+    for layer in LAYER_TABLES:
+        connection.execute(f"CREATE SCHEMA IF NOT EXISTS {layer}")
+    for view, location in locations.items():
+        if os.path.exists(location):
+            connection.execute(
+                f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM {parquet_source(location)}"
+            )
+            views.append(view)
+        else:
+            connection.execute(f"DROP VIEW IF EXISTS {view}")
+    return views
+
+
+def execute(
+    connection: duckdb.DuckDBPyConnection,
+    sql: str,
+    parameters: list | None = None,
+    cache: QueryCache | None = None,
+    snapshot_hash: str | None = None,
+) -> pd.DataFrame:
+    """Run a query with its parameters bound, through the cache of the results if
+    given with the hash of the snapshot of the views
+
+    The query is parsed and planned on every run: the DuckDB `PREPARE` statements
+    can only be executed with the values in the SQL, not bound as `?` parameters,
+    so the reruns of the same query are served by the cache instead.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection with the views
+        sql (str): The query
+        parameters (list | None, optional): The values of its `?` parameters.
+            Defaults to None.
+        cache (QueryCache | None, optional): The cache of the results. Defaults to
+            None, the query always runs.
+        snapshot_hash (str | None, optional): The hash of the content of the
+            snapshot of the views, see `SnapshotCatalog.snapshot_hash`. Defaults to
+            None, the query always runs.
+
+    Returns:
+        pd.DataFrame: The result of the query
+    """
+    if cache is None or snapshot_hash is None:
+        return connection.execute(sql, parameters).df()
+    return cache.fetch(connection, snapshot_hash, sql, parameters).to_pandas()
+
+
+def run_query(
+    connection: duckdb.DuckDBPyConnection,
+    name: str,
+    parameters: list | None = None,
+    cache: QueryCache | None = None,
+    snapshot_hash: str | None = None,
+) -> pd.DataFrame:
+    """Run an assessment query with its parameters bound, the text of every query is
+    constant so the values never reach the SQL
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection with the views
+        name (str): The name of the query in `QUERIES`
+        parameters (list | None, optional): The values of its `?` parameters.
+            Defaults to None.
+        cache (QueryCache | None, optional): The cache of the results. Defaults to
+            None.
+        snapshot_hash (str | None, optional): The hash of the content of the
+            snapshot of the views. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The result of the query
+    """
+    return execute(connection, QUERIES[name], parameters, cache, snapshot_hash)
+
+
+def view_columns(connection: duckdb.DuckDBPyConnection, view: str) -> list[str]:
+    """Get the columns of a view of a table
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection with the views
+        view (str): The view, as `silver.fairings`
+
+    Raises:
+        ValueError: if the view is not one of the views of the tables
+
+    Returns:
+        list[str]: The columns of the view
+    """
+    layer, _, table = view.partition(".")
+    if table not in LAYER_TABLES.get(layer, []):
+        raise ValueError(f"Unknown view {view!r}")
+    return [row[0] for row in connection.execute(f"DESCRIBE {view}").fetchall()]
+
+
+def identifier(name: str) -> str:
+    """Quote a column name for SQL
+
+    Args:
+        name (str): The column name
+
+    Returns:
+        str: The column name between double quotes
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def filter_clause(
+    filters: list[tuple[str, str, object]] | None, columns: list[str]
+) -> tuple[str, list]:
+    """Get the WHERE clause of some column filters, with their values as parameters
+
+    Args:
+        filters (list[tuple[str, str, object]] | None): The filters, as
+            `[("flight", ">", 1), ("core", "contains", "B10")]`, with an operator of
+            `FILTER_OPERATORS`
+        columns (list[str]): The columns of the view
+
+    Raises:
+        ValueError: if a column or an operator is unknown
+
+    Returns:
+        tuple[str, list]: The WHERE clause, empty without filters, and its parameters
+    """
+    conditions, parameters = [], []
+    for column, operator, value in filters or []:
+        if column not in columns:
+            raise ValueError(f"Unknown column {column!r}")
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(
+                f"Unknown operator {operator!r}, use one of {list(FILTER_OPERATORS)}"
+            )
+        conditions.append(FILTER_OPERATORS[operator].format(identifier(column)))
+        parameters.append(value)
+    if not conditions:
+        return "", []
+    return "WHERE " + " AND ".join(conditions), parameters
+
+
+def count_rows(
+    connection: duckdb.DuckDBPyConnection,
+    view: str,
+    filters: list[tuple[str, str, object]] | None = None,
+    cache: QueryCache | None = None,
+    snapshot_hash: str | None = None,
+) -> int:
+    """Get the number of rows of a view matching some column filters, DuckDB takes
+    it from the metadata of the parquet files if there are no filters
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection with the views
+        view (str): The view, as `silver.fairings`
+        filters (list[tuple[str, str, object]] | None, optional): The column filters,
+            see `filter_clause`. Defaults to None.
+        cache (QueryCache | None, optional): The cache of the results. Defaults to
+            None.
+        snapshot_hash (str | None, optional): The hash of the content of the
+            snapshot of the views. Defaults to None.
+
+    Raises:
+        ValueError: if the view, a column or an operator is unknown
+
+    Returns:
+        int: The number of rows matching the filters
+    """
+    where, parameters = filter_clause(filters, view_columns(connection, view))
+    counts = execute(
+        connection,
+        f"SELECT count(*) AS count FROM {view} {where}",
+        parameters,
+        cache,
+        snapshot_hash,
+    )
+    return int(counts["count"].iloc[0])
+
+
+def page(
+    connection: duckdb.DuckDBPyConnection,
+    view: str,
+    page_number: int = 0,
+    page_size: int = 50,
+    sort_by: str | None = None,
+    descending: bool = False,
+    filters: list[tuple[str, str, object]] | None = None,
+    cache: QueryCache | None = None,
+    snapshot_hash: str | None = None,
+) -> pd.DataFrame:
+    """Get a page of the rows of a view, sorted and filtered by DuckDB over the
+    parquet files so only the rows of the page are loaded, whatever the size of
+    the table
+
+    The rows are sorted by the sort column and then by the key of the view, see
+    `TABLE_KEYS`, so the pages are stable and every row is in a single page.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection with the views
+        view (str): The view, as `silver.fairings`
+        page_number (int, optional): The page, starting at 0. Defaults to 0.
+        page_size (int, optional): The rows of every page. Defaults to 50.
+        sort_by (str | None, optional): The column to sort by. Defaults to None,
+            the first column.
+        descending (bool, optional): Sort in descending order. Defaults to False.
+        filters (list[tuple[str, str, object]] | None, optional): The column filters,
+            see `filter_clause`. Defaults to None.
+        cache (QueryCache | None, optional): The cache of the results. Defaults to
+            None.
+        snapshot_hash (str | None, optional): The hash of the content of the
+            snapshot of the views. Defaults to None.
+
+    Raises:
+        ValueError: if the view, a column or an operator is unknown
+
+    Returns:
+        pd.DataFrame: The rows of the page
+    """
+    columns = view_columns(connection, view)
+    sort_by = sort_by or columns[0]
+    if sort_by not in columns:
+        raise ValueError(f"Unknown column {sort_by!r}")
+    where, parameters = filter_clause(filters, columns)
+    order = [f"{identifier(sort_by)} {'DESC' if descending else 'ASC'} NULLS LAST"]
+    order += [identifier(key) for key in TABLE_KEYS[view] if key != sort_by]
+    return execute(
+        connection,
+        f"SELECT * FROM {view} {where} ORDER BY {', '.join(order)} LIMIT ? OFFSET ?",
+        parameters + [page_size, page_number * page_size],
+        cache,
+        snapshot_hash,
+    )
@@ -1,23 +1,83 @@
 import os
+import time
+from collections.abc import Callable
 from urllib.error import URLError
 
 import duckdb
 import pandas as pd
 import streamlit as st
 
-from spacex_data_platform.__main__ import Main
+from spacex_data_platform.data_visualization.cache import QueryCache
+from spacex_data_platform.data_visualization.diff import (
+    DIFF_KEYS,
+    diff_preview,
+    diff_summary,
+)
+from spacex_data_platform.data_visualization.queries import (
+    FILTER_OPERATORS,
+    QUERIES,
+    count_rows,
+    create_views,
+    page,
+    run_query,
+    view_columns,
+)
+from spacex_data_platform.orchestration.background import PipelineRunner
+from spacex_data_platform.orchestration.catalog import SnapshotCatalog
 
-spacex_ingestion_main = Main()
+# Manifest of the snapshots recorded by the pipeline
+CATALOG_PATH = "data/catalog.json"
+# Arrow IPC files of the cached results of the queries
+QUERY_CACHE_DIR = "data/cache/queries"
+# Statuses of the tasks that did not end yet
+ACTIVE_STATUSES = ("pending", "running")
+# Rows of the pages of the tables
+PAGE_SIZES = [25, 50, 100, 500]
+# Rows of the diff of two versions shown in the page
+DIFF_PREVIEW_ROWS = 500
+# Seconds between the reruns of the progress of the ingestion
+PROGRESS_POLL_SECONDS = 1
+# Fragments of the page rerun alone, stable since Streamlit 1.37
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
 
 
-def get_all_create_date() -> list:
-    """Get all the create dates available
+@st.cache_resource(max_entries=1)
+def load_catalog(modified_at: int) -> SnapshotCatalog:
+    """Load the catalog of the snapshots, once for every change of its file
+
+    Args:
+        modified_at (int): The modification time of the catalog, in nanoseconds
+
+    Returns:
+        SnapshotCatalog: The catalog of the snapshots
+    """
+    return SnapshotCatalog(CATALOG_PATH)
+
+
+def get_catalog() -> SnapshotCatalog:
+    """Get the catalog of the snapshots, loaded again only when the pipeline records
+    a snapshot
+
+    Returns:
+        SnapshotCatalog: The catalog of the snapshots
+    """
+    modified_at = (
+        os.stat(CATALOG_PATH).st_mtime_ns if os.path.exists(CATALOG_PATH) else 0
+    )
+    return load_catalog(modified_at)
+
+
+def get_all_create_date(catalog: SnapshotCatalog) -> list:
+    """Get all the create dates available, the complete snapshots of the catalog so
+    the ones being written or with failed tasks are never offered
+
+    Args:
+        catalog (SnapshotCatalog): The catalog of the snapshots
 
     Returns:
         list: A list with all the create dates available
     """
-    create_dates = os.listdir("data/silver")
-    return sorted(create_dates, reverse=True)
+    return catalog.snapshot_ids()
 
 
 def get_latest_create_date(create_dates: list[str]) -> str:
@@ -29,117 +89,348 @@ def get_latest_create_date(create_dates: list[str]) -> str:
     return create_dates[0]
 
 
-def get_data(location: str) -> pd.DataFrame:
-    """Read the data from the parquet file in the location
+def get_connection(create_date: str) -> duckdb.DuckDBPyConnection:
+    """Get the DuckDB connection of the session, kept across the reruns of the page,
+    with the views of a data version created only when the version changes
 
     Args:
-        location (str): The location of the parquet file
+        create_date (str): The data version
 
     Returns:
-        pd.DataFrame: The data in the parquet file
+        duckdb.DuckDBPyConnection: The connection with the views of the version
     """
-    df = pd.read_parquet(location)
-    df = df.apply(
-        lambda col: pd.to_datetime(col, errors="ignore")
-        if col.dtypes == object
-        else col,
-        axis=0,
-    )
-    return df
+    if "duckdb_connection" not in st.session_state:
+        st.session_state.duckdb_connection = duckdb.connect()
+    connection = st.session_state.duckdb_connection
+    if st.session_state.get("duckdb_create_date") != create_date:
+        create_views(connection, create_date)
+        st.session_state.duckdb_create_date = create_date
+    return connection
 
 
-def run_ingestion():
-    spacex_ingestion_main.run()
+def run_pipeline(progress: Callable[[str, str], None]) -> dict[str, str]:
+    """Run the pipeline, importing it only when the ingestion is asked for so the
+    reruns of the page do not load pandera and the ingestion stack
 
+    Args:
+        progress (Callable[[str, str], None]): callback with the status of every task
 
-def get_max_number_of_times_a_core_has_been_used() -> pd.DataFrame:
-    query = """
-SELECT core, MAX(flight) AS max_number_of_times_used
-    FROM cores_df
-GROUP BY core
-ORDER BY MAX(flight) DESC LIMIT 1
+    Returns:
+        dict[str, str]: path of the output of every task by name
     """
-    st.markdown(f"```{query}")
-    result = duckdb.sql(query).df()
-    return result
-
-
-def get_cores_used_in_less_than_x_days(number_of_days: int) -> pd.DataFrame:
-    query = f"""
-SELECT fai.id, cor.core, fai.date_utc
-    FROM cores_df as cor
-INNER JOIN fairings_df AS fai
-    ON cor.id = fai.id
-WHERE date_diff('day', fai.date_utc, current_timestamp) < {number_of_days}
+    from spacex_data_platform.pipeline import Main
+
+    return Main(progress=progress).run()
+
+
+@st.cache_resource
+def get_query_cache() -> QueryCache:
+    """Get the cache of the results of the queries shared by all the sessions of the
+    server, so the reruns of the page over the same snapshot do not query it again
+
+    Returns:
+        QueryCache: The cache of the results of the queries
+    """
+    return QueryCache(QUERY_CACHE_DIR)
+
+
+@st.cache_resource
+def get_pipeline_runner() -> PipelineRunner:
+    """Get the runner of the pipeline shared by all the sessions of the server, so
+    a single ingestion runs at a time
+
+    Returns:
+        PipelineRunner: The runner of the pipeline
     """
-    st.markdown(f"```{query}")
-    result = duckdb.sql(query).df()
-    return result
+    return PipelineRunner(run_pipeline)
+
+
+@fragment(run_every=PROGRESS_POLL_SECONDS)
+def show_ingestion_progress(runner: PipelineRunner) -> None:
+    """Show the status of every task of the running or last ingestion, polled
+    without rerunning the rest of the page, which reruns once when the ingestion
+    finishes to offer its data version
+
+    Args:
+        runner (PipelineRunner): The runner of the pipeline
+    """
+    job = runner.job
+    running = job is not None and not job.finished
+    if st.session_state.get("ingestion_running") and not running:
+        st.session_state.ingestion_running = False
+        st.rerun()
+    st.session_state.ingestion_running = running
+    if job is None:
+        return
+    progress = job.progress()
+    ended = [status for status in progress.values() if status not in ACTIVE_STATUSES]
+    if not job.finished:
+        st.progress(
+            len(ended) / max(len(progress), 1),
+            text=f"Running ingestion for {time.time() - job.started_at:.0f} s, "
+            "the current data version can be explored meanwhile",
+        )
+    elif job.error is not None:
+        st.error(f"Ingestion failed: {job.error}")
+    else:
+        st.success(f"Ingestion finished in {job.finished_at - job.started_at:.0f} s")
+    with st.expander("Ingestion tasks", expanded=not job.finished):
+        st.table({"task": list(progress), "status": list(progress.values())})
+
+
+def show_table(
+    connection: duckdb.DuckDBPyConnection,
+    view: str,
+    metadata: dict | None = None,
+    snapshot_hash: str | None = None,
+) -> None:
+    """Show a page of a view with the controls to sort, filter and move across its
+    pages, only the rows of the page are read and sent to the browser
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection with the views
+        view (str): The view, as `silver.fairings`
+        metadata (dict | None, optional): The metadata of the table in the catalog,
+            with its number of rows. Defaults to None.
+        snapshot_hash (str | None, optional): The hash of the content of the
+            snapshot, the key of its cached pages. Defaults to None, not cached.
+    """
+    if metadata is not None:
+        st.caption(
+            f"{metadata['rows']} rows, {metadata['bytes'] / 2**20:.1f} MB, "
+            f"sha256 {metadata['hash'][:12]}"
+        )
+    columns = view_columns(connection, view)
+    sort_column, order_column, size_column = st.columns(3)
+    sort_by = sort_column.selectbox("Sort by", columns, key=f"{view}_sort_by")
+    descending = (
+        order_column.selectbox(
+            "Order", ["Ascending", "Descending"], key=f"{view}_order"
+        )
+        == "Descending"
+    )
+    page_size = size_column.selectbox(
+        "Rows per page", PAGE_SIZES, index=1, key=f"{view}_page_size"
+    )
+    filter_column, operator_column, value_column = st.columns(3)
+    filter_by = filter_column.selectbox(
+        "Filter column", [""] + columns, key=f"{view}_filter_by"
+    )
+    operator = operator_column.selectbox(
+        "Operator", list(FILTER_OPERATORS), key=f"{view}_operator"
+    )
+    value = value_column.text_input("Value", key=f"{view}_value")
+    filters = [(filter_by, operator, value)] if filter_by and value else []
+    try:
+        count = (
+            metadata["rows"]
+            if metadata is not None and not filters
+            else count_rows(connection, view, filters, get_query_cache(), snapshot_hash)
+        )
+    except duckdb.Error as error:
+        st.error(f"Invalid filter: {error}")
+        return
+    pages = max((count - 1) // page_size + 1, 1)
+    table = st.container()
+    # The page goes back to the first one when the filters change the pages
+    page_number = st.number_input(
+        f"Page of {pages} ({count} rows)",
+        min_value=1,
+        max_value=pages,
+        key=f"{view}_page_{pages}",
+    )
+    table.dataframe(
+        page(
+            connection,
+            view,
+            page_number - 1,
+            page_size,
+            sort_by,
+            descending,
+            filters,
+            get_query_cache(),
+            snapshot_hash,
+        ),
+        hide_index=True,
+    )
+
+
+def show_diff(
+    connection: duckdb.DuckDBPyConnection,
+    create_date: str,
+    create_dates: list[str],
+    catalog: SnapshotCatalog,
+) -> None:
+    """Show the rows of a silver table that changed between the selected data
+    version and another one, computed once for every pair of snapshots and then
+    read from the cache of the results
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The connection of the session
+        create_date (str): The selected data version
+        create_dates (list[str]): All the data versions
+        catalog (SnapshotCatalog): The catalog with the hashes of the snapshots
+    """
+    version_column, table_column = st.columns(2)
+    other_create_date = version_column.selectbox(
+        "Compare with",
+        [""] + [other for other in create_dates if other and other != create_date],
+        key="diff_create_date",
+    )
+    table = table_column.selectbox("Table", list(DIFF_KEYS), key="diff_table")
+    if not other_create_date:
+        return
+    old_create_date, new_create_date = sorted([other_create_date, create_date])
+    st.caption(f"Changes from {old_create_date} to {new_create_date}")
+    snapshot_hashes = (
+        catalog.snapshot_hash(old_create_date),
+        catalog.snapshot_hash(new_create_date),
+    )
+    st.dataframe(
+        [
+            diff_summary(
+                connection,
+                table,
+                old_create_date,
+                new_create_date,
+                cache=get_query_cache(),
+                snapshot_hashes=snapshot_hashes,
+            )
+        ],
+        hide_index=True,
+    )
+    st.dataframe(
+        diff_preview(
+            connection,
+            table,
+            old_create_date,
+            new_create_date,
+            DIFF_PREVIEW_ROWS,
+            cache=get_query_cache(),
+            snapshot_hashes=snapshot_hashes,
+        ),
+        hide_index=True,
+    )
+
+
+def get_max_number_of_times_a_core_has_been_used(
+    connection: duckdb.DuckDBPyConnection, snapshot_hash: str | None = None
+) -> pd.DataFrame:
+    st.markdown(f"```{QUERIES['max_number_of_times_a_core_has_been_used']}")
+    return run_query(
+        connection,
+        "max_number_of_times_a_core_has_been_used",
+        cache=get_query_cache(),
+        snapshot_hash=snapshot_hash,
+    )
+
+
+def get_cores_used_in_less_than_x_days(
+    connection: duckdb.DuckDBPyConnection,
+    number_of_days: int,
+    snapshot_hash: str | None = None,
+) -> pd.DataFrame:
+    # The timelines are sorted by gap_days, so only the first row groups are read
+    st.markdown(f"```{QUERIES['cores_used_in_less_than_x_days']}")
+    return run_query(
+        connection,
+        "cores_used_in_less_than_x_days",
+        [number_of_days],
+        get_query_cache(),
+        snapshot_hash,
+    )
 
 
 def get_months_in_which_there_has_been_more_than_one_launch(
+    connection: duckdb.DuckDBPyConnection,
     number_of_launches: int,
+    snapshot_hash: str | None = None,
 ) -> pd.DataFrame:
-    query = f"""
-SELECT date_trunc('month', date_utc) AS month, COUNT(*) AS number_of_launches
-    FROM fairings_df
-GROUP BY month
-    HAVING COUNT(*) > {number_of_launches}
-    """
-    st.markdown(f"```{query}")
-    result = duckdb.sql(query).df()
-    return result
+    st.markdown(f"```{QUERIES['months_with_more_than_x_launches']}")
+    return run_query(
+        connection,
+        "months_with_more_than_x_launches",
+        [number_of_launches],
+        get_query_cache(),
+        snapshot_hash,
+    )
 
 
 st.title("SpaceX Explorer")
-if st.button("Run Ingestion", type="primary"):
-    run_ingestion()
+runner = get_pipeline_runner()
+if st.button("Run Ingestion", type="primary", disabled=runner.running):
+    _, started = runner.start()
+    if not started:
+        st.info("An ingestion is already running, following its progress")
+show_ingestion_progress(runner)
 try:
-    create_dates = [""] + get_all_create_date()
+    catalog = get_catalog()
+    create_dates = [""] + get_all_create_date(catalog)
     if len(create_dates) == 1:
         st.error("No data available, click the button above to run the ingestion")
     else:
-        st.info(f"Latest data available {create_dates[1]}", icon="ℹ️")
+        st.info(
+            f"Latest data available {get_latest_create_date(create_dates[1:])}",
+            icon="ℹ️",
+        )
         selected_create_date = st.selectbox("Choose data version", create_dates)
 
         if selected_create_date == "":
             st.info("Select a data version to explore")
         else:
-            fairings_df = get_data(
-                f"data/silver/{selected_create_date}/fairings.parquet"
-            )
-            cores_df = get_data(
-                f"data/silver/{selected_create_date}/cores_flight.parquet"
-            )
-
-            # available_fairings = fairings_df.index.get_level_values(
-            #    "id"
-            # ).drop_duplicates()
-            # available_cores = cores_df.index.get_level_values(
-            #    "core"
-            # ).drop_duplicates()
-            #
-            # fairing_id = st.multiselect("Choose fairing_id's", available_fairings)
-            # core_id = st.multiselect("Choose core", available_cores)
+            connection = get_connection(selected_create_date)
+            snapshot_hash = catalog.snapshot_hash(selected_create_date)
 
             st.markdown(f"## {selected_create_date} Data")
             st.markdown("### Fairings Data")
-            st.dataframe(fairings_df)
-            st.markdown("### Cores Data")
-            st.dataframe(cores_df)
-            st.markdown("### Assesement questions")
-            st.markdown(
-                "- Each time a rocket is launched, one or more cores (first stages) are involved. Sometimes, cores are recovered after the launch and reused posteriorly in another launch. What is the maximum number of times a core has been used? Write an SQL query to find the result."
-            )
-            st.dataframe(get_max_number_of_times_a_core_has_been_used())
-            st.markdown(
-                "- Which cores have been reused in less than 1000 days after the previous launch? Write an SQL query to find the result."
+            show_table(
+                connection,
+                "silver.fairings",
+                catalog.table(selected_create_date, "silver.fairings"),
+                snapshot_hash,
             )
-            st.dataframe(get_cores_used_in_less_than_x_days(1000))
-            st.markdown(
-                "- List the months in which there has been more than one launch. Write an SQL query to find the results."
+            st.markdown("### Cores Data")
+            show_table(
+                connection,
+                "silver.cores_flight",
+                catalog.table(selected_create_date, "silver.cores_flight"),
+                snapshot_hash,
             )
-            st.dataframe(get_months_in_which_there_has_been_more_than_one_launch(1))
+            st.markdown("### Compare versions")
+            show_diff(connection, selected_create_date, create_dates, catalog)
+            st.markdown("### Assesement questions")
+            if catalog.table(selected_create_date, "gold.core_usage") is None:
+                st.error(
+                    "No gold data for this version, click the button above to run the ingestion"
+                )
+            else:
+                st.markdown(
+                    "- Each time a rocket is launched, one or more cores (first stages) are involved. Sometimes, cores are recovered after the launch and reused posteriorly in another launch. What is the maximum number of times a core has been used? Write an SQL query to find the result."
+                )
+                st.dataframe(
+                    get_max_number_of_times_a_core_has_been_used(
+                        connection, snapshot_hash
+                    )
+                )
+                st.markdown(
+                    "- Which cores have been reused in less than 50 days after the previous launch? Write an SQL query to find the result."
+                )
+                st.dataframe(
+                    get_cores_used_in_less_than_x_days(connection, 50, snapshot_hash)
+                )
+                st.markdown(
+                    "- List the months in which there has been more than one launch. Write an SQL query to find the results."
+                )
+                st.dataframe(
+                    get_months_in_which_there_has_been_more_than_one_launch(
+                        connection, 1, snapshot_hash
+                    )
+                )
+                stats = get_query_cache().stats()
+                st.caption(
+                    f"Query cache: {stats['memory_hits']} memory hits, "
+                    f"{stats['disk_hits']} disk hits, {stats['misses']} misses"
+                )
 
 except URLError as e:
     st.error(
@@ -2,63 +2,216 @@
 
 import logging
 import os
+from collections.abc import Iterator
+from datetime import datetime, timezone
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from spacex_data_platform.ingestion.constants import DATE_FORMAT, SPACEX_PROVIDER_CODE
+from spacex_data_platform.ingestion.bronze.changes import ChangeTracker, row_hash
+from spacex_data_platform.ingestion.bronze.json_stream import JsonArrayStream
+from spacex_data_platform.ingestion.bronze.schemas.launches import (
+    BRONZE_SCHEMA,
+    LAUNCHES_SCHEMA,
+    raw_type,
+)
+from spacex_data_platform.ingestion.constants import SPACEX_PROVIDER_CODE
+from spacex_data_platform.ingestion.partitioning import (
+    PARTITION_SCHEMA,
+    add_partition_columns,
+    dataset_path,
+    write_partitioned,
+)
+from spacex_data_platform.ingestion.raw.raw_file import open_raw_file, uncompressed_path
+
+RAW_LAUNCHES_TYPE = raw_type(LAUNCHES_SCHEMA)
 
 
 class SpaceXBronze:
-    """Class to create the bronze layer from the raw data"""
+    """Class to create the bronze layer from the raw data
+
+    The raw launches array is parsed incrementally in batches and written with the
+    `BRONZE_SCHEMA`, so the memory used depends on `batch_size` and `row_group_size`
+    and not on the size of the snapshot. With `partitioned` the launches are written
+    as a dataset partitioned by the year and month of `date_utc`.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 10_000,
+        row_group_size: int | None = None,
+        compression: str = "snappy",
+        partitioned: bool = False,
+    ):
+        self.batch_size = batch_size
+        self.row_group_size = row_group_size or batch_size
+        self.compression = compression
+        self.partitioned = partitioned
 
     @staticmethod
-    def bronzify(raw_df: pd.DataFrame) -> pd.DataFrame:
-        """Bronzify the raw data setting the index and adding `create_date` and `provider_code` columns
+    def bronzify(
+        raw_records: list[dict], create_date: datetime, seen_ids: set[str]
+    ) -> pa.Table:
+        """Bronzify a batch of raw records checking the `id` is unique, casting them
+        to the `BRONZE_SCHEMA` and adding `create_date`, `provider_code` and
+        `row_hash` columns
 
         Args:
-            raw_df (pd.DataFrame): Raw DataFrame
+            raw_records (list[dict]): Raw records
+            create_date (datetime): Date of the ingestion
+            seen_ids (set[str]): Ids of the previous batches, updated with the batch ones
 
         Returns:
-            pd.DataFrame: DataFrame with `create_date` and `provider_code` columns
+            pa.Table: Table with the `BRONZE_SCHEMA`
         """
-        try:
-            bronzified_df = raw_df.set_index("id", verify_integrity=True)
-            bronzified_df["create_date"] = pd.to_datetime("now").strftime(DATE_FORMAT)
-            bronzified_df["provider_code"] = SPACEX_PROVIDER_CODE
-            return bronzified_df.reset_index()
-        except ValueError as e:
-            logging.error(
-                "The DataFrame has duplicated values in the index, full trace: %s", e
+        for record in raw_records:
+            if record["id"] in seen_ids:
+                error = f"Index has duplicate keys: {record['id']}"
+                logging.error(
+                    "The DataFrame has duplicated values in the index, full trace: %s",
+                    error,
+                )
+                raise ValueError(error)
+            seen_ids.add(record["id"])
+
+        raw_table = pa.Table.from_struct_array(
+            pa.array(raw_records, type=RAW_LAUNCHES_TYPE)
+        )
+        columns = [
+            raw_table.column(field.name).cast(field.type) for field in LAUNCHES_SCHEMA
+        ]
+        columns.append(
+            pa.array(
+                [create_date] * len(raw_records),
+                BRONZE_SCHEMA.field("create_date").type,
             )
-            raise
+        )
+        columns.append(
+            pa.array(
+                [SPACEX_PROVIDER_CODE] * len(raw_records), pa.string()
+            ).dictionary_encode()
+        )
+        columns.append(
+            pa.array([row_hash(record) for record in raw_records], pa.string())
+        )
+        return pa.Table.from_arrays(columns, schema=BRONZE_SCHEMA)
 
-    @staticmethod
-    def store(raw_data_path: str, df: pd.DataFrame) -> str:
-        """Store the DataFrame in the bronze layer
+    def store(self, raw_data_path: str, batches: Iterator[pa.Table]) -> str:
+        """Store the batches in the bronze layer in row groups of `row_group_size`
+
+        The file is written with a `.part` suffix and renamed once complete.
 
         Args:
             raw_data_path (str): Path of the raw data
-            df (pd.DataFrame): DataFrame to store
+            batches (Iterator[pa.Table]): Bronzified batches
 
         Returns:
-            str: Path where the DataFrame is stored
+            str: Path where the batches are stored
         """
-        data_path = raw_data_path.replace("raw", "bronze").replace("json", "parquet")
+        data_path = (
+            uncompressed_path(raw_data_path)
+            .replace("raw", "bronze")
+            .replace("json", "parquet")
+        )
+        if self.partitioned:
+            return write_partitioned(
+                (
+                    add_partition_columns(batch, batch.column("date_utc"))
+                    for batch in batches
+                ),
+                pa.schema(list(BRONZE_SCHEMA) + list(PARTITION_SCHEMA)),
+                dataset_path(data_path),
+                self.row_group_size,
+                self.compression,
+            )
         os.makedirs(os.path.dirname(data_path), exist_ok=True)
-        df.to_parquet(data_path)
+        partial_path = f"{data_path}.part"
+        try:
+            with pq.ParquetWriter(
+                partial_path, BRONZE_SCHEMA, compression=self.compression
+            ) as writer:
+                pending: list[pa.Table] = []
+                pending_rows = 0
+                for batch in batches:
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    if pending_rows >= self.row_group_size:
+                        writer.write_table(
+                            pa.concat_tables(pending),
+                            row_group_size=self.row_group_size,
+                        )
+                        pending, pending_rows = [], 0
+                if pending:
+                    writer.write_table(
+                        pa.concat_tables(pending), row_group_size=self.row_group_size
+                    )
+        except Exception:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        os.replace(partial_path, data_path)
         return data_path
 
+    def bronzify_batches(self, raw_file) -> Iterator[pa.Table]:
+        """Parse the raw launches array in batches and bronzify them
+
+        Args:
+            raw_file (_type_): Binary stream with the raw data
+
+        Yields:
+            pa.Table: Bronzified batches
+        """
+        create_date = datetime.now(timezone.utc).replace(microsecond=0)
+        seen_ids: set[str] = set()
+        for raw_records in JsonArrayStream(raw_file).batches(self.batch_size):
+            yield SpaceXBronze.bronzify(raw_records, create_date, seen_ids)
+
     @staticmethod
+    def track_changes(
+        batches: Iterator[pa.Table], tracker: ChangeTracker, incremental: bool
+    ) -> Iterator[pa.Table]:
+        """Track the row hashes of the batches, keeping only the changed launches
+        if the bronze data is incremental
+
+        Args:
+            batches (Iterator[pa.Table]): Bronzified batches
+            tracker (ChangeTracker): Tracker with the previous row hashes
+            incremental (bool): Keep only the inserted and updated launches
+
+        Yields:
+            pa.Table: Batches to store
+        """
+        for batch in batches:
+            changed = tracker.filter(batch)
+            yield changed if incremental else batch
+
     def create_bronze(
+        self,
         raw_data_path: str = "data/raw/2024_05_09__17_05_33/spacex_data.json",
+        previous_data_path: str | None = None,
     ) -> str:
-        """Create the bronze layer from the raw data
+        """Create the bronze layer from the raw data, the raw file can be compressed
+        with `gzip` or `zstd`
 
-        Returns:
-            pd.DataFrame: DataFrame with the bronze data
-        """
-        df = pd.read_json(raw_data_path)
+        The row hashes of the launches are stored next to the bronze data. Given the
+        previous bronze version, only the inserted and updated launches are stored
+        with a change log of the inserts, updates and deletes.
 
-        bronzified_df = SpaceXBronze.bronzify(df)
+        Args:
+            raw_data_path (str, optional): Path of the raw data. Defaults to "data/raw/2024_05_09__17_05_33/spacex_data.json".
+            previous_data_path (str | None, optional): Path of the previous bronze data. Defaults to None.
 
-        return SpaceXBronze.store(raw_data_path, bronzified_df)
+        Returns:
+            str: Path where the bronze data is stored
+        """
+        incremental = previous_data_path is not None
+        tracker = ChangeTracker(previous_data_path)
+        with open_raw_file(raw_data_path) as raw_file:
+            data_path = self.store(
+                raw_data_path,
+                SpaceXBronze.track_changes(
+                    self.bronzify_batches(raw_file), tracker, incremental
+                ),
+            )
+        tracker.store(data_path, incremental)
+        return data_path
@@ -0,0 +1,147 @@
+"""Module to track the launches changed between two bronze versions"""
+
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from spacex_data_platform.ingestion.bronze.schemas.launches import DICTIONARY_STRING
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+ROW_HASHES_SCHEMA = pa.schema([("id", pa.string()), ("row_hash", pa.string())])
+CHANGES_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("operation", DICTIONARY_STRING),
+        ("previous_row_hash", pa.string()),
+        ("row_hash", pa.string()),
+    ]
+)
+
+
+def row_hash(raw_record: dict) -> str:
+    """Get a hash of the raw record independent of the order of its keys
+
+    Args:
+        raw_record (dict): raw record
+
+    Returns:
+        str: sha256 of the canonical JSON of the record
+    """
+    return hashlib.sha256(
+        json.dumps(raw_record, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def row_hashes_path(bronze_data_path: str) -> str:
+    """Get the path of the row hashes of a bronze version
+
+    Args:
+        bronze_data_path (str): path of the bronze data
+
+    Returns:
+        str: path of the `row_hashes.parquet` of the snapshot
+    """
+    return os.path.join(os.path.dirname(bronze_data_path), "row_hashes.parquet")
+
+
+def changes_path(bronze_data_path: str) -> str:
+    """Get the path of the change log of a bronze version
+
+    Args:
+        bronze_data_path (str): path of the bronze data
+
+    Returns:
+        str: path of the `changes.parquet` of the snapshot
+    """
+    return os.path.join(os.path.dirname(bronze_data_path), "changes.parquet")
+
+
+class ChangeTracker:
+    """Class to compare the row hashes of the launches with the ones of the previous
+    bronze version, keeping only the inserted and updated launches and logging the
+    inserts, updates and deletes"""
+
+    def __init__(self, previous_data_path: str | None = None):
+        self.previous: dict[str, str] = {}
+        if previous_data_path is not None:
+            previous = pq.read_table(row_hashes_path(previous_data_path))
+            self.previous = dict(
+                zip(previous["id"].to_pylist(), previous["row_hash"].to_pylist())
+            )
+        self.current: dict[str, str] = {}
+        self.changes: list[dict] = []
+
+    def filter(self, batch: pa.Table) -> pa.Table:
+        """Keep the launches of the batch that are new or whose hash changed
+
+        Args:
+            batch (pa.Table): bronzified batch with `id` and `row_hash`
+
+        Returns:
+            pa.Table: inserted and updated launches
+        """
+        changed = []
+        for launch_id, launch_hash in zip(
+            batch["id"].to_pylist(), batch["row_hash"].to_pylist()
+        ):
+            self.current[launch_id] = launch_hash
+            previous_hash = self.previous.get(launch_id)
+            changed.append(previous_hash != launch_hash)
+            if previous_hash != launch_hash:
+                self.changes.append(
+                    {
+                        "id": launch_id,
+                        "operation": INSERT if previous_hash is None else UPDATE,
+                        "previous_row_hash": previous_hash,
+                        "row_hash": launch_hash,
+                    }
+                )
+        return batch.filter(pa.array(changed, pa.bool_()))
+
+    def change_log(self) -> pa.Table:
+        """Get the change log, the launches of the previous version that are not in
+        the current one are logged as deletes
+
+        Returns:
+            pa.Table: change log with the `CHANGES_SCHEMA`
+        """
+        deletes = [
+            {
+                "id": launch_id,
+                "operation": DELETE,
+                "previous_row_hash": previous_hash,
+                "row_hash": None,
+            }
+            for launch_id, previous_hash in self.previous.items()
+            if launch_id not in self.current
+        ]
+        return pa.Table.from_pylist(self.changes + deletes, schema=CHANGES_SCHEMA)
+
+    def store(self, bronze_data_path: str, incremental: bool) -> None:
+        """Store the row hashes of the current version next to the bronze data and,
+        for an incremental version, its change log
+
+        Args:
+            bronze_data_path (str): path of the bronze data
+            incremental (bool): whether the bronze data only has the changed launches
+        """
+        tables = {
+            row_hashes_path(bronze_data_path): pa.Table.from_pydict(
+                {
+                    "id": list(self.current.keys()),
+                    "row_hash": list(self.current.values()),
+                },
+                schema=ROW_HASHES_SCHEMA,
+            )
+        }
+        if incremental:
+            tables[changes_path(bronze_data_path)] = self.change_log()
+        for path, table in tables.items():
+            pq.write_table(table, f"{path}.part")
+            os.replace(f"{path}.part", path)
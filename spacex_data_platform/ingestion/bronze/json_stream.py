@@ -0,0 +1,125 @@
+"""Module to parse a top-level JSON array incrementally"""
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStream:
+    """Class to iterate over the elements of a top-level JSON array reading the file
+    in chunks, so only the chunk and the element being decoded are held in memory"""
+
+    def __init__(self, file: BinaryIO, chunk_size: int = 1 << 20):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping the already consumed part of the buffer
+
+        Returns:
+            bool: False if the end of the file was already reached
+        """
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._position :] + self._text_decoder.decode(
+            chunk, final=self._eof
+        )
+        self._position = 0
+        return True
+
+    def _next_char(self) -> str:
+        """Skip the whitespaces and get the next character without consuming it
+
+        Returns:
+            str: next character, empty if the end of the file is reached
+        """
+        while True:
+            while (
+                self._position < len(self._buffer)
+                and self._buffer[self._position] in WHITESPACE
+            ):
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str) -> str:
+        """Consume the next character checking it is one of the expected
+
+        Args:
+            expected (str): characters allowed
+
+        Returns:
+            str: consumed character
+        """
+        char = self._next_char()
+        if not char or char not in expected:
+            raise ValueError(
+                f"Expected one of {expected!r} in the JSON array, found {char!r}"
+            )
+        self._position += 1
+        return char
+
+    def _decode_element(self) -> Any:
+        """Decode the element starting at the current position, reading more chunks
+        while it is incomplete
+
+        Returns:
+            Any: decoded element
+        """
+        while True:
+            try:
+                element, end = self._decoder.raw_decode(self._buffer, self._position)
+                # A number at the end of the buffer could continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return element
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the elements of the array
+
+        Yields:
+            Any: every element of the array
+        """
+        self._expect("[")
+        if self._next_char() == "]":
+            self._position += 1
+            return
+        while True:
+            self._next_char()
+            yield self._decode_element()
+            if self._expect(",]") == "]":
+                return
+
+    def batches(self, batch_size: int) -> Iterator[list[Any]]:
+        """Iterate over the elements of the array in batches
+
+        Args:
+            batch_size (int): maximum number of elements per batch
+
+        Yields:
+            list[Any]: batches of elements
+        """
+        batch = []
+        for element in self:
+            batch.append(element)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
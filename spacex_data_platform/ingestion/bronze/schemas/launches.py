@@ -0,0 +1,124 @@
+"""This module contains the Arrow schema of the bronze launches data."""
+
+import pyarrow as pa
+
+TIMESTAMP = pa.timestamp("ms", tz="UTC")
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+CORE = pa.struct(
+    [
+        ("core", pa.string()),
+        ("flight", pa.int64()),
+        ("gridfins", pa.bool_()),
+        ("legs", pa.bool_()),
+        ("reused", pa.bool_()),
+        ("landing_attempt", pa.bool_()),
+        ("landing_success", pa.bool_()),
+        ("landing_type", pa.string()),
+        ("landpad", pa.string()),
+    ]
+)
+FAIRINGS = pa.struct(
+    [
+        ("reused", pa.bool_()),
+        ("recovery_attempt", pa.bool_()),
+        ("recovered", pa.bool_()),
+        ("ships", pa.list_(pa.string())),
+    ]
+)
+LINKS = pa.struct(
+    [
+        ("patch", pa.struct([("small", pa.string()), ("large", pa.string())])),
+        (
+            "reddit",
+            pa.struct(
+                [
+                    ("campaign", pa.string()),
+                    ("launch", pa.string()),
+                    ("media", pa.string()),
+                    ("recovery", pa.string()),
+                ]
+            ),
+        ),
+        (
+            "flickr",
+            pa.struct(
+                [
+                    ("small", pa.list_(pa.string())),
+                    ("original", pa.list_(pa.string())),
+                ]
+            ),
+        ),
+        ("presskit", pa.string()),
+        ("webcast", pa.string()),
+        ("youtube_id", pa.string()),
+        ("article", pa.string()),
+        ("wikipedia", pa.string()),
+    ]
+)
+FAILURE = pa.struct(
+    [("time", pa.int64()), ("altitude", pa.float64()), ("reason", pa.string())]
+)
+CREW = pa.struct([("crew", pa.string()), ("role", pa.string())])
+
+# Launches of the SpaceX API v5
+LAUNCHES_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("fairings", FAIRINGS),
+        ("links", LINKS),
+        ("static_fire_date_utc", TIMESTAMP),
+        ("static_fire_date_unix", pa.int64()),
+        ("net", pa.bool_()),
+        ("window", pa.int64()),
+        ("rocket", DICTIONARY_STRING),
+        ("success", pa.bool_()),
+        ("failures", pa.list_(FAILURE)),
+        ("details", pa.string()),
+        ("crew", pa.list_(CREW)),
+        ("ships", pa.list_(pa.string())),
+        ("capsules", pa.list_(pa.string())),
+        ("payloads", pa.list_(pa.string())),
+        ("launchpad", DICTIONARY_STRING),
+        ("flight_number", pa.int64()),
+        ("name", pa.string()),
+        ("date_utc", TIMESTAMP),
+        ("date_unix", pa.int64()),
+        # Kept as the original string to preserve the local offset
+        ("date_local", pa.string()),
+        ("date_precision", DICTIONARY_STRING),
+        ("upcoming", pa.bool_()),
+        ("cores", pa.list_(CORE)),
+        ("auto_update", pa.bool_()),
+        ("tbd", pa.bool_()),
+        ("launch_library_id", pa.string()),
+    ]
+)
+
+# Launches of the SpaceX API v5 plus the columns added in the bronze layer,
+# `row_hash` is the sha256 of the raw record to detect the changed launches
+BRONZE_SCHEMA = (
+    LAUNCHES_SCHEMA.append(pa.field("create_date", TIMESTAMP))
+    .append(pa.field("provider_code", DICTIONARY_STRING))
+    .append(pa.field("row_hash", pa.string()))
+)
+
+
+def raw_type(schema: pa.Schema) -> pa.StructType:
+    """Get the type used to parse the raw records of a schema, timestamps and
+    dictionaries are parsed as strings and cast afterwards
+
+    Args:
+        schema (pa.Schema): schema of the records
+
+    Returns:
+        pa.StructType: type of the raw records
+    """
+    return pa.struct(
+        [
+            pa.field(field.name, pa.string())
+            if pa.types.is_timestamp(field.type) or pa.types.is_dictionary(field.type)
+            else field
+            for field in schema
+        ]
+    )
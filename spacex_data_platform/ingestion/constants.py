@@ -2,3 +2,13 @@
 
 DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
 SPACEX_PROVIDER_CODE = "SPX"
+SPACEX_API_URL = "https://api.spacexdata.com"
+SPACEX_COLLECTIONS = {
+    "rockets": "v4/rockets",
+    "launchpads": "v4/launchpads",
+    "landpads": "v4/landpads",
+    "payloads": "v4/payloads",
+    "ships": "v4/ships",
+    "capsules": "v4/capsules",
+    "cores": "v4/cores",
+}
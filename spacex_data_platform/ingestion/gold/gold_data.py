@@ -0,0 +1,339 @@
+"""Module to create the gold layer data, the aggregates read by the dashboard"""
+
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from spacex_data_platform.ingestion.bronze.changes import changes_path
+from spacex_data_platform.ingestion.partitioning import dataset_path
+
+# Silver columns read to create the gold tables
+TIMELINES_COLUMNS = [
+    "id",
+    "launch_key",
+    "core",
+    "core_key",
+    "flight",
+    "date_utc",
+    "previous_id",
+    "previous_date_utc",
+    "gap_days",
+]
+FAIRINGS_COLUMNS = ["id", "launch_key", "date_utc"]
+GOLD_TABLES = ["launch_dates", "core_timelines", "core_usage", "monthly_launches"]
+# Rows of the row groups of the gold tables, the statistics of the row groups of the
+# core timelines sorted by gap let the threshold queries skip the rest
+ROW_GROUP_SIZE = 10_000
+
+
+def read_silver(
+    data_path: str, columns: list[str], ids: list[str] | None = None
+) -> pd.DataFrame:
+    """Read some columns of a silver table, only the rows of some launches if given
+
+    Args:
+        data_path (str): path of the silver table, a file or a partitioned dataset
+        columns (list[str]): columns to read
+        ids (list[str] | None, optional): launch ids of the rows, pushed down to the
+            parquet files. Defaults to None, all the rows.
+
+    Returns:
+        pd.DataFrame: silver data
+    """
+    return pd.read_parquet(
+        data_path,
+        columns=columns,
+        filters=pc.field("id").isin(pa.array(ids, pa.string()))
+        if ids is not None
+        else None,
+    )
+
+
+def gold_path(silver_data_path: str) -> str:
+    """Get the directory of the gold tables of a snapshot
+
+    Args:
+        silver_data_path (str): path of a silver table of the snapshot
+
+    Returns:
+        str: `data/gold/<snapshot>/spacex_data` for
+            `data/silver/<snapshot>/core_timelines.parquet`
+    """
+    return os.path.join(
+        os.path.dirname(dataset_path(silver_data_path)).replace("silver", "gold"),
+        "spacex_data",
+    )
+
+
+class SpaceXGold:
+    """Class to create the aggregates of the dashboard from the silver core timelines
+    and fairings, as small tables recomputed only for the changed launches
+
+    - `launch_dates`: date of every launch, to know the months and dates of the
+      changed launches before the change.
+    - `core_timelines`: launches of every core with its previous launch and the
+      days between both, sorted by those days so a threshold is a range of rows.
+    - `core_usage`: number of launches, highest flight and first and last launch
+      dates of every core.
+    - `monthly_launches`: number of launches of every month.
+    """
+
+    @staticmethod
+    def launch_dates(fairings_df: pd.DataFrame) -> pd.DataFrame:
+        """Get the date of every launch
+
+        Args:
+            fairings_df (pd.DataFrame): silver fairings
+
+        Returns:
+            pd.DataFrame: `id`, `launch_key` and `date_utc` of the launches
+        """
+        return fairings_df[FAIRINGS_COLUMNS].reset_index(drop=True)
+
+    @staticmethod
+    def core_timelines(core_timelines_df: pd.DataFrame) -> pd.DataFrame:
+        """Sort the launches of the cores by the days since the previous launch of
+        the core, so the launches within any number of days are the first rows
+
+        Args:
+            core_timelines_df (pd.DataFrame): silver core timelines
+
+        Returns:
+            pd.DataFrame: core timelines sorted by `gap_days`, the first launches of
+                the cores at the end
+        """
+        return core_timelines_df[TIMELINES_COLUMNS].sort_values(
+            "gap_days", na_position="last", kind="stable", ignore_index=True
+        )
+
+    @staticmethod
+    def core_usage(core_timelines: pd.DataFrame) -> pd.DataFrame:
+        """Get the usage of every core
+
+        Args:
+            core_timelines (pd.DataFrame): launches of the cores
+
+        Returns:
+            pd.DataFrame: number of launches, highest flight and first and last
+                launch dates by `core_key`
+        """
+        return (
+            core_timelines.groupby("core_key", sort=True)
+            .agg(
+                core=("core", "first"),
+                launches=("id", "size"),
+                max_flight=("flight", "max"),
+                first_date_utc=("date_utc", "min"),
+                last_date_utc=("date_utc", "max"),
+            )
+            .reset_index()
+        )
+
+    @staticmethod
+    def monthly_launches(launch_dates: pd.DataFrame) -> pd.DataFrame:
+        """Get the number of launches of every month
+
+        Args:
+            launch_dates (pd.DataFrame): date of every launch
+
+        Returns:
+            pd.DataFrame: number of `launches` by UTC `month`
+        """
+        return (
+            SpaceXGold.launch_months(launch_dates)
+            .value_counts()
+            .rename("launches")
+            .rename_axis("month")
+            .sort_index()
+            .reset_index()
+        )
+
+    @staticmethod
+    def launch_months(launch_dates: pd.DataFrame) -> pd.Series:
+        """Get the UTC month of every launch
+
+        Args:
+            launch_dates (pd.DataFrame): date of every launch
+
+        Returns:
+            pd.Series: first instant of the month of every launch
+        """
+        dates = launch_dates["date_utc"]
+        return (dates - pd.to_timedelta(dates.dt.day - 1, unit="D")).dt.normalize()
+
+    @staticmethod
+    def generate_gold_data(
+        core_timelines_df: pd.DataFrame, fairings_df: pd.DataFrame
+    ) -> dict[str, pd.DataFrame]:
+        """Generate the gold tables from the whole silver data
+
+        Args:
+            core_timelines_df (pd.DataFrame): silver core timelines
+            fairings_df (pd.DataFrame): silver fairings
+
+        Returns:
+            dict[str, pd.DataFrame]: gold tables by name
+        """
+        launch_dates = SpaceXGold.launch_dates(fairings_df)
+        return {
+            "launch_dates": launch_dates,
+            "core_timelines": SpaceXGold.core_timelines(core_timelines_df),
+            "core_usage": SpaceXGold.core_usage(core_timelines_df),
+            "monthly_launches": SpaceXGold.monthly_launches(launch_dates),
+        }
+
+    @staticmethod
+    def update_gold_data(
+        previous: dict[str, pd.DataFrame],
+        changed_ids: list[str],
+        core_timelines_df: pd.DataFrame,
+        fairings_df: pd.DataFrame,
+    ) -> dict[str, pd.DataFrame]:
+        """Update the previous gold tables with the changed launches, recomputing
+        only the usage of the cores and the months they belong to before or after
+        the change
+
+        Args:
+            previous (dict[str, pd.DataFrame]): previous gold tables by name
+            changed_ids (list[str]): ids of the inserted, updated and deleted launches
+            core_timelines_df (pd.DataFrame): silver core timelines
+            fairings_df (pd.DataFrame): silver fairings of the changed launches
+
+        Returns:
+            dict[str, pd.DataFrame]: gold tables by name
+        """
+        previous_dates = previous["launch_dates"]
+        changed = previous_dates["id"].isin(changed_ids)
+        new_dates = SpaceXGold.launch_dates(fairings_df)
+        launch_dates = pd.concat(
+            [previous_dates[~changed], new_dates], ignore_index=True
+        )
+
+        # The changed launches leave their previous months and count in the new ones
+        counts = (
+            previous["monthly_launches"]
+            .set_index("month")["launches"]
+            .sub(
+                SpaceXGold.launch_months(previous_dates[changed]).value_counts(),
+                fill_value=0,
+            )
+            .add(SpaceXGold.launch_months(new_dates).value_counts(), fill_value=0)
+            .astype("int64")
+        )
+        monthly_launches = (
+            counts[counts > 0]
+            .rename("launches")
+            .rename_axis("month")
+            .sort_index()
+            .reset_index()
+        )
+
+        previous_timelines = previous["core_timelines"]
+        affected_cores = pd.concat(
+            [
+                previous_timelines.loc[
+                    previous_timelines["id"].isin(changed_ids), "core_key"
+                ],
+                core_timelines_df.loc[
+                    core_timelines_df["id"].isin(changed_ids), "core_key"
+                ],
+            ]
+        ).unique()
+        previous_usage = previous["core_usage"]
+        core_usage = pd.concat(
+            [
+                previous_usage[~previous_usage["core_key"].isin(affected_cores)],
+                SpaceXGold.core_usage(
+                    core_timelines_df[
+                        core_timelines_df["core_key"].isin(affected_cores)
+                    ]
+                ),
+            ],
+            ignore_index=True,
+        ).sort_values("core_key", ignore_index=True)
+
+        return {
+            "launch_dates": launch_dates,
+            "core_timelines": SpaceXGold.core_timelines(core_timelines_df),
+            "core_usage": core_usage,
+            "monthly_launches": monthly_launches,
+        }
+
+    @staticmethod
+    def store(core_timelines_path: str, gold_data: dict[str, pd.DataFrame]) -> str:
+        """Store the gold tables of a snapshot, replacing them at once
+
+        Args:
+            core_timelines_path (str): path of the silver core timelines of the snapshot
+            gold_data (dict[str, pd.DataFrame]): gold tables by name
+
+        Returns:
+            str: directory with a parquet file per gold table
+        """
+        data_path = gold_path(core_timelines_path)
+        part_path = f"{data_path}.part"
+        shutil.rmtree(part_path, ignore_errors=True)
+        os.makedirs(part_path)
+        for name, df in gold_data.items():
+            df.to_parquet(
+                os.path.join(part_path, f"{name}.parquet"),
+                index=False,
+                row_group_size=ROW_GROUP_SIZE,
+            )
+        shutil.rmtree(data_path, ignore_errors=True)
+        os.replace(part_path, data_path)
+        return data_path
+
+    @staticmethod
+    def run(
+        core_timelines_path: str,
+        fairings_data_path: str,
+        bronze_data_path: str | None = None,
+        previous_data_path: str | None = None,
+    ) -> str:
+        """Create the gold tables of a snapshot, updating the previous ones with the
+        changed launches of an incremental bronze data
+
+        Args:
+            core_timelines_path (str): path of the silver core timelines
+            fairings_data_path (str): path of the silver fairings
+            bronze_data_path (str | None, optional): path of the bronze data, with
+                the change log of the launches if it is incremental. Defaults to None.
+            previous_data_path (str | None, optional): directory of the previous
+                gold tables. Defaults to None, created from the whole silver data.
+
+        Returns:
+            str: directory with a parquet file per gold table
+        """
+        if (
+            previous_data_path is None
+            or bronze_data_path is None
+            or not os.path.exists(changes_path(bronze_data_path))
+        ):
+            return SpaceXGold.store(
+                core_timelines_path,
+                SpaceXGold.generate_gold_data(
+                    read_silver(core_timelines_path, TIMELINES_COLUMNS),
+                    read_silver(fairings_data_path, FAIRINGS_COLUMNS),
+                ),
+            )
+
+        changed_ids = pd.read_parquet(changes_path(bronze_data_path), columns=["id"])[
+            "id"
+        ].tolist()
+        previous = {
+            name: pd.read_parquet(os.path.join(previous_data_path, f"{name}.parquet"))
+            for name in GOLD_TABLES
+        }
+        return SpaceXGold.store(
+            core_timelines_path,
+            SpaceXGold.update_gold_data(
+                previous,
+                changed_ids,
+                read_silver(core_timelines_path, TIMELINES_COLUMNS),
+                read_silver(fairings_data_path, FAIRINGS_COLUMNS, changed_ids),
+            ),
+        )
@@ -0,0 +1,94 @@
+"""Module to store the bronze and silver tables as hive partitioned datasets"""
+
+import os
+import shutil
+from collections.abc import Iterable
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PARTITION_SCHEMA = pa.schema([("year", pa.int16()), ("month", pa.int8())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+
+def dataset_path(data_path: str) -> str:
+    """Get the directory of the partitioned dataset of a table
+
+    Args:
+        data_path (str): path of the table as a single parquet file
+
+    Returns:
+        str: path of the dataset, `data/silver/<snapshot>/fairings` for
+            `data/silver/<snapshot>/fairings.parquet`
+    """
+    return data_path.removesuffix(".parquet")
+
+
+def add_partition_columns(table: pa.Table, date_utc: pa.ChunkedArray) -> pa.Table:
+    """Add the `year` and `month` of the launch date as partition columns
+
+    Args:
+        table (pa.Table): table to partition
+        date_utc (pa.ChunkedArray): launch date of every row, as timestamps
+
+    Returns:
+        pa.Table: table with the `year` and `month` columns
+    """
+    return table.append_column(
+        PARTITION_SCHEMA.field("year"), pc.year(date_utc).cast(pa.int16())
+    ).append_column(PARTITION_SCHEMA.field("month"), pc.month(date_utc).cast(pa.int8()))
+
+
+def write_partitioned(
+    tables: Iterable[pa.Table],
+    schema: pa.Schema,
+    data_path: str,
+    row_group_size: int = 64 * 1024,
+    compression: str = "snappy",
+) -> str:
+    """Write the tables as a dataset partitioned by `year=YYYY/month=M`, the tables
+    must have the partition columns. The dataset is written in a `.part` directory
+    and renamed once complete, replacing the previous one
+
+    Args:
+        tables (Iterable[pa.Table]): tables to write, consumed one by one
+        schema (pa.Schema): schema of the tables, including the partition columns
+        data_path (str): directory of the dataset
+        row_group_size (int, optional): maximum rows per row group. Defaults to 64 * 1024.
+        compression (str, optional): parquet compression. Defaults to "snappy".
+
+    Returns:
+        str: directory of the dataset
+    """
+    partial_path = f"{data_path}.part"
+    shutil.rmtree(partial_path, ignore_errors=True)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    try:
+        ds.write_dataset(
+            (batch for table in tables for batch in table.to_batches()),
+            partial_path,
+            schema=schema,
+            format="parquet",
+            partitioning=PARTITIONING,
+            basename_template="part-{i}.parquet",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression=compression
+            ),
+            max_rows_per_group=row_group_size,
+            min_rows_per_group=min(row_group_size, 1 << 20),
+        )
+    except Exception:
+        shutil.rmtree(partial_path, ignore_errors=True)
+        raise
+    if not os.path.exists(partial_path):
+        # No rows, an empty file keeps the schema of the dataset
+        os.makedirs(partial_path)
+        data_schema = pa.schema(
+            [field for field in schema if field.name not in PARTITION_SCHEMA.names]
+        )
+        pq.write_table(data_schema.empty_table(), f"{partial_path}/part-0.parquet")
+    shutil.rmtree(data_path, ignore_errors=True)
+    os.replace(partial_path, data_path)
+    return data_path
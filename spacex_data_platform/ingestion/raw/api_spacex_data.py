@@ -1,43 +1,330 @@
 """Module to get data from SpaceX API and store it in a file"""
 
+import json
+import logging
 import os
+import shutil
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from spacex_data_platform.ingestion.constants import SPACEX_API_URL, SPACEX_COLLECTIONS
+from spacex_data_platform.ingestion.raw.fetch_state import FetchState
+from spacex_data_platform.ingestion.raw.object_store import RawObjectStore
+from spacex_data_platform.ingestion.raw.raw_file import (
+    CHECKSUM_EXTENSION,
+    link_or_copy,
+    open_raw_file,
+    read_checksum,
+    uncompressed_path,
+    write_raw_file,
+)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Methods of the requests retried, POST only queries the launches (`/query`) so it
+# is as safe to retry as GET
+RETRY_METHODS = ("GET", "POST")
 
 
 class ApiSpaceXData:
-    """Class to get data from SpaceX API and store it in a file"""
+    """Class to get data from SpaceX API and store it in a file
+
+    The launches are stored in `spacex_data.json` and every other collection in
+    `<collection>.json` of the same raw snapshot. All of them are fetched
+    concurrently over a shared keep-alive session that retries failed requests
+    with exponential backoff. The payloads are kept in a `RawObjectStore`, so the
+    snapshot files are links to a single copy of every distinct content.
+    """
 
     def __init__(
         self,
-        url: str = "https://api.spacexdata.com/v5/launches",
+        url: str = f"{SPACEX_API_URL}/v5/launches",
         raw_data_path: str = "data/raw",
+        stream: bool = True,
+        compression: str | None = None,
+        chunk_size: int = 64 * 1024,
+        conditional: bool = True,
+        incremental: bool = False,
+        page_size: int = 100,
+        collections: dict[str, str] | None = None,
+        max_workers: int | None = None,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 30,
     ):
         self.url = url
         self.raw_path = raw_data_path
+        self.stream = stream
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.conditional = conditional
+        self.incremental = incremental
+        self.page_size = page_size
+        if collections is None:
+            collections = {
+                name: f"{SPACEX_API_URL}/{path}"
+                for name, path in SPACEX_COLLECTIONS.items()
+            }
+        self.collections = collections
+        if max_workers is None:
+            # A request for the launches and one for every collection
+            max_workers = len(collections) + 1
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.checksum: str | None = None
+        self.state = FetchState(f"{raw_data_path}/fetch_state.json")
+        self.objects = RawObjectStore(f"{raw_data_path}/objects")
+        self.session = self._build_session(max_workers, retries, backoff_factor)
+
+    @staticmethod
+    def _build_session(
+        max_workers: int, retries: int, backoff_factor: float
+    ) -> requests.Session:
+        """Build the session shared by all the requests, keeping up to `max_workers`
+        connections alive and retrying with exponential backoff
+
+        Args:
+            max_workers (int): number of concurrent requests
+            retries (int): number of retries of a failed request
+            backoff_factor (float): factor of the exponential backoff between retries
 
-    def store(self, response) -> str:
-        """Store the response in a file
+        Returns:
+            requests.Session: session to request the SpaceX API
+        """
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def store(self, response, data_path: str) -> tuple[str, str]:
+        """Store the response in a file, writing the chunks as they arrive when streaming
+        so the payload is never fully held in memory
 
         Args:
             response (_type_): Response from the SpaceX API
+            data_path (str): Path of the uncompressed file
+
+        Returns:
+            tuple[str, str]: Path to the stored file and its checksum
+        """
+        if self.stream:
+            chunks = response.iter_content(chunk_size=self.chunk_size)
+        else:
+            chunks = [response.content]
+        stored_path, checksum = write_raw_file(
+            data_path, chunks, compression=self.compression
+        )
+        self.objects.add(stored_path, checksum)
+        return stored_path, checksum
+
+    def store_records(self, records: list[dict], data_path: str) -> tuple[str, str]:
+        """Store the records as a JSON array, serialising them one by one
+
+        Args:
+            records (list[dict]): records to store
+            data_path (str): Path of the uncompressed file
+
+        Returns:
+            tuple[str, str]: Path to the stored file and its checksum
+        """
+
+        def chunks() -> Iterator[bytes]:
+            yield b"["
+            for position, record in enumerate(records):
+                yield (b"," if position else b"") + json.dumps(record).encode()
+            yield b"]"
+
+        stored_path, checksum = write_raw_file(
+            data_path, chunks(), compression=self.compression
+        )
+        self.objects.add(stored_path, checksum)
+        return stored_path, checksum
+
+    def fetch(self, url: str, data_path: str) -> tuple | None:
+        """Get a collection from the SpaceX API and store it in a file
+
+        When `conditional`, the request carries the validators of the previous
+        response and nothing is stored if the API answers `304 Not Modified`.
+
+        Args:
+            url (str): url of the collection
+            data_path (str): Path of the uncompressed file
 
         Returns:
-            str: Path to the stored file
+            tuple | None: Path to the stored file, its checksum and the response
+                headers, None if the collection did not change
         """
-        data_path = f"{self.raw_path}/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.json"
-        os.makedirs(os.path.dirname(data_path), exist_ok=True)
-        with open(data_path, "w") as file:
-            file.write(response.text)
-        return data_path
+        headers = self.state.conditional_headers(url) if self.conditional else {}
+        response = self.session.get(
+            url, stream=self.stream, headers=headers, timeout=self.timeout
+        )
+        try:
+            if response.status_code == requests.codes.not_modified:
+                logging.info("%s not modified since the last snapshot", url)
+                return None
+            response.raise_for_status()
+            return *self.store(response, data_path), response.headers
+        finally:
+            response.close()
 
-    def get_data_and_store(self) -> str:
-        """Get data from SpaceX API and store it in a file
+    def get_launches_since(self, since: str) -> list[dict]:
+        """Get the launches with `date_utc` on or after `since` paginating over
+        the `/query` endpoint
+
+        Args:
+            since (str): ISO date from which take the launches
+
+        Returns:
+            list[dict]: launches on or after `since`
+        """
+        launches = []
+        page = 1
+        while True:
+            response = self.session.post(
+                f"{self.url}/query",
+                json={
+                    "query": {"date_utc": {"$gte": since}},
+                    "options": {
+                        "page": page,
+                        "limit": self.page_size,
+                        "sort": {"date_utc": "asc"},
+                    },
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            result = response.json()
+            launches.extend(result["docs"])
+            if not result.get("hasNextPage"):
+                return launches
+            page = result["nextPage"]
+
+    def fetch_incremental_launches(self, data_path: str) -> tuple | None:
+        """Get only the launches newer than or modified since the last snapshot and
+        store them merged with it
+
+        Launches are only modified by the API while they are upcoming or recent,
+        so the launches fetched are the ones dated on or after the oldest launch
+        that was still upcoming in the last snapshot, or after the newest one.
+
+        Args:
+            data_path (str): Path of the uncompressed file
+
+        Returns:
+            tuple | None: Path to the stored file, its checksum and no headers,
+                None if there are no changes
+        """
+        with open_raw_file(self.state.last_snapshot) as raw_file:
+            launches = {launch["id"]: launch for launch in json.load(raw_file)}
+        since = min(
+            (
+                launch["date_utc"]
+                for launch in launches.values()
+                if launch.get("upcoming")
+            ),
+            default=max(
+                (launch["date_utc"] for launch in launches.values()),
+                default="1970-01-01T00:00:00.000Z",
+            ),
+        )
+
+        changed = [
+            launch
+            for launch in self.get_launches_since(since)
+            if launches.get(launch["id"]) != launch
+        ]
+        if not changed:
+            logging.info("No launches changed since %s", since)
+            return None
+
+        logging.info("%s launches changed since %s", len(changed), since)
+        launches.update({launch["id"]: launch for launch in changed})
+        return *self.store_records(list(launches.values()), data_path), None
+
+    def fetch_launches(self, url: str, data_path: str) -> tuple | None:
+        """Get the launches, incrementally if enabled and there is a previous snapshot
+
+        Args:
+            url (str): url of the launches
+            data_path (str): Path of the uncompressed file
+
+        Returns:
+            tuple | None: Path to the stored file, its checksum and the response
+                headers, None if the launches did not change
+        """
+        if self.incremental and self.state.has_last_snapshot():
+            return self.fetch_incremental_launches(data_path)
+        return self.fetch(url, data_path)
+
+    def get_data_and_store(self) -> str | None:
+        """Get the launches and the rest of collections from SpaceX API concurrently
+        and store them in the same raw snapshot
+
+        When no collection changed the snapshot is discarded, otherwise the
+        unchanged collections are linked from the previous snapshot.
 
         Returns:
-            str: Path to the stored file
+            str | None: Path to the stored launches file, None if the data did not change
         """
-        response = requests.get(self.url)
+        snapshot_path = (
+            f"{self.raw_path}/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}"
+        )
+        new_snapshot = not os.path.exists(snapshot_path)
+        os.makedirs(snapshot_path, exist_ok=True)
+        data_paths = {self.url: f"{snapshot_path}/spacex_data.json"} | {
+            url: f"{snapshot_path}/{name}.json"
+            for name, url in self.collections.items()
+        }
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    url: executor.submit(
+                        self.fetch_launches if url == self.url else self.fetch,
+                        url,
+                        data_path,
+                    )
+                    for url, data_path in data_paths.items()
+                }
+                results = {url: future.result() for url, future in futures.items()}
+        except Exception:
+            if new_snapshot:
+                shutil.rmtree(snapshot_path, ignore_errors=True)
+            raise
+
+        if all(result is None for result in results.values()):
+            if new_snapshot:
+                shutil.rmtree(snapshot_path, ignore_errors=True)
+            return None
+
+        for url, result in results.items():
+            if result is None:
+                previous_path = self.state.last_path(url)
+                stored_path = f"{snapshot_path}/{os.path.basename(previous_path)}"
+                link_or_copy(previous_path, stored_path)
+                link_or_copy(
+                    f"{uncompressed_path(previous_path)}{CHECKSUM_EXTENSION}",
+                    f"{uncompressed_path(stored_path)}{CHECKSUM_EXTENSION}",
+                )
+                self.state.update(url, stored_path)
+            else:
+                stored_path, _, headers = result
+                self.state.update(url, stored_path, headers)
 
-        return self.store(response)
+        launches_path = self.state.responses[self.url]["path"]
+        self.checksum = read_checksum(launches_path)
+        self.state.last_snapshot = launches_path
+        self.state.save()
+        return launches_path
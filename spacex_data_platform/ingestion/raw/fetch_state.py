@@ -0,0 +1,90 @@
+"""Module to keep the state of the previous fetches against the SpaceX API"""
+
+import json
+import os
+
+
+class FetchState:
+    """Class to persist the validators (`ETag`, `Last-Modified`) and the stored path
+    of every fetched url and the last raw snapshot stored, so the next fetch can be
+    conditional"""
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self.responses: dict[str, dict[str, str]] = {}
+        self.last_snapshot: str | None = None
+        if os.path.exists(state_path):
+            with open(state_path) as file:
+                state = json.load(file)
+            self.responses = state.get("responses", {})
+            self.last_snapshot = state.get("last_snapshot")
+
+    def has_last_snapshot(self) -> bool:
+        """Check if the last stored raw snapshot is still available
+
+        Returns:
+            bool: True if there is a previous raw snapshot on disk
+        """
+        return self.last_snapshot is not None and os.path.exists(self.last_snapshot)
+
+    def last_path(self, url: str) -> str | None:
+        """Get the path where the last response of the url is stored
+
+        Args:
+            url (str): requested url
+
+        Returns:
+            str | None: path of the last stored response, None if not available
+        """
+        path = self.responses.get(url, {}).get("path")
+        if path is None or not os.path.exists(path):
+            return None
+        return path
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Get the headers to make a conditional request against the url
+
+        Args:
+            url (str): url to request
+
+        Returns:
+            dict[str, str]: `If-None-Match` and `If-Modified-Since` headers when known
+        """
+        if self.last_path(url) is None:
+            return {}
+        response = self.responses[url]
+        headers = {}
+        if "etag" in response:
+            headers["If-None-Match"] = response["etag"]
+        if "last_modified" in response:
+            headers["If-Modified-Since"] = response["last_modified"]
+        return headers
+
+    def update(self, url: str, path: str, headers=None) -> None:
+        """Record the path where the last response of the url is stored and its
+        validators, the previous validators are kept when no headers are given
+
+        Args:
+            url (str): requested url
+            path (str): path of the stored response
+            headers (_type_, optional): headers of the response. Defaults to None.
+        """
+        response = {"path": path}
+        if headers is None:
+            response = {**self.responses.get(url, {}), **response}
+        else:
+            if headers.get("ETag"):
+                response["etag"] = headers["ETag"]
+            if headers.get("Last-Modified"):
+                response["last_modified"] = headers["Last-Modified"]
+        self.responses[url] = response
+
+    def save(self) -> None:
+        """Persist the state"""
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "w") as file:
+            json.dump(
+                {"responses": self.responses, "last_snapshot": self.last_snapshot},
+                file,
+                indent=2,
+            )
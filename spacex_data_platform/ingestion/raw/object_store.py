@@ -0,0 +1,46 @@
+"""Module to store the raw payloads by content hash"""
+
+import os
+
+from spacex_data_platform.ingestion.raw.raw_file import link_or_copy
+
+
+class RawObjectStore:
+    """Class to store every distinct raw payload once, named by its sha256 checksum,
+    and make the timestamped snapshots point to it through hard links"""
+
+    def __init__(self, objects_path: str = "data/raw/objects"):
+        self.objects_path = objects_path
+
+    def object_path(self, data_path: str, checksum: str) -> str:
+        """Get the path of the object holding the content of a raw file
+
+        Args:
+            data_path (str): path of the raw file
+            checksum (str): sha256 checksum of its uncompressed content
+
+        Returns:
+            str: path of the object, keeping the extensions of the raw file
+        """
+        extensions = os.path.basename(data_path).split(".", 1)[1]
+        return f"{self.objects_path}/{checksum}.{extensions}"
+
+    def add(self, data_path: str, checksum: str) -> str:
+        """Move a raw file to the store and replace it by a link to the stored object,
+        if the object already exists the raw file is dropped
+
+        Args:
+            data_path (str): path of the raw file
+            checksum (str): sha256 checksum of its uncompressed content
+
+        Returns:
+            str: path of the stored object
+        """
+        object_path = self.object_path(data_path, checksum)
+        os.makedirs(self.objects_path, exist_ok=True)
+        if os.path.exists(object_path):
+            os.remove(data_path)
+        else:
+            os.replace(data_path, object_path)
+        link_or_copy(object_path, data_path)
+        return object_path
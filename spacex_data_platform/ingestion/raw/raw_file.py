@@ -0,0 +1,133 @@
+"""Module to write and read the raw snapshot files with optional compression"""
+
+import hashlib
+import os
+import shutil
+from collections.abc import Iterable
+
+import pyarrow as pa
+
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+CHECKSUM_EXTENSION = ".sha256"
+
+
+def compressed_path(data_path: str, compression: str | None) -> str:
+    """Get the path where a raw file is stored with the given compression
+
+    Args:
+        data_path (str): path of the uncompressed raw file
+        compression (str | None): `gzip`, `zstd` or None for no compression
+
+    Returns:
+        str: path of the raw file with the compression extension
+    """
+    if compression is None:
+        return data_path
+    if compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(
+            f"Unsupported compression {compression}, "
+            f"use one of {list(COMPRESSION_EXTENSIONS)}"
+        )
+    return f"{data_path}{COMPRESSION_EXTENSIONS[compression]}"
+
+
+def uncompressed_path(data_path: str) -> str:
+    """Remove the compression extension from a raw file path
+
+    Args:
+        data_path (str): path of the raw file
+
+    Returns:
+        str: path of the raw file without the compression extension
+    """
+    for extension in COMPRESSION_EXTENSIONS.values():
+        if data_path.endswith(extension):
+            return data_path[: -len(extension)]
+    return data_path
+
+
+def open_raw_file(data_path: str) -> pa.NativeFile:
+    """Open a raw file decompressing it on the fly based on its extension
+
+    Args:
+        data_path (str): path of the raw file
+
+    Returns:
+        pa.NativeFile: binary stream with the uncompressed content
+    """
+    return pa.input_stream(data_path, compression="detect")
+
+
+def write_raw_file(
+    data_path: str, chunks: Iterable[bytes], compression: str | None = None
+) -> tuple[str, str]:
+    """Write the chunks in a raw file as they arrive, compressing them on the fly
+    and recording the sha256 checksum of the uncompressed content next to it
+
+    The content is written to a `.part` file that is only renamed when complete,
+    so an interrupted download never leaves a truncated raw file behind.
+
+    Args:
+        data_path (str): path of the uncompressed raw file
+        chunks (Iterable[bytes]): content to write
+        compression (str | None, optional): `gzip`, `zstd` or None. Defaults to None.
+
+    Returns:
+        tuple[str, str]: path of the stored file and its sha256 checksum
+    """
+    stored_path = compressed_path(data_path, compression)
+    partial_path = f"{stored_path}.part"
+    checksum = hashlib.sha256()
+    with pa.output_stream(partial_path, compression=compression) as file:
+        for chunk in chunks:
+            if chunk:
+                checksum.update(chunk)
+                file.write(chunk)
+    os.replace(partial_path, stored_path)
+
+    digest = checksum.hexdigest()
+    with open(f"{data_path}{CHECKSUM_EXTENSION}", "w") as file:
+        file.write(f"{digest}  {os.path.basename(data_path)}\n")
+    return stored_path, digest
+
+
+def read_checksum(data_path: str) -> str | None:
+    """Read the checksum recorded next to a raw file
+
+    Args:
+        data_path (str): path of the raw file, compressed or not
+
+    Returns:
+        str | None: sha256 checksum of the uncompressed content, None if missing
+    """
+    checksum_path = f"{uncompressed_path(data_path)}{CHECKSUM_EXTENSION}"
+    if not os.path.exists(checksum_path):
+        return None
+    with open(checksum_path) as file:
+        return file.read().split()[0]
+
+
+def link_or_copy(source_path: str, data_path: str) -> None:
+    """Hard link a raw file in another location, copying it if the filesystem
+    does not support hard links. The files of a directory, as a partitioned
+    dataset, are linked one by one
+
+    Args:
+        source_path (str): path of the existing raw file or directory
+        data_path (str): path where the raw file has to be available
+    """
+    if os.path.isdir(source_path):
+        for directory, _, files in os.walk(source_path):
+            linked_directory = os.path.join(
+                data_path, os.path.relpath(directory, source_path)
+            )
+            os.makedirs(linked_directory, exist_ok=True)
+            for file in files:
+                link_or_copy(
+                    os.path.join(directory, file), os.path.join(linked_directory, file)
+                )
+        return
+    try:
+        os.link(source_path, data_path)
+    except OSError:
+        shutil.copyfile(source_path, data_path)
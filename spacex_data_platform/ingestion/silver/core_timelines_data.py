@@ -0,0 +1,193 @@
+"""Module to create the silver layer data"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from spacex_data_platform.ingestion.silver.flatten import explode_structs
+from spacex_data_platform.ingestion.silver.id_dictionary import IdDictionary
+from spacex_data_platform.ingestion.silver.schemas.core_timelines import (
+    CoreTimelinesSchema,
+)
+from spacex_data_platform.ingestion.silver.silver_data import (
+    SilverDataInterface,
+    launch_dates,
+    merge_previous,
+    read_bronze,
+    silver_path,
+    store_partitioned,
+)
+from spacex_data_platform.ingestion.silver.validation import (
+    ValidationSettings,
+    Validator,
+)
+
+
+def add_previous_launches(core_launches: pd.DataFrame) -> pd.DataFrame:
+    """Sort the launches of the cores by core and date and add the previous launch
+    of every core and the days since it, shifting the sorted launches once instead
+    of joining the launches with themselves
+
+    Args:
+        core_launches (pd.DataFrame): launches of the cores with their `date_utc`
+
+    Returns:
+        pd.DataFrame: launches sorted by `core_key` and `date_utc`, with the
+            `previous_id`, `previous_date_utc` and `gap_days` of every launch
+    """
+    timelines = core_launches.sort_values(
+        ["core_key", "date_utc", "flight"], ignore_index=True
+    )
+    same_core = (
+        timelines["core_key"]
+        .eq(timelines["core_key"].shift())
+        .to_numpy(dtype=bool, na_value=False)
+    )
+    previous_date_utc = timelines["date_utc"].shift().where(same_core)
+    return timelines.assign(
+        previous_id=timelines["id"].shift().where(same_core),
+        previous_date_utc=previous_date_utc,
+        gap_days=(timelines["date_utc"] - previous_date_utc) / pd.Timedelta(days=1),
+    )
+
+
+class SpaceXCoreTimelines(SilverDataInterface):
+    """Class to create the launches of every core, sorted by date with its previous
+    launch, from the bronze data"""
+
+    bronze_columns = ["id", "cores", "date_utc"]
+    schema = CoreTimelinesSchema
+    validator = Validator(CoreTimelinesSchema, global_checks=["primary_key"])
+    id_keys = {"launch_key": ("id", "launch"), "core_key": ("core", "core")}
+
+    @staticmethod
+    def generate_core_launches(
+        bronze_df: pd.DataFrame, id_dictionary: IdDictionary | None = None
+    ) -> pd.DataFrame:
+        """Generate the launches of every core from the bronze data, without their
+        previous launches
+
+        Args:
+            bronze_df (pd.DataFrame): bronze data
+            id_dictionary (IdDictionary | None, optional): dictionary of the surrogate
+                keys of the ids, one with only the ids of the bronze data if not
+                given. Defaults to None.
+
+        Returns:
+            pd.DataFrame: launches of the cores
+        """
+        # One row per core with each key of the dictionaries in 'cores' as a column
+        core_launches = explode_structs(
+            bronze_df[["id", "date_utc", "cores"]], "cores"
+        ).dropna(subset=["core"])
+
+        if id_dictionary is None:
+            id_dictionary = IdDictionary().update(bronze_df)
+        core_launches = id_dictionary.add_keys(
+            core_launches, SpaceXCoreTimelines.id_keys
+        )
+        return core_launches[
+            ["id", "launch_key", "core", "core_key", "flight", "date_utc"]
+        ]
+
+    @staticmethod
+    @validator.check_output
+    def generate_core_timelines(core_launches: pd.DataFrame) -> pd.DataFrame:
+        """Generate the core timelines from the launches of all the cores
+
+        Args:
+            core_launches (pd.DataFrame): launches of the cores
+
+        Returns:
+            pd.DataFrame: core timelines
+        """
+        return add_previous_launches(core_launches)
+
+    @staticmethod
+    def store(
+        bronze_data_path: str, df: pd.DataFrame, dates: pd.Series | None = None
+    ) -> str:
+        """Store the core timelines in the silver layer, partitioned by the year and
+        month of the launches if their dates are given
+
+        Args:
+            bronze_data_path (str): path of the bronze data
+            df (pd.DataFrame): core timelines
+            dates (pd.Series | None, optional): UTC launch dates by launch `id`. Defaults to None.
+
+        Returns:
+            str: path where the core timelines are stored
+        """
+        data_path = silver_path(
+            bronze_data_path.replace("bronze", "silver").replace(
+                "spacex_data", "core_timelines"
+            ),
+            dates is not None,
+        )
+        if dates is not None:
+            return store_partitioned(df, data_path, dates)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        df.to_parquet(data_path, index=False)
+        return data_path
+
+    @staticmethod
+    def run(
+        bronze_data_path: str = "data/bronze/2024_05_09__17_05_33/spacex_data.parquet",
+        filters: list[tuple] | None = None,
+        partitioned: bool = False,
+        previous_data_path: str | None = None,
+        bronze: pa.Table | None = None,
+        id_dictionary_path: str | None = None,
+        validation: ValidationSettings | None = None,
+    ) -> str:
+        """Get the core timelines from the bronze data
+
+        The previous launches are added once the changed launches of an incremental
+        bronze data are merged into the previous timelines, so the launches after a
+        changed one are updated too.
+
+        Args:
+            bronze_data_path (str, optional): bronze data from which take the cores information. Defaults to "data/bronze/2024_05_09__17_05_33/spacex_data.parquet".
+            filters (list[tuple] | None, optional): filters pushed down to the bronze data, as `[("year", ">=", 2020)]` for a partitioned one. Defaults to None.
+            partitioned (bool, optional): store the data partitioned by the year and month of the launches. Defaults to False.
+            previous_data_path (str | None, optional): previous silver data in which to merge the changed launches of an incremental bronze data. Defaults to None.
+            bronze (pa.Table | None, optional): bronze table shared by the silver ETLs, read from `bronze_data_path` if not given. Defaults to None.
+            id_dictionary_path (str | None, optional): id dictionary of the snapshot with the surrogate keys, the keys of the ids of the bronze data alone if not given. Defaults to None.
+            validation (ValidationSettings | None, optional): settings of the validation of the output, the default ones of the validator if not given. Defaults to None.
+
+        Returns:
+            str: path where the core timelines are stored
+        """
+        # The cores stay in Arrow to be flattened without Python objects
+        df = read_bronze(
+            bronze_data_path, SpaceXCoreTimelines.bronze_columns, filters, bronze
+        ).to_pandas(
+            types_mapper=lambda type: pd.ArrowDtype(type)
+            if pa.types.is_list(type)
+            else None
+        )
+
+        core_launches = SpaceXCoreTimelines.generate_core_launches(
+            df,
+            IdDictionary.read(id_dictionary_path)
+            if id_dictionary_path is not None
+            else None,
+        )
+
+        dates = launch_dates(df) if partitioned else None
+        if previous_data_path is not None:
+            core_launches, dates = merge_previous(
+                previous_data_path, bronze_data_path, core_launches, dates
+            )
+
+        return SpaceXCoreTimelines.store(
+            bronze_data_path,
+            SpaceXCoreTimelines.generate_core_timelines(
+                core_launches[
+                    ["id", "launch_key", "core", "core_key", "flight", "date_utc"]
+                ],
+                validation=validation,
+            ),
+            dates,
+        )
@@ -3,74 +3,145 @@
 import os
 
 import pandas as pd
-import pandera
+import pyarrow as pa
 
+from spacex_data_platform.ingestion.silver.flatten import explode_structs
+from spacex_data_platform.ingestion.silver.id_dictionary import IdDictionary
 from spacex_data_platform.ingestion.silver.schemas.cores_flights import (
     CoresFlightsSchema,
 )
-from spacex_data_platform.ingestion.silver.silver_data import SilverDataInterface
+from spacex_data_platform.ingestion.silver.silver_data import (
+    SilverDataInterface,
+    launch_dates,
+    merge_previous,
+    read_bronze,
+    silver_path,
+    store_partitioned,
+)
+from spacex_data_platform.ingestion.silver.validation import (
+    ValidationSettings,
+    Validator,
+)
 
 
 class SpaceXCores(SilverDataInterface):
     """Class to create the cores flight data from the bronze data"""
 
+    bronze_columns = ["id", "create_date", "provider_code", "cores", "date_utc"]
+    schema = CoresFlightsSchema
+    validator = Validator(CoresFlightsSchema, global_checks=["primary_key"])
+    id_keys = {
+        "launch_key": ("id", "launch"),
+        "core_key": ("core", "core"),
+        "landpad_key": ("landpad", "landpad"),
+    }
+
     @staticmethod
-    @pandera.check_output(CoresFlightsSchema.to_schema())
-    def generate_cores_flight_data(bronze_df: pd.DataFrame) -> pd.DataFrame:
+    @validator.check_output
+    def generate_cores_flight_data(
+        bronze_df: pd.DataFrame, id_dictionary: IdDictionary | None = None
+    ) -> pd.DataFrame:
         """Generate the cores flight data from the bronze data
 
         Args:
             bronze_df (pd.DataFrame): bronze data
+            id_dictionary (IdDictionary | None, optional): dictionary of the surrogate
+                keys of the ids, one with only the ids of the bronze data if not
+                given. Defaults to None.
 
         Returns:
             pd.DataFrame: cores flight data
         """
-        cores_flight_data = bronze_df[
-            ["id", "create_date", "provider_code", "cores"]
-        ].explode("cores")
-        # Convert each key of the dictionary in 'cores' to a separate column
-        cores_dict = cores_flight_data["cores"].apply(pd.Series)
-
-        # Concatenate the original DataFrame with the new DataFrame created from the dictionary
-        cores_flight_data = pd.concat(
-            [cores_flight_data.drop("cores", axis=1), cores_dict], axis=1
+        # One row per core with each key of the dictionaries in 'cores' as a column
+        cores_flight_data = explode_structs(
+            bronze_df[["id", "create_date", "provider_code", "cores"]], "cores"
         )
         cores_flight_data = cores_flight_data.dropna(subset=["core"])
 
+        if id_dictionary is None:
+            id_dictionary = IdDictionary().update(bronze_df)
+        cores_flight_data = id_dictionary.add_keys(
+            cores_flight_data, SpaceXCores.id_keys
+        )
+
         return cores_flight_data
 
     @staticmethod
-    def store(bronze_data_path: str, df: pd.DataFrame) -> str:
-        """Store the cores flight data in the silver layer
+    def store(
+        bronze_data_path: str, df: pd.DataFrame, dates: pd.Series | None = None
+    ) -> str:
+        """Store the cores flight data in the silver layer, partitioned by the year and
+        month of the launches if their dates are given
 
         Args:
             bronze_data_path (str): path of the bronze data
             df (pd.DataFrame): cores flight data
+            dates (pd.Series | None, optional): UTC launch dates by launch `id`. Defaults to None.
 
         Returns:
             str: path where the cores flight data is stored
         """
-        data_path = bronze_data_path.replace("bronze", "silver").replace(
-            "spacex_data", "cores_flight"
+        data_path = silver_path(
+            bronze_data_path.replace("bronze", "silver").replace(
+                "spacex_data", "cores_flight"
+            ),
+            dates is not None,
         )
+        if dates is not None:
+            return store_partitioned(df, data_path, dates)
         os.makedirs(os.path.dirname(data_path), exist_ok=True)
-        df.to_parquet(data_path)
+        df.to_parquet(data_path, index=False)
         return data_path
 
     @staticmethod
     def run(
         bronze_data_path: str = "data/bronze/2024_05_09__17_05_33/cores_flight.parquet",
+        filters: list[tuple] | None = None,
+        partitioned: bool = False,
+        previous_data_path: str | None = None,
+        bronze: pa.Table | None = None,
+        id_dictionary_path: str | None = None,
+        validation: ValidationSettings | None = None,
     ) -> str:
         """Get the cores information from the bronze data
 
         Args:
             bronze_data_path (str, optional): bronze data from which take the cores information. Defaults to "data/bronze/2024_05_09__17_05_33/spacex_data.parquet".
+            filters (list[tuple] | None, optional): filters pushed down to the bronze data, as `[("year", ">=", 2020)]` for a partitioned one. Defaults to None.
+            partitioned (bool, optional): store the data partitioned by the year and month of the launches. Defaults to False.
+            previous_data_path (str | None, optional): previous silver data in which to merge the changed launches of an incremental bronze data. Defaults to None.
+            bronze (pa.Table | None, optional): bronze table shared by the silver ETLs, read from `bronze_data_path` if not given. Defaults to None.
+            id_dictionary_path (str | None, optional): id dictionary of the snapshot with the surrogate keys, the keys of the ids of the bronze data alone if not given. Defaults to None.
+            validation (ValidationSettings | None, optional): settings of the validation of the output, the default ones of the validator if not given. Defaults to None.
 
         Returns:
             str: path where the cores information is stored
         """
-        df = pd.read_parquet(bronze_data_path)
+        # The cores stay in Arrow to be flattened without Python objects
+        df = read_bronze(
+            bronze_data_path, SpaceXCores.bronze_columns, filters, bronze
+        ).to_pandas(
+            types_mapper=lambda type: pd.ArrowDtype(type)
+            if pa.types.is_list(type)
+            else None
+        )
+
+        cores_flight_df = (
+            SpaceXCores.generate_cores_flight_data(
+                df,
+                IdDictionary.read(id_dictionary_path)
+                if id_dictionary_path is not None
+                else None,
+                validation=validation,
+            )
+            if previous_data_path is None or not df.empty
+            else None
+        )
 
-        cores_flight_df = SpaceXCores.generate_cores_flight_data(df)
+        dates = launch_dates(df) if partitioned else None
+        if previous_data_path is not None:
+            cores_flight_df, dates = merge_previous(
+                previous_data_path, bronze_data_path, cores_flight_df, dates
+            )
 
-        return SpaceXCores.store(bronze_data_path, cores_flight_df)
+        return SpaceXCores.store(bronze_data_path, cores_flight_df, dates)
@@ -3,74 +3,186 @@
 import os
 
 import pandas as pd
-import pandera
+import pyarrow as pa
 
+from spacex_data_platform.ingestion.silver.flatten import flatten_struct
+from spacex_data_platform.ingestion.silver.id_dictionary import IdDictionary
 from spacex_data_platform.ingestion.silver.schemas.fairings import (
     FairingsSchema,
 )
-from spacex_data_platform.ingestion.silver.silver_data import SilverDataInterface
+from spacex_data_platform.ingestion.silver.silver_data import (
+    SilverDataInterface,
+    launch_dates,
+    merge_previous,
+    read_bronze,
+    silver_path,
+    split_local_dates,
+    store_partitioned,
+)
+from spacex_data_platform.ingestion.silver.validation import (
+    ValidationSettings,
+    Validator,
+)
 
 
 class SpaceXFairings(SilverDataInterface):
     """Class to create the fairings data from the bronze data"""
 
+    bronze_columns = [
+        "id",
+        "provider_code",
+        "create_date",
+        "fairings",
+        "static_fire_date_utc",
+        "net",
+        "window",
+        "rocket",
+        "success",
+        "details",
+        "ships",
+        "capsules",
+        "payloads",
+        "launchpad",
+        "flight_number",
+        "name",
+        "date_utc",
+        "date_local",
+        "date_precision",
+        "upcoming",
+        "auto_update",
+        "tbd",
+        "launch_library_id",
+    ]
+    schema = FairingsSchema
+    validator = Validator(FairingsSchema)
+    id_keys = {
+        "launch_key": ("id", "launch"),
+        "rocket_key": ("rocket", "rocket"),
+        "launchpad_key": ("launchpad", "launchpad"),
+        "recovery_ship_keys": ("recovery_ships", "ship"),
+        "ship_keys": ("ships", "ship"),
+        "capsule_keys": ("capsules", "capsule"),
+        "payload_keys": ("payloads", "payload"),
+    }
+
     @staticmethod
-    @pandera.check_output(FairingsSchema.to_schema())
-    def generate_fairings_data(bronze_df: pd.DataFrame) -> pd.DataFrame:
+    @validator.check_output
+    def generate_fairings_data(
+        bronze_df: pd.DataFrame, id_dictionary: IdDictionary | None = None
+    ) -> pd.DataFrame:
         """Generate the fairings data from the bronze data
 
         Args:
             bronze_df (pd.DataFrame): bronze data
+            id_dictionary (IdDictionary | None, optional): dictionary of the surrogate
+                keys of the ids, one with only the ids of the bronze data if not
+                given. Defaults to None.
 
         Returns:
             pd.DataFrame: fairings data
         """
-        # Convert each key of the dictionary in 'cores' to a separate column
-        fairings_dict = bronze_df["fairings"].apply(pd.Series)
-        fairings_dict = fairings_dict.rename(columns={"ships": "recovery_ships"})
+        # The local date as its UTC timestamp, keeping its original offset
+        date_local, date_local_offset = split_local_dates(bronze_df["date_local"])
+        bronze_df = bronze_df.assign(
+            date_local=date_local, date_local_offset=date_local_offset
+        )
 
-        # Concatenate the original DataFrame with the new DataFrame created from the dictionary
-        fairings_data = pd.concat(
-            [bronze_df.drop("fairings", axis=1), fairings_dict], axis=1
+        # Each key of the dictionaries in 'fairings' as a column, keeping only the
+        # columns of the schema before flattening them
+        schema_columns = list(SpaceXFairings.validator.structure.columns)
+        fairings_data = flatten_struct(
+            bronze_df[
+                [column for column in bronze_df.columns if column in schema_columns]
+                + ["fairings"]
+            ],
+            "fairings",
+            {"ships": "recovery_ships"},
         )
 
-        schema_columns = list(FairingsSchema.to_schema().columns.keys())
-        fairings_data = fairings_data[schema_columns]
+        if id_dictionary is None:
+            id_dictionary = IdDictionary().update(bronze_df)
+        fairings_data = id_dictionary.add_keys(fairings_data, SpaceXFairings.id_keys)[
+            schema_columns
+        ]
 
         return fairings_data
 
     @staticmethod
-    def store(bronze_data_path: str, df: pd.DataFrame) -> str:
-        """Store the fairings data in the silver layer
+    def store(
+        bronze_data_path: str, df: pd.DataFrame, dates: pd.Series | None = None
+    ) -> str:
+        """Store the fairings data in the silver layer, partitioned by the year and
+        month of the launches if their dates are given
 
         Args:
             bronze_data_path (str): path of the bronze data
             df (pd.DataFrame): fairings data
+            dates (pd.Series | None, optional): UTC launch dates by launch `id`. Defaults to None.
 
         Returns:
             str: path where the fairings data is stored
         """
-        data_path = bronze_data_path.replace("bronze", "silver").replace(
-            "spacex_data", "fairings"
+        data_path = silver_path(
+            bronze_data_path.replace("bronze", "silver").replace(
+                "spacex_data", "fairings"
+            ),
+            dates is not None,
         )
+        if dates is not None:
+            return store_partitioned(df, data_path, dates)
         os.makedirs(os.path.dirname(data_path), exist_ok=True)
-        df.to_parquet(data_path)
+        df.to_parquet(data_path, index=False)
         return data_path
 
     @staticmethod
     def run(
         bronze_data_path: str = "data/bronze/2024_05_09__17_05_33/fairings.parquet",
+        filters: list[tuple] | None = None,
+        partitioned: bool = False,
+        previous_data_path: str | None = None,
+        bronze: pa.Table | None = None,
+        id_dictionary_path: str | None = None,
+        validation: ValidationSettings | None = None,
     ) -> str:
         """Get the fairings information from the bronze data
 
         Args:
             bronze_data_path (str, optional): bronze data from which take the fairings information. Defaults to "data/bronze/2024_05_09__17_05_33/spacex_data.parquet".
+            filters (list[tuple] | None, optional): filters pushed down to the bronze data, as `[("year", ">=", 2020)]` for a partitioned one. Defaults to None.
+            partitioned (bool, optional): store the data partitioned by the year and month of the launches. Defaults to False.
+            previous_data_path (str | None, optional): previous silver data in which to merge the changed launches of an incremental bronze data. Defaults to None.
+            bronze (pa.Table | None, optional): bronze table shared by the silver ETLs, read from `bronze_data_path` if not given. Defaults to None.
+            id_dictionary_path (str | None, optional): id dictionary of the snapshot with the surrogate keys, the keys of the ids of the bronze data alone if not given. Defaults to None.
+            validation (ValidationSettings | None, optional): settings of the validation of the output, the default ones of the validator if not given. Defaults to None.
 
         Returns:
             str: path where the fairings information is stored
         """
-        df = pd.read_parquet(bronze_data_path)
+        # The fairings stay in Arrow to be flattened without Python objects
+        df = read_bronze(
+            bronze_data_path, SpaceXFairings.bronze_columns, filters, bronze
+        ).to_pandas(
+            types_mapper=lambda type: pd.ArrowDtype(type)
+            if pa.types.is_struct(type)
+            else None
+        )
+
+        fairings_df = (
+            SpaceXFairings.generate_fairings_data(
+                df,
+                IdDictionary.read(id_dictionary_path)
+                if id_dictionary_path is not None
+                else None,
+                validation=validation,
+            )
+            if previous_data_path is None or not df.empty
+            else None
+        )
 
-        cores_flight_df = SpaceXFairings.generate_fairings_data(df)
+        dates = launch_dates(df) if partitioned else None
+        if previous_data_path is not None:
+            fairings_df, dates = merge_previous(
+                previous_data_path, bronze_data_path, fairings_df, dates
+            )
 
-        return SpaceXFairings.store(bronze_data_path, cores_flight_df)
+        return SpaceXFairings.store(bronze_data_path, fairings_df, dates)
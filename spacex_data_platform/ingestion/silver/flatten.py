@@ -0,0 +1,66 @@
+"""Module to flatten the struct and list of struct columns of the bronze data"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def explode_structs(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Explode a column of lists of structs into one row per element and one column
+    per struct field, with Arrow instead of `explode` and `apply(pd.Series)`
+
+    The rows with empty or null lists are dropped and the index of every element
+    is the one of its row, as with `explode`.
+
+    Args:
+        df (pd.DataFrame): data with the list of structs column, as Python lists of
+            dictionaries or an Arrow backed column
+        column (str): column to explode
+
+    Returns:
+        pd.DataFrame: data without the column, repeated per element, and the fields
+            of the structs
+    """
+    lists = pa.array(df[column])
+    if isinstance(lists, pa.ChunkedArray):
+        lists = lists.combine_chunks()
+    parents = pc.list_parent_indices(lists).to_numpy()
+    values = pc.list_flatten(lists)
+    fields = pd.DataFrame(
+        {
+            field.name: array.to_pandas()
+            for field, array in zip(values.type, values.flatten())
+        }
+    )
+    exploded = df.drop(columns=column).take(parents)
+    fields.index = exploded.index
+    return pd.concat([exploded, fields], axis=1)
+
+
+def flatten_struct(
+    df: pd.DataFrame, column: str, names: dict[str, str] | None = None
+) -> pd.DataFrame:
+    """Replace a struct column by one column per field, with Arrow instead of
+    `apply(pd.Series)`
+
+    Args:
+        df (pd.DataFrame): data with the struct column, as Python dictionaries or an
+            Arrow backed column
+        column (str): column to flatten
+        names (dict[str, str] | None, optional): column names of the fields that
+            must not be named as the field. Defaults to None.
+
+    Returns:
+        pd.DataFrame: data without the column and the fields of the structs
+    """
+    structs = pa.array(df[column])
+    if isinstance(structs, pa.ChunkedArray):
+        structs = structs.combine_chunks()
+    fields = pd.DataFrame(
+        {
+            (names or {}).get(field.name, field.name): array.to_pandas()
+            for field, array in zip(structs.type, structs.flatten())
+        }
+    )
+    fields.index = df.index
+    return pd.concat([df.drop(columns=column), fields], axis=1)
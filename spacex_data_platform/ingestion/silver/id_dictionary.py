@@ -0,0 +1,221 @@
+"""Module with the dictionary of the Mongo ids of the SpaceX entities to integer
+surrogate keys"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from spacex_data_platform.ingestion.partitioning import dataset_path
+
+# Bronze columns with the ids of every entity, `cores.core` is the field `core` of
+# the structs in the `cores` lists
+ENTITY_IDS = {
+    "launch": ["id"],
+    "rocket": ["rocket"],
+    "launchpad": ["launchpad"],
+    "core": ["cores.core"],
+    "landpad": ["cores.landpad"],
+    "ship": ["ships", "fairings.ships"],
+    "capsule": ["capsules"],
+    "payload": ["payloads"],
+}
+# Bronze columns read to update the dictionary
+BRONZE_ID_COLUMNS = list(
+    dict.fromkeys(path.split(".")[0] for paths in ENTITY_IDS.values() for path in paths)
+)
+ID_DICTIONARY_SCHEMA = pa.schema(
+    [
+        pa.field("entity", pa.string(), nullable=False),
+        pa.field("id", pa.string(), nullable=False),
+        pa.field("key", pa.int32(), nullable=False),
+    ]
+)
+
+
+def id_dictionary_paths(bronze_data_path: str) -> tuple[str, str]:
+    """Get the paths of the id dictionary of a bronze snapshot and of the persistent
+    one, kept next to the directories of the snapshots
+
+    Args:
+        bronze_data_path (str): path of the bronze data
+
+    Returns:
+        tuple[str, str]: path of the dictionary of the snapshot, as
+            `data/ids/<snapshot>/id_dictionary.parquet`, and of the persistent one,
+            as `data/ids/id_dictionary.parquet`
+    """
+    snapshot_path = (
+        dataset_path(bronze_data_path)
+        .replace("bronze", "ids")
+        .replace("spacex_data", "id_dictionary")
+        + ".parquet"
+    )
+    return snapshot_path, os.path.join(
+        os.path.dirname(os.path.dirname(snapshot_path)), "id_dictionary.parquet"
+    )
+
+
+def column_ids(df: pd.DataFrame, path: str) -> pa.Array:
+    """Get all the ids of a column of the bronze data, flattening its lists and
+    taking the field of its structs
+
+    Args:
+        df (pd.DataFrame): bronze data, as Python objects or Arrow backed columns
+        path (str): column of the ids, as `cores.core` for a field of its structs
+
+    Returns:
+        pa.Array: ids of the column, nulls included
+    """
+    column, *fields = path.split(".")
+    ids = pa.array(df[column])
+    if isinstance(ids, pa.ChunkedArray):
+        ids = ids.combine_chunks()
+    for field in [*fields, None]:
+        while pa.types.is_list(ids.type):
+            ids = pc.list_flatten(ids)
+        if field is not None:
+            ids = pc.struct_field(ids, field)
+    if pa.types.is_dictionary(ids.type):
+        ids = ids.dictionary_decode()
+    return ids.cast(pa.string())
+
+
+class IdDictionary:
+    """Dictionary of the ids of every entity to integer surrogate keys
+
+    The key of an id is its position in the ids of its entity in the order they were
+    first seen. The new ids are appended, so the keys never change across snapshots
+    and the keys of the silver tables stay valid when they are reused.
+    """
+
+    def __init__(self, ids: dict[str, pd.Index] | None = None):
+        self.ids = ids or {}
+
+    @staticmethod
+    def read(path: str) -> "IdDictionary":
+        """Read the dictionary, empty if it does not exist yet
+
+        Args:
+            path (str): path of the dictionary
+
+        Returns:
+            IdDictionary: dictionary stored in the path
+        """
+        if not os.path.exists(path):
+            return IdDictionary()
+        df = pd.read_parquet(path).sort_values(["entity", "key"])
+        return IdDictionary(
+            {
+                entity: pd.Index(ids["id"].to_numpy(), dtype=object)
+                for entity, ids in df.groupby("entity", sort=False)
+            }
+        )
+
+    def write(self, path: str) -> str:
+        """Write the dictionary, replacing the previous one atomically
+
+        Args:
+            path (str): path of the dictionary
+
+        Returns:
+            str: path of the dictionary
+        """
+        table = pa.Table.from_pydict(
+            {
+                "entity": [entity for entity, ids in self.ids.items() for _ in ids],
+                "id": [id for ids in self.ids.values() for id in ids],
+                "key": np.concatenate(
+                    [np.arange(len(ids), dtype=np.int32) for ids in self.ids.values()]
+                    or [np.array([], dtype=np.int32)]
+                ),
+            },
+            schema=ID_DICTIONARY_SCHEMA,
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        pq.write_table(table, f"{path}.part")
+        os.replace(f"{path}.part", path)
+        return path
+
+    def update(self, df: pd.DataFrame) -> "IdDictionary":
+        """Append the ids of the bronze data that are not in the dictionary yet, the
+        entities whose columns are not in the data are kept as they are
+
+        Args:
+            df (pd.DataFrame): bronze data
+
+        Returns:
+            IdDictionary: the dictionary itself
+        """
+        for entity, paths in ENTITY_IDS.items():
+            paths = [path for path in paths if path.split(".")[0] in df.columns]
+            if not paths:
+                continue
+            ids = pc.unique(
+                pc.drop_null(pa.chunked_array([column_ids(df, path) for path in paths]))
+            ).to_numpy(zero_copy_only=False)
+            known = self.ids.get(entity, pd.Index([], dtype=object))
+            new_ids = ids[known.get_indexer(ids) < 0]
+            if len(new_ids) or entity not in self.ids:
+                self.ids[entity] = known.append(pd.Index(new_ids, dtype=object))
+        return self
+
+    def keys(self, entity: str, ids: pa.Array) -> pa.Array:
+        """Get the keys of some ids of an entity
+
+        Args:
+            entity (str): entity of the ids
+            ids (pa.Array): ids of the entity
+
+        Raises:
+            KeyError: if an id is not in the dictionary
+
+        Returns:
+            pa.Array: int32 keys of the ids, null for the null ids
+        """
+        ids = ids.to_numpy(zero_copy_only=False)
+        keys = self.ids.get(entity, pd.Index([], dtype=object)).get_indexer(ids)
+        nulls = pd.isna(ids)
+        unknown = (keys < 0) & ~nulls
+        if unknown.any():
+            raise KeyError(
+                f"{entity} ids not in the id dictionary: {list(ids[unknown][:5])}"
+            )
+        return pa.array(keys.astype(np.int32), mask=nulls)
+
+    def add_keys(
+        self, df: pd.DataFrame, id_keys: dict[str, tuple[str, str]]
+    ) -> pd.DataFrame:
+        """Add the keys of the id columns of the silver data, a list of keys for the
+        columns with lists of ids
+
+        Args:
+            df (pd.DataFrame): silver data
+            id_keys (dict[str, tuple[str, str]]): id column and entity of every key
+                column, as `{"core_key": ("core", "core")}`
+
+        Returns:
+            pd.DataFrame: silver data with the key columns
+        """
+        key_columns = {}
+        for key_column, (column, entity) in id_keys.items():
+            ids = pa.array(df[column], from_pandas=True)
+            if isinstance(ids, pa.ChunkedArray):
+                ids = ids.combine_chunks()
+            if pa.types.is_list(ids.type):
+                # The offsets only start at 0 if the array is not a slice
+                offsets = pc.subtract(ids.offsets, ids.offsets[0])
+                keys = pa.ListArray.from_arrays(
+                    offsets,
+                    self.keys(entity, column_ids(df, column)),
+                    mask=ids.is_null(),
+                ).to_pandas()
+            else:
+                keys = self.keys(entity, column_ids(df, column)).to_pandas(
+                    types_mapper={pa.int32(): pd.Int32Dtype()}.get
+                )
+            key_columns[key_column] = keys.set_axis(df.index)
+        return df.assign(**key_columns)
@@ -0,0 +1,51 @@
+"""This module contains the schema to validate the core timelines."""
+
+import pandas as pd
+import pandera as pa
+from pandera.typing import Series
+
+
+class CoreTimelinesSchema(pa.DataFrameModel):
+    """Schema to validate the launches of every core with its previous launch"""
+
+    id: Series[str] = pa.Field(nullable=False, coerce=True)
+    launch_key: Series[pd.Int32Dtype] = pa.Field(nullable=True, coerce=True)
+    core: Series[str] = pa.Field(nullable=False, coerce=True)
+    core_key: Series[pd.Int32Dtype] = pa.Field(nullable=False, coerce=True)
+    flight: Series[int] = pa.Field(nullable=False, coerce=True)
+    date_utc: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=False, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
+    )
+    previous_id: Series[str] = pa.Field(nullable=True, coerce=True)
+    previous_date_utc: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=True, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
+    )
+    gap_days: Series[float] = pa.Field(nullable=True, coerce=True, ge=0)
+
+    @pa.dataframe_check(ignore_na=False)
+    def primary_key(self, df: pd.DataFrame) -> Series[bool]:
+        """Check if the combination of 'id' and 'core' is unique
+
+        Args:
+            df (pd.DataFrame): dataframe to be checked
+
+        Returns:
+            Series[bool]: returns what rows accomplish and what not the condition
+        """
+        return ~df.duplicated(subset=["id", "core"])
+
+    @pa.dataframe_check(ignore_na=False)
+    def gap_days_is_the_time_since_the_previous_launch(
+        self, df: pd.DataFrame
+    ) -> Series[bool]:
+        """The gap must be the days since the previous launch of the core, and be
+        null only for its first launch
+
+        Args:
+            df (pd.DataFrame): dataframe to be checked
+
+        Returns:
+            Series[bool]: returns what rows acomplishes and what not the condition
+        """
+        gap_days = (df["date_utc"] - df["previous_date_utc"]) / pd.Timedelta(days=1)
+        return (gap_days.isna() & df["gap_days"].isna()) | (gap_days == df["gap_days"])
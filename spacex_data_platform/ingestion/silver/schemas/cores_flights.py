@@ -11,7 +11,9 @@ class CoresFlightsSchema(pa.DataFrameModel):
     id: Series[str] = pa.Field(nullable=True, coerce=True)
     core: Series[str] = pa.Field(nullable=False, coerce=True)
     provider_code: Series[str] = pa.Field(nullable=False, coerce=True)
-    create_date: Series[str] = pa.Field(nullable=False, coerce=True)
+    create_date: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=False, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
+    )
     flight: Series[int] = pa.Field(nullable=False, coerce=True)
     gridfins: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
     landing_attempt: Series[pd.BooleanDtype] = pa.Field(nullable=True, coerce=True)
@@ -20,8 +22,12 @@ class CoresFlightsSchema(pa.DataFrameModel):
     landpad: Series[str] = pa.Field(nullable=True, coerce=True)
     legs: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
     reused: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
+    # Surrogate keys of the ids in the id dictionary
+    launch_key: Series[pd.Int32Dtype] = pa.Field(nullable=True, coerce=True)
+    core_key: Series[pd.Int32Dtype] = pa.Field(nullable=False, coerce=True)
+    landpad_key: Series[pd.Int32Dtype] = pa.Field(nullable=True, coerce=True)
 
-    @pa.dataframe_check
+    @pa.dataframe_check(ignore_na=False)
     def primary_key(self, df: pd.DataFrame) -> Series[bool]:
         """Check if the combination of 'id' and 'core' is unique
 
@@ -33,19 +39,7 @@ class CoresFlightsSchema(pa.DataFrameModel):
         """
         return ~df.duplicated(subset=["id", "core"])
 
-    @pa.check(create_date, name="create_date_format")
-    def create_date_format(cls, date_str: Series[str]) -> Series[bool]:
-        """Check if the date has the format 'YYYY-MM-DDTHH:MM:SS'
-
-        Args:
-            date_str (Series[str]): date to be checked
-
-        Returns:
-            Series[bool]: returns what rows accomplish and what not the condition
-        """
-        return date_str.str.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
-
-    @pa.dataframe_check
+    @pa.dataframe_check(ignore_na=False)
     def if_landing_success_landpad_and_landing_type_are_filled(
         self,
         df: pd.DataFrame,
@@ -59,15 +53,12 @@ class CoresFlightsSchema(pa.DataFrameModel):
         Returns:
             Series[bool]: returns what rows acomplishes and what not the condition
         """
-        column_applicable = df[
-            (df["landing_success"]) & (df["landing_type"] != "Ocean")
-        ][["landing_type", "landpad"]]
-        return (
-            column_applicable["landing_type"].notna()
-            & column_applicable["landpad"].notna()
+        applicable = df["landing_success"].fillna(False).astype(bool) & (
+            df["landing_type"] != "Ocean"
         )
+        return ~applicable | (df["landing_type"].notna() & df["landpad"].notna())
 
-    @pa.dataframe_check
+    @pa.dataframe_check(ignore_na=False)
     def if_core_is_reused_flight_bigger_than_one(
         self,
         df: pd.DataFrame,
@@ -80,5 +71,4 @@ class CoresFlightsSchema(pa.DataFrameModel):
         Returns:
             Series[bool]: returns what rows acomplishes and what not the condition
         """
-        column_applicable = df[df["reused"]]["flight"]
-        return column_applicable > 1
+        return ~df["reused"].fillna(False).astype(bool) | (df["flight"] > 1)
@@ -10,12 +10,16 @@ class FairingsSchema(pa.DataFrameModel):
 
     id: Series[str] = pa.Field(nullable=True, coerce=True, unique=True)
     provider_code: Series[str] = pa.Field(nullable=False, coerce=True)
-    create_date: Series[str] = pa.Field(nullable=False, coerce=True)
+    create_date: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=False, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
+    )
     recovered: Series[pd.BooleanDtype] = pa.Field(nullable=True, coerce=True)
     recovery_attempt: Series[pd.BooleanDtype] = pa.Field(nullable=True, coerce=True)
     reused: Series[pd.BooleanDtype] = pa.Field(nullable=True, coerce=True)
     recovery_ships: Series[list[str]] = pa.Field(nullable=True, coerce=True)
-    static_fire_date_utc: Series[str] = pa.Field(nullable=True, coerce=True)
+    static_fire_date_utc: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=True, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
+    )
     net: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
     window: Series[pd.Int64Dtype] = pa.Field(nullable=True, coerce=True)
     rocket: Series[str] = pa.Field(nullable=False, coerce=True)
@@ -27,68 +31,26 @@ class FairingsSchema(pa.DataFrameModel):
     launchpad: Series[str] = pa.Field(nullable=False, coerce=True)
     flight_number: Series[int] = pa.Field(nullable=False, coerce=True)
     name: Series[str] = pa.Field(nullable=False, coerce=True)
-    date_utc: Series[str] = pa.Field(
-        nullable=False,
-        coerce=True,
+    date_utc: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=False, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
     )
-    date_local: Series[str] = pa.Field(
-        nullable=False,
-        coerce=True,
+    date_local: Series[pd.DatetimeTZDtype] = pa.Field(
+        nullable=False, coerce=True, dtype_kwargs={"unit": "ms", "tz": "UTC"}
+    )
+    # Offset in minutes of the local time of the launch site from UTC
+    date_local_offset: Series[pd.Int16Dtype] = pa.Field(
+        nullable=False, coerce=True, ge=-14 * 60, le=14 * 60
     )
     date_precision: Series[str] = pa.Field(nullable=False, coerce=True)
     upcoming: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
     auto_update: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
     tbd: Series[pd.BooleanDtype] = pa.Field(nullable=False, coerce=True)
     launch_library_id: Series[str] = pa.Field(nullable=True, coerce=True)
-
-    @pa.check(create_date, name="create_date_format")
-    def create_date_format(cls, date_str: Series[str]) -> Series[bool]:
-        """Check if the date has the format 'YYYY-MM-DDTHH:MM:SS'
-
-        Args:
-            date_str (Series[str]): date to be checked
-
-        Returns:
-            Series[bool]: returns what rows accomplish and what not the condition
-        """
-        return date_str.str.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
-
-    @pa.check(static_fire_date_utc, name="static_fire_date_utc_format")
-    def static_fire_date_utc_format(cls, date_str: Series[str]) -> Series[bool]:
-        """Check if the date has the format 'YYYY-MM-DDTHH:MM:SS'
-
-        Args:
-            date_str (Series[str]): date to be checked
-
-        Returns:
-            Series[bool]: returns what rows accomplish and what not the condition
-        """
-        return date_str.isna() | date_str.str.match(
-            r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"
-        )
-
-    @pa.check(date_utc, name="date_utc_format")
-    def date_utc_format(cls, date_str: Series[str]) -> Series[bool]:
-        """Check if the date has the format 'YYYY-MM-DDTHH:MM:SS.mmmZ'
-
-        Args:
-            date_str (Series[str]): date to be checked
-
-        Returns:
-            Series[bool]: returns what rows accomplish and what not the condition
-        """
-        return date_str.str.match(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}.\d{3}Z")
-
-    @pa.check(date_local, name="date_local_format")
-    def date_local_format(cls, date_str: Series[str]) -> Series[bool]:
-        """Check if the date has the format 'YYYY-MM-DDTHH:MM:SS+-HH:MM'
-
-        Args:
-            date_str (Series[str]): date to be checked
-
-        Returns:
-            Series[bool]: returns what rows accomplish and what not the condition
-        """
-        return date_str.str.match(
-            r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[\+,-]\d{2}:\d{2}"
-        )
+    # Surrogate keys of the ids in the id dictionary
+    launch_key: Series[pd.Int32Dtype] = pa.Field(nullable=True, coerce=True)
+    rocket_key: Series[pd.Int32Dtype] = pa.Field(nullable=False, coerce=True)
+    launchpad_key: Series[pd.Int32Dtype] = pa.Field(nullable=False, coerce=True)
+    recovery_ship_keys: Series[list[int]] = pa.Field(nullable=True, coerce=True)
+    ship_keys: Series[list[int]] = pa.Field(nullable=False, coerce=True)
+    capsule_keys: Series[list[int]] = pa.Field(nullable=False, coerce=True)
+    payload_keys: Series[list[int]] = pa.Field(nullable=False, coerce=True)
@@ -3,13 +3,186 @@
 from abc import ABC, abstractmethod
 
 import pandas as pd
+import pandera
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from spacex_data_platform.ingestion.bronze.changes import changes_path
+from spacex_data_platform.ingestion.partitioning import (
+    PARTITION_SCHEMA,
+    add_partition_columns,
+    dataset_path,
+    write_partitioned,
+)
+from spacex_data_platform.ingestion.silver.validation import (
+    ValidationSettings,
+    Validator,
+)
+
+
+def split_local_dates(dates: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Split the local ISO dates of the bronze data, as `YYYY-MM-DDTHH:MM:SS-05:00`,
+    in their UTC timestamps and their original offsets, parsed in Arrow
+
+    Args:
+        dates (pd.Series): local dates with their UTC offset
+
+    Returns:
+        tuple[pd.Series, pd.Series]: UTC timestamps and offsets in minutes
+    """
+    strings = pa.array(dates, type=pa.string(), from_pandas=True)
+    timestamps = pc.strptime(strings, format="%Y-%m-%dT%H:%M:%S%z", unit="ms")
+    # The wall clock time without the offset, as if it were UTC
+    wall_clock = pc.strptime(
+        pc.utf8_slice_codeunits(strings, 0, 19), format="%Y-%m-%dT%H:%M:%S", unit="ms"
+    )
+    offsets = pc.divide(
+        pc.subtract(wall_clock.cast(pa.int64()), timestamps.cast(pa.int64())),
+        60 * 1000,
+    )
+    return (
+        timestamps.to_pandas().set_axis(dates.index),
+        offsets.cast(pa.int16()).to_pandas().astype("Int16").set_axis(dates.index),
+    )
+
+
+def read_bronze(
+    bronze_data_path: str,
+    columns: list[str],
+    filters: list[tuple] | None = None,
+    bronze: pa.Table | None = None,
+) -> pa.Table:
+    """Read the bronze columns used by a silver ETL, taking them without copies
+    from the bronze table shared by all the ETLs if it is given
+
+    Args:
+        bronze_data_path (str): path of the bronze data
+        columns (list[str]): bronze columns used by the ETL
+        filters (list[tuple] | None, optional): filters pushed down to the bronze
+            data. Defaults to None.
+        bronze (pa.Table | None, optional): bronze table already loaded. Defaults to None.
+
+    Returns:
+        pa.Table: bronze table with only the columns of the ETL
+    """
+    if bronze is None:
+        return pq.read_table(
+            bronze_data_path, columns=columns, filters=filters, memory_map=True
+        )
+    bronze = bronze.select(columns)
+    if filters is not None:
+        bronze = bronze.filter(pq.filters_to_expression(filters))
+    return bronze
+
+
+def launch_dates(bronze_df: pd.DataFrame) -> pd.Series:
+    """Get the launch date of every launch of the bronze data
+
+    Args:
+        bronze_df (pd.DataFrame): bronze data
+
+    Returns:
+        pd.Series: UTC launch dates by launch `id`
+    """
+    return pd.Series(
+        pd.to_datetime(bronze_df["date_utc"], utc=True).to_numpy(),
+        index=bronze_df["id"].to_numpy(),
+    )
+
+
+def silver_path(data_path: str, partitioned: bool) -> str:
+    """Get the path of a silver table, a directory if it is partitioned
+
+    Args:
+        data_path (str): path of the table
+        partitioned (bool): whether the table is partitioned
+
+    Returns:
+        str: path of the parquet file or directory of the partitioned dataset
+    """
+    path = dataset_path(data_path)
+    return path if partitioned else f"{path}.parquet"
+
+
+def store_partitioned(df: pd.DataFrame, data_path: str, dates: pd.Series) -> str:
+    """Store a silver table partitioned by the year and month of its launches
+
+    Args:
+        df (pd.DataFrame): silver data with the launch `id`
+        data_path (str): directory of the dataset
+        dates (pd.Series): UTC launch dates by launch `id`
+
+    Returns:
+        str: directory of the dataset
+    """
+    table = add_partition_columns(
+        pa.Table.from_pandas(df, preserve_index=False),
+        pa.chunked_array([pa.array(df["id"].map(dates), pa.timestamp("ms", tz="UTC"))]),
+    )
+    return write_partitioned([table], table.schema, data_path)
+
+
+def merge_previous(
+    previous_data_path: str,
+    bronze_data_path: str,
+    df: pd.DataFrame | None,
+    dates: pd.Series | None = None,
+) -> tuple[pd.DataFrame, pd.Series | None]:
+    """Merge the silver data of the changed launches of an incremental bronze
+    version into the previous silver data, replacing the updated launches and
+    dropping the deleted ones
+
+    Args:
+        previous_data_path (str): path of the previous silver data
+        bronze_data_path (str): path of the incremental bronze data
+        df (pd.DataFrame | None): silver data of the changed launches, None if
+            there are only deletes
+        dates (pd.Series | None, optional): UTC launch dates by launch `id` of the
+            changed launches, to partition the merged data. Defaults to None.
+
+    Returns:
+        tuple[pd.DataFrame, pd.Series | None]: merged silver data and launch dates
+    """
+    changed_ids = pd.read_parquet(changes_path(bronze_data_path), columns=["id"])[
+        "id"
+    ].tolist()
+    previous = pd.read_parquet(
+        previous_data_path,
+        filters=[("id", "not in", changed_ids)] if changed_ids else None,
+    )
+    if set(PARTITION_SCHEMA.names).issubset(previous.columns):
+        months = previous[PARTITION_SCHEMA.names].astype(int).assign(day=1)
+        previous_dates = pd.Series(
+            pd.to_datetime(months, utc=True).to_numpy(), index=previous["id"].to_numpy()
+        )
+        previous = previous.drop(columns=PARTITION_SCHEMA.names)
+        if dates is not None:
+            previous_dates = previous_dates[~previous_dates.index.duplicated()]
+            dates = pd.concat([previous_dates, dates]) if len(dates) else previous_dates
+    elif dates is not None and not previous.empty:
+        raise ValueError(
+            f"The previous silver data {previous_data_path} is not partitioned"
+        )
+    return pd.concat([previous, df], ignore_index=True), dates
 
 
 class SilverDataInterface(ABC):
     """Interface to create the silver layer data ETLs"""
 
+    # Bronze columns read by the ETL, `date_utc` is needed to partition the output
+    bronze_columns: list[str] = []
+    # Schema of the output, a change re-runs the ETL
+    schema: type[pandera.DataFrameModel]
+    # Validator of the output with the schema compiled once
+    validator: Validator
+    # Id column and entity of every surrogate key column of the output
+    id_keys: dict[str, tuple[str, str]] = {}
+
     @abstractmethod
-    def store(self, bronze_data_path: str, df: pd.DataFrame) -> str:
+    def store(
+        self, bronze_data_path: str, df: pd.DataFrame, dates: pd.Series | None = None
+    ) -> str:
         """Store the silver layer data"""
         pass
 
@@ -17,6 +190,12 @@ class SilverDataInterface(ABC):
     def run(
         self,
         bronze_data_path: str,
+        filters: list[tuple] | None = None,
+        partitioned: bool = False,
+        previous_data_path: str | None = None,
+        bronze: pa.Table | None = None,
+        id_dictionary_path: str | None = None,
+        validation: ValidationSettings | None = None,
     ) -> str:
         """Run the silver layer data ETLs"""
         pass
@@ -0,0 +1,467 @@
+"""Module to validate the silver layer data with its pandera schemas"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+import pandera
+
+VALIDATION_MODES = ("full", "sample", "skip")
+# Validated data hashes kept per schema in `skip` mode
+VALIDATED_HASHES = 100
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """Get a hash of the columns and values of the data
+
+    Args:
+        df (pd.DataFrame): data
+
+    Returns:
+        str: sha256 of the hashes of every column
+    """
+    digest = hashlib.sha256(json.dumps(list(map(str, df.columns))).encode())
+    for column in df.columns:
+        try:
+            hashes = pd.util.hash_pandas_object(df[column], index=False)
+        except TypeError:
+            # Lists and structs are not hashable
+            hashes = pd.util.hash_pandas_object(df[column].astype(str), index=False)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ValidationSettings:
+    """Settings of the validation of a silver table, given to every validation so
+    the runs of the pipeline in the same process, and the processes of a run, do not
+    depend on a configuration shared by all of them
+
+    The validation mode can be `full`, `sample` to validate only `sample` rows (an
+    int) or a fraction of them (a float), or `skip` to skip the data whose hash was
+    already validated with the same schema, persisted in `state_dir` if given. With
+    a `chunk_size` the rows are validated in chunks by `max_workers` processes.
+    """
+
+    def __init__(
+        self,
+        mode: str = "full",
+        sample: int | float | None = None,
+        state_dir: str | None = None,
+        chunk_size: int | None = None,
+        max_workers: int | None = None,
+    ):
+        if mode not in VALIDATION_MODES:
+            raise ValueError(
+                f"Unknown validation mode {mode!r}, use one of {list(VALIDATION_MODES)}"
+            )
+        if mode == "sample" and not sample:
+            raise ValueError("The sample mode needs a number or fraction of rows")
+        self.mode = mode
+        self.sample = sample
+        self.state_dir = state_dir
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+
+class ValidationErrors(pandera.errors.SchemaErrors):
+    """Error with the failure cases of all the checks, from all the chunks of the
+    data, with the `index` of the failing rows in the original data and their `row`
+    number, unique even when the index is not, as the one of the exploded cores"""
+
+    def __init__(
+        self,
+        schema: pandera.DataFrameSchema,
+        failure_cases: pd.DataFrame,
+        data: pd.DataFrame,
+    ):
+        self.schema = schema
+        self.schema_errors = []
+        self.data = data
+        self.failure_cases = failure_cases
+        self.error_counts = (
+            failure_cases.drop_duplicates(["check", "row"])
+            .groupby("check")
+            .size()
+            .to_dict()
+        )
+        self.message = {"failure_cases_by_check": self.error_counts}
+        Exception.__init__(self, self.message)
+
+
+def run_checks(
+    structure: pandera.DataFrameSchema,
+    checks: dict[str, pandera.DataFrameSchema],
+    rows: pd.DataFrame,
+    lazy: bool = False,
+) -> tuple[pd.DataFrame, dict[str, float], list[pd.DataFrame]]:
+    """Validate the coercion and structure of the rows and then every check alone,
+    timing them
+
+    Args:
+        structure (pandera.DataFrameSchema): schema without checks
+        checks (dict[str, pandera.DataFrameSchema]): schema of every check by name
+        rows (pd.DataFrame): rows to be validated
+        lazy (bool, optional): collect the failure cases of all the checks instead
+            of raising the first failure. Defaults to False.
+
+    Raises:
+        pandera.errors.SchemaError: if a check fails and it is not lazy
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, float], list[pd.DataFrame]]: coerced rows,
+            seconds of every check and failure cases of the lazy checks
+    """
+    timings = {}
+    failures = []
+    start = time.perf_counter()
+    try:
+        coerced = structure.validate(rows, lazy=lazy)
+    except pandera.errors.SchemaErrors as error:
+        failures.append(error.failure_cases)
+        coerced = error.data
+    timings["schema"] = time.perf_counter() - start
+    for name, check in checks.items():
+        start = time.perf_counter()
+        try:
+            check.validate(coerced, lazy=lazy, inplace=True)
+        except pandera.errors.SchemaErrors as error:
+            failures.append(error.failure_cases)
+        timings[name] = time.perf_counter() - start
+    return coerced, timings, failures
+
+
+@functools.cache
+def chunk_validator(
+    model: type[pandera.DataFrameModel], global_checks: tuple[str, ...]
+) -> "Validator":
+    """Get the validator of a schema compiled once per process
+
+    Args:
+        model (type[pandera.DataFrameModel]): pandera schema
+        global_checks (tuple[str, ...]): checks that need all the rows
+
+    Returns:
+        Validator: validator of the schema
+    """
+    return Validator(model, global_checks=list(global_checks))
+
+
+def validate_chunk(
+    model: type[pandera.DataFrameModel],
+    global_checks: tuple[str, ...],
+    chunk: pd.DataFrame,
+) -> tuple[pd.DataFrame, dict[str, float], list[pd.DataFrame]]:
+    """Validate lazily the checks of a chunk of rows that do not need the others
+
+    Args:
+        model (type[pandera.DataFrameModel]): pandera schema
+        global_checks (tuple[str, ...]): checks that need all the rows
+        chunk (pd.DataFrame): rows to be validated
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, float], list[pd.DataFrame]]: coerced rows,
+            seconds of every check and failure cases
+    """
+    validator = chunk_validator(model, global_checks)
+    return run_checks(
+        validator.chunk_structure, validator.chunk_checks, chunk, lazy=True
+    )
+
+
+class Validator:
+    """Class to validate the output of a silver ETL with a pandera schema compiled
+    once, timing the coercion and every check
+
+    The data is validated with the settings given to every validation, or with the
+    default settings of the validator, see `ValidationSettings`.
+
+    With a `chunk_size` the rows are split in chunks validated in a pool of
+    processes, and the global checks, as the uniqueness of a key, are validated
+    afterwards on all the rows. The failure cases of all of them are reported in a
+    single `ValidationErrors`.
+    """
+
+    def __init__(
+        self,
+        model: type[pandera.DataFrameModel],
+        mode: str = "full",
+        sample: int | float | None = None,
+        state_dir: str | None = None,
+        global_checks: list[str] | None = None,
+        chunk_size: int | None = None,
+        max_workers: int | None = None,
+    ):
+        self.model = model
+        self.name = model.__name__
+        self.version = hashlib.sha256(inspect.getsource(model).encode()).hexdigest()
+        schema = model.to_schema()
+        # The coercion and structure are validated first, then every check alone
+        self.structure = schema.update_columns(
+            {name: {"checks": []} for name in schema.columns}
+        )
+        self.structure.checks = []
+        self.checks: dict[str, pandera.DataFrameSchema] = {
+            check.name: pandera.DataFrameSchema(checks=[check])
+            for check in schema.checks
+        }
+        for name, column in schema.columns.items():
+            for check in column.checks:
+                self.checks[f"{name}.{check.name}"] = pandera.DataFrameSchema(
+                    {name: pandera.Column(checks=[check], nullable=True)}
+                )
+        # The chunks are validated without the checks that need all the rows
+        self.global_checks = global_checks or []
+        unique_columns = [
+            name for name, column in schema.columns.items() if column.unique
+        ]
+        self.chunk_structure = self.structure.update_columns(
+            {name: {"unique": False} for name in unique_columns}
+        )
+        self.chunk_checks = {
+            name: check
+            for name, check in self.checks.items()
+            if name not in self.global_checks
+        }
+        self.reduce_checks = {
+            name: self.checks[name] for name in self.global_checks
+        } | {
+            f"{name}.unique": pandera.DataFrameSchema(
+                {name: pandera.Column(unique=True, nullable=True)}
+            )
+            for name in unique_columns
+        }
+        self.timings: dict[str, float] = {}
+        # Hashes validated in `skip` mode without a state directory
+        self.validated: list[str] = []
+        self.configure(mode, sample, state_dir, chunk_size, max_workers)
+
+    def configure(
+        self,
+        mode: str = "full",
+        sample: int | float | None = None,
+        state_dir: str | None = None,
+        chunk_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """Configure the default settings of the validator, used when a validation
+        is not given its own
+
+        Args:
+            mode (str, optional): `full`, `sample` or `skip`. Defaults to "full".
+            sample (int | float | None, optional): rows or fraction of them validated
+                in `sample` mode. Defaults to None.
+            state_dir (str | None, optional): directory where the validated hashes
+                are persisted in `skip` mode, kept in memory if not given. Defaults
+                to None.
+            chunk_size (int | None, optional): rows of the chunks validated in
+                parallel, all the rows are validated at once if not given. Defaults
+                to None.
+            max_workers (int | None, optional): processes validating the chunks.
+                Defaults to None.
+
+        Raises:
+            ValueError: if the mode is unknown or `sample` mode has no sample
+        """
+        self.settings = ValidationSettings(
+            mode, sample, state_dir, chunk_size, max_workers
+        )
+
+    @staticmethod
+    def sample_rows(df: pd.DataFrame, sample: int | float) -> pd.DataFrame:
+        """Get the rows to validate
+
+        Args:
+            df (pd.DataFrame): data
+            sample (int | float): number or fraction of the rows
+
+        Returns:
+            pd.DataFrame: reproducible sample of the rows
+        """
+        rows = round(len(df) * sample) if isinstance(sample, float) else sample
+        if rows >= len(df):
+            return df
+        return df.sample(n=max(rows, 1), random_state=0)
+
+    def state_path(self, settings: ValidationSettings) -> str | None:
+        """Get the file of the hashes validated in `skip` mode
+
+        Args:
+            settings (ValidationSettings): settings of the validation
+
+        Returns:
+            str | None: `<state_dir>/<schema>.json`, None without a state directory
+        """
+        if settings.state_dir is None:
+            return None
+        return f"{settings.state_dir}/{self.name}.json"
+
+    def validated_hashes(self, settings: ValidationSettings) -> list[str]:
+        """Get the hashes of the data that passed the validation
+
+        Args:
+            settings (ValidationSettings): settings of the validation
+
+        Returns:
+            list[str]: hashes of the data and schema, the last ones validated
+        """
+        state_path = self.state_path(settings)
+        if state_path is None:
+            return self.validated
+        if not os.path.exists(state_path):
+            return []
+        with open(state_path) as file:
+            return json.load(file)
+
+    def record(self, key: str, settings: ValidationSettings) -> None:
+        """Record the hash of data that passed the validation
+
+        Args:
+            key (str): hash of the data and schema
+            settings (ValidationSettings): settings of the validation
+        """
+        validated = [*self.validated_hashes(settings), key][-VALIDATED_HASHES:]
+        state_path = self.state_path(settings)
+        if state_path is None:
+            self.validated = validated
+            return
+        os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        with open(f"{state_path}.part", "w") as file:
+            json.dump(validated, file)
+        os.replace(f"{state_path}.part", state_path)
+
+    def validate(
+        self, df: pd.DataFrame, settings: ValidationSettings | None = None
+    ) -> pd.DataFrame:
+        """Validate the data
+
+        Args:
+            df (pd.DataFrame): data to be validated
+            settings (ValidationSettings | None, optional): settings of the
+                validation. Defaults to None, the settings of the validator.
+
+        Raises:
+            pandera.errors.SchemaError: if the data does not pass the schema
+            ValidationErrors: if the data is validated in chunks and does not pass
+                the schema
+
+        Returns:
+            pd.DataFrame: the data coerced to the types of the schema
+        """
+        settings = settings or self.settings
+        key = None
+        if settings.mode == "skip":
+            key = hashlib.sha256(f"{self.version}{data_hash(df)}".encode()).hexdigest()
+            if key in self.validated_hashes(settings):
+                logging.info(f"{self.name} skipped, the data was already validated")
+                self.timings = {}
+                return self.structure.coerce_dtype(df)
+        timings = {}
+        coerced = None
+        rows = df
+        if settings.mode == "sample":
+            # Every row is coerced, only the sample is checked
+            start = time.perf_counter()
+            coerced = self.structure.coerce_dtype(df)
+            timings["coercion"] = time.perf_counter() - start
+            rows = self.sample_rows(coerced, settings.sample)
+        if settings.chunk_size and len(rows) > settings.chunk_size:
+            checked, check_timings = self.validate_chunks(
+                rows, settings.chunk_size, settings.max_workers
+            )
+        else:
+            checked, check_timings, _ = run_checks(self.structure, self.checks, rows)
+        timings.update(check_timings)
+        coerced = checked if coerced is None else coerced
+        self.timings = timings
+        logging.info(
+            f"{self.name} validated {len(rows)} of {len(df)} rows: "
+            + ", ".join(
+                f"{name} {elapsed * 1000:.1f} ms" for name, elapsed in timings.items()
+            )
+        )
+        if key is not None:
+            self.record(key, settings)
+        return coerced
+
+    def validate_chunks(
+        self, df: pd.DataFrame, chunk_size: int, max_workers: int | None = None
+    ) -> tuple[pd.DataFrame, dict[str, float]]:
+        """Validate the chunks of the data in a pool of processes and then the global
+        checks on all the rows
+
+        Args:
+            df (pd.DataFrame): data to be validated
+            chunk_size (int): rows of every chunk
+            max_workers (int | None, optional): processes validating the chunks.
+                Defaults to None.
+
+        Raises:
+            ValidationErrors: with the failure cases of all the chunks and checks
+
+        Returns:
+            tuple[pd.DataFrame, dict[str, float]]: coerced data and seconds of every
+                check, added up over the chunks
+        """
+        # The chunks are indexed by the row numbers, so every failure case points to
+        # a single row whatever the index of the data
+        rows = df.reset_index(drop=True)
+        chunks = [
+            rows.iloc[start : start + chunk_size]
+            for start in range(0, len(rows), chunk_size)
+        ]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    validate_chunk,
+                    repeat(self.model),
+                    repeat(tuple(self.global_checks)),
+                    chunks,
+                )
+            )
+        timings: dict[str, float] = {}
+        failures = []
+        for _, chunk_timings, chunk_failures in results:
+            for name, elapsed in chunk_timings.items():
+                timings[name] = timings.get(name, 0.0) + elapsed
+            failures += chunk_failures
+        coerced = pd.concat([chunk for chunk, _, _ in results])
+        _, reduce_timings, reduce_failures = run_checks(
+            pandera.DataFrameSchema(), self.reduce_checks, coerced, lazy=True
+        )
+        reduce_timings.pop("schema")
+        timings.update(reduce_timings)
+        failures += reduce_failures
+        coerced.index = df.index
+        if failures:
+            failure_cases = pd.concat(failures, ignore_index=True)
+            failure_cases["row"] = failure_cases["index"]
+            failure_cases["index"] = [
+                df.index[row] if pd.notna(row) else row for row in failure_cases["row"]
+            ]
+            raise ValidationErrors(self.structure, failure_cases, coerced)
+        return coerced, timings
+
+    def check_output(self, function: Callable) -> Callable:
+        """Decorator to validate the output of a function, as `pandera.check_output`,
+        with the settings given as the `validation` keyword of the function
+
+        Args:
+            function (Callable): function returning the data
+
+        Returns:
+            Callable: function validating the data before returning it
+        """
+
+        @functools.wraps(function)
+        def wrapper(*args, validation: ValidationSettings | None = None, **kwargs):
+            return self.validate(function(*args, **kwargs), validation)
+
+        return wrapper
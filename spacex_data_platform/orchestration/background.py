@@ -0,0 +1,115 @@
+"""Module to run the pipeline in a background thread, one run at a time, reporting
+the progress of its tasks"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+
+class PipelineJob:
+    """Run of the pipeline in a background thread, with the status of every task
+    as reported by the task graph and the outputs or the error once finished"""
+
+    def __init__(self, run: Callable[[Callable[[str, str], None]], dict[str, str]]):
+        self._run = run
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+        self.statuses: dict[str, str] = {}
+        self.outputs: dict[str, str] | None = None
+        self.error: BaseException | None = None
+        self._thread = threading.Thread(target=self._target, daemon=True)
+
+    def start(self) -> "PipelineJob":
+        """Start the run in its thread
+
+        Returns:
+            PipelineJob: the job itself
+        """
+        self._thread.start()
+        return self
+
+    def update(self, task: str, status: str) -> None:
+        """Record the status of a task, called by the task graph from its thread
+
+        Args:
+            task (str): name of the task
+            status (str): status of the task, one of `TASK_STATUSES`
+        """
+        with self._lock:
+            self.statuses[task] = status
+
+    def progress(self) -> dict[str, str]:
+        """Get the status of every task, safe to call while the job runs
+
+        Returns:
+            dict[str, str]: status of every task by name, in the order of the graph
+        """
+        with self._lock:
+            return dict(self.statuses)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the run finished, successfully or not"""
+        return self.finished_at is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the run to finish
+
+        Args:
+            timeout (float | None, optional): seconds to wait. Defaults to None,
+                until it finishes.
+
+        Returns:
+            bool: whether the run finished
+        """
+        self._thread.join(timeout)
+        return self.finished
+
+    def _target(self) -> None:
+        try:
+            self.outputs = self._run(self.update)
+        except Exception as error:
+            logging.error(f"Pipeline run failed: {error!r}")
+            self.error = error
+        finally:
+            self.finished_at = time.time()
+
+
+class PipelineRunner:
+    """Runner of the pipeline in the background that allows a single run at a time
+
+    Starting a run while another one is still running returns the running job, so
+    every caller follows the same run and the outputs are never written twice at
+    once.
+    """
+
+    def __init__(self, run: Callable[[Callable[[str, str], None]], dict[str, str]]):
+        self._run = run
+        self._lock = threading.Lock()
+        self._job: PipelineJob | None = None
+
+    def start(self) -> tuple[PipelineJob, bool]:
+        """Start a run unless one is running
+
+        Returns:
+            tuple[PipelineJob, bool]: the running job and whether it was started by
+                this call
+        """
+        with self._lock:
+            if self._job is not None and not self._job.finished:
+                return self._job, False
+            self._job = PipelineJob(self._run).start()
+            return self._job, True
+
+    @property
+    def job(self) -> PipelineJob | None:
+        """The last job, running or finished, None if nothing ran yet"""
+        return self._job
+
+    @property
+    def running(self) -> bool:
+        """Whether a run is in progress"""
+        job = self._job
+        return job is not None and not job.finished
@@ -0,0 +1,366 @@
+"""Module with the catalog of the snapshots of the data-platform, the manifest of
+their tables read to discover the versions without listing the data directories"""
+
+import datetime
+import hashlib
+import json
+import os
+
+import pyarrow.parquet as pq
+
+from spacex_data_platform.ingestion.gold.gold_data import GOLD_TABLES
+
+# Statuses of the snapshots, only the complete ones are offered to the users
+SNAPSHOT_STATUSES = ("complete", "partial")
+
+
+def parquet_files(path: str) -> list[str]:
+    """Get the parquet files of a table, a single file or a partitioned dataset
+
+    Args:
+        path (str): path of the table
+
+    Returns:
+        list[str]: parquet files of the table in a stable order
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(path)
+        for name in names
+        if name.endswith(".parquet")
+    )
+
+
+def files_signature(path: str) -> str:
+    """Get the signature of the files of a table, the same for the hard links of the
+    table in another snapshot
+
+    Args:
+        path (str): path of the table
+
+    Returns:
+        str: sha256 of the device, inode, size and modification time of its files
+    """
+    digest = hashlib.sha256()
+    for file_path in parquet_files(path):
+        stat = os.stat(file_path)
+        digest.update(
+            f"{os.path.relpath(file_path, path)}:{stat.st_dev}:{stat.st_ino}:"
+            f"{stat.st_size}:{stat.st_mtime_ns};".encode()
+        )
+    return digest.hexdigest()
+
+
+def statistic(value: object) -> object:
+    """Get a JSON serializable statistic of a column
+
+    Args:
+        value (object): minimum or maximum of the column in the parquet metadata
+
+    Returns:
+        object: the value, in ISO format for the dates and as text for the bytes
+    """
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return value
+
+
+def table_metadata(path: str) -> dict:
+    """Get the metadata of a parquet table from the footers of its files, without
+    reading its rows, and the sha256 of its content
+
+    Args:
+        path (str): path of the table, a single file or a partitioned dataset
+
+    Returns:
+        dict: `path`, `rows`, `bytes`, `hash`, `signature` of the files and the
+            `min` and `max` of every column with statistics in all the row groups
+    """
+    rows = size = 0
+    digest = hashlib.sha256()
+    columns: dict[str, dict] = {}
+    missing: set[str] = set()
+    for file_path in parquet_files(path):
+        metadata = pq.ParquetFile(file_path).metadata
+        rows += metadata.num_rows
+        size += os.path.getsize(file_path)
+        digest.update(os.path.relpath(file_path, path).encode())
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        for row_group in range(metadata.num_row_groups):
+            group = metadata.row_group(row_group)
+            for index in range(group.num_columns):
+                column = group.column(index)
+                name = column.path_in_schema
+                stats = column.statistics
+                if stats is None or not stats.has_min_max:
+                    if stats is None or stats.null_count != column.num_values:
+                        missing.add(name)
+                    continue
+                bounds = columns.setdefault(name, {"min": stats.min, "max": stats.max})
+                bounds["min"] = min(bounds["min"], stats.min)
+                bounds["max"] = max(bounds["max"], stats.max)
+    return {
+        "path": path,
+        "rows": rows,
+        "bytes": size,
+        "hash": digest.hexdigest(),
+        "signature": files_signature(path),
+        "columns": {
+            name: {key: statistic(value) for key, value in bounds.items()}
+            for name, bounds in columns.items()
+            if name not in missing
+        },
+    }
+
+
+def output_tables(output: str) -> dict[str, str]:
+    """Get the parquet tables of the output of a task, by `<layer>.<table>`
+
+    Args:
+        output (str): path of the output, as `data/silver/<snapshot>/fairings.parquet`
+            or the directory of the gold tables of a snapshot
+
+    Returns:
+        dict[str, str]: path of every table of the output, empty if it has none
+    """
+    layer = os.path.basename(os.path.dirname(os.path.dirname(output)))
+    if output.endswith(".parquet"):
+        return {f"{layer}.{os.path.basename(output).removesuffix('.parquet')}": output}
+    if not os.path.isdir(output):
+        return {}
+    names = sorted(os.listdir(output))
+    if any(os.path.isdir(os.path.join(output, name)) for name in names):
+        # A hive partitioned dataset, as `data/silver/<snapshot>/fairings`
+        return {f"{layer}.{os.path.basename(output)}": output}
+    return {
+        f"{layer}.{name.removesuffix('.parquet')}": os.path.join(output, name)
+        for name in names
+        if name.endswith(".parquet")
+    }
+
+
+def gold_snapshots(data_dir: str = "data") -> list[str]:
+    """Get the snapshots with a directory of gold tables in the data directory
+
+    Args:
+        data_dir (str, optional): directory of the data. Defaults to "data".
+
+    Returns:
+        list[str]: ids of the snapshots, the newest first
+    """
+    gold_dir = os.path.join(data_dir, "gold")
+    if not os.path.isdir(gold_dir):
+        return []
+    return sorted(
+        (
+            snapshot
+            for snapshot in os.listdir(gold_dir)
+            if os.path.isdir(os.path.join(gold_dir, snapshot, "spacex_data"))
+        ),
+        reverse=True,
+    )
+
+
+def snapshot_outputs(data_dir: str, snapshot: str) -> dict[str, str]:
+    """Get the outputs of a snapshot from its directories, the bronze launches and
+    the silver and gold tables
+
+    Args:
+        data_dir (str): directory of the data
+        snapshot (str): id of the snapshot
+
+    Returns:
+        dict[str, str]: path of every output by `<layer>.<table>`, `gold` for the
+            directory of the gold tables
+    """
+    outputs = {}
+    for layer in ["bronze", "silver"]:
+        snapshot_dir = os.path.join(data_dir, layer, snapshot)
+        if not os.path.isdir(snapshot_dir):
+            continue
+        for name in sorted(os.listdir(snapshot_dir)):
+            table = name.removesuffix(".parquet")
+            path = os.path.join(snapshot_dir, name)
+            # Only the launches of bronze, not its row hashes and change log
+            if layer == "bronze" and table != "spacex_data":
+                continue
+            if name.endswith(".parquet") or (
+                os.path.isdir(path) and not name.endswith(".part")
+            ):
+                outputs[f"{layer}.{table}"] = path
+    outputs["gold"] = os.path.join(data_dir, "gold", snapshot, "spacex_data")
+    return outputs
+
+
+class SnapshotCatalog:
+    """Class to persist the manifest of every snapshot: its status, `complete` when
+    all the tasks have an output and `partial` otherwise, and the path, rows, size,
+    content hash and column statistics of its tables
+
+    A snapshot is only recorded once the pipeline finished with it, so the
+    directories being written are never in the catalog.
+    """
+
+    def __init__(self, catalog_path: str = "data/catalog.json"):
+        self.catalog_path = catalog_path
+        self.snapshots: dict[str, dict] = {}
+        self.latest_complete: str | None = None
+        if os.path.exists(catalog_path):
+            with open(catalog_path) as file:
+                catalog = json.load(file)
+            self.snapshots = catalog["snapshots"]
+            self.latest_complete = catalog["latest_complete"]
+
+    def record(self, outputs: dict[str, str], complete: bool) -> str | None:
+        """Record and persist the snapshot of the outputs of a pipeline run
+
+        Args:
+            outputs (dict[str, str]): path of the output of every task by name, all
+                of them in the same snapshot
+            complete (bool): whether all the tasks have an output
+
+        Raises:
+            ValueError: if the outputs belong to several snapshots
+
+        Returns:
+            str | None: id of the snapshot, None if there are no outputs
+        """
+        if not outputs:
+            return None
+        snapshots = {
+            os.path.basename(os.path.dirname(output)) for output in outputs.values()
+        }
+        if len(snapshots) != 1:
+            raise ValueError(f"The outputs belong to several snapshots {snapshots}")
+        (snapshot,) = snapshots
+        tables = {
+            name: path
+            for output in outputs.values()
+            for name, path in output_tables(output).items()
+        }
+        self.snapshots[snapshot] = {
+            "status": "complete" if complete else "partial",
+            "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "tasks": dict(sorted(outputs.items())),
+            "tables": {
+                name: self.reused_metadata(path) or table_metadata(path)
+                for name, path in sorted(tables.items())
+            },
+        }
+        if complete and snapshot >= (self.latest_complete or ""):
+            self.latest_complete = snapshot
+        self.write()
+        return snapshot
+
+    def reused_metadata(self, path: str) -> dict | None:
+        """Get the metadata of a table already recorded in another snapshot with the
+        same files, as the outputs linked from the previous snapshot, so they are not
+        read and hashed again
+
+        Args:
+            path (str): path of the table
+
+        Returns:
+            dict | None: metadata of the table with its path, None if it is new
+        """
+        signature = files_signature(path)
+        for entry in self.snapshots.values():
+            for metadata in entry["tables"].values():
+                if metadata["signature"] == signature:
+                    return metadata | {"path": path}
+        return None
+
+    def backfill(self, data_dir: str | None = None) -> list[str]:
+        """Record the snapshots with gold tables that are not in the catalog, the
+        ones written before the catalog existed or all of them if it was lost
+
+        A snapshot is complete only if it has all the gold tables, the directory of
+        a reused gold output was linked file by file in place and an interrupted run
+        could leave it partial.
+
+        Args:
+            data_dir (str | None, optional): directory of the data. Defaults to None,
+                the directory of the catalog.
+
+        Returns:
+            list[str]: ids of the recorded snapshots
+        """
+        if data_dir is None:
+            data_dir = os.path.dirname(self.catalog_path) or "."
+        recorded = []
+        for snapshot in reversed(gold_snapshots(data_dir)):
+            if snapshot in self.snapshots:
+                continue
+            outputs = snapshot_outputs(data_dir, snapshot)
+            complete = all(
+                os.path.exists(os.path.join(outputs["gold"], f"{table}.parquet"))
+                for table in GOLD_TABLES
+            )
+            recorded.append(self.record(outputs, complete))
+        return recorded
+
+    def write(self) -> None:
+        """Persist the catalog, replacing the previous one atomically"""
+        os.makedirs(os.path.dirname(self.catalog_path) or ".", exist_ok=True)
+        with open(f"{self.catalog_path}.part", "w") as file:
+            json.dump(
+                {"latest_complete": self.latest_complete, "snapshots": self.snapshots},
+                file,
+                indent=2,
+            )
+        os.replace(f"{self.catalog_path}.part", self.catalog_path)
+
+    def snapshot_ids(self, complete_only: bool = True) -> list[str]:
+        """Get the ids of the snapshots, the newest first
+
+        Args:
+            complete_only (bool, optional): only the complete snapshots. Defaults to
+                True.
+
+        Returns:
+            list[str]: ids of the snapshots
+        """
+        return sorted(
+            (
+                snapshot
+                for snapshot, entry in self.snapshots.items()
+                if not complete_only or entry["status"] == "complete"
+            ),
+            reverse=True,
+        )
+
+    def table(self, snapshot: str, table: str) -> dict | None:
+        """Get the metadata of a table of a snapshot
+
+        Args:
+            snapshot (str): id of the snapshot
+            table (str): name of the table, as `silver.fairings`
+
+        Returns:
+            dict | None: metadata of the table, None if it is not in the snapshot
+        """
+        return self.snapshots.get(snapshot, {}).get("tables", {}).get(table)
+
+    def snapshot_hash(self, snapshot: str) -> str | None:
+        """Get the hash of the content of a snapshot, the same for the snapshots with
+        the same tables whatever their ids
+
+        Args:
+            snapshot (str): id of the snapshot
+
+        Returns:
+            str | None: sha256 of the name and content hash of every table, None if
+                the snapshot is not in the catalog
+        """
+        if snapshot not in self.snapshots:
+            return None
+        digest = hashlib.sha256()
+        for name, metadata in sorted(self.snapshots[snapshot]["tables"].items()):
+            digest.update(f"{name}:{metadata['hash']};".encode())
+        return digest.hexdigest()
@@ -0,0 +1,367 @@
+"""Module to run the data-platform as a graph of tasks, skipping the ones that are
+up to date"""
+
+import hashlib
+import inspect
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from spacex_data_platform.orchestration.task_state import TaskState, link_output
+
+EXECUTOR_MODES = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+# Statuses reported to the progress callback of the graph, every task starts pending
+# and ends in one of the last five
+TASK_STATUSES = (
+    "pending",
+    "running",
+    "reused",
+    "done",
+    "no output",
+    "skipped",
+    "failed",
+)
+
+
+def code_version(*objects: object) -> str:
+    """Get the version of the source code of modules, classes or functions
+
+    Args:
+        *objects (object): modules, classes or functions
+
+    Returns:
+        str: sha256 of their source code
+    """
+    digest = hashlib.sha256()
+    for code in objects:
+        digest.update(inspect.getsource(code).encode())
+    return digest.hexdigest()
+
+
+def fingerprint(**values: object) -> str:
+    """Get the fingerprint of JSON serializable values
+
+    Args:
+        **values (object): values by name
+
+    Returns:
+        str: sha256 of their canonical JSON
+    """
+    return hashlib.sha256(
+        json.dumps(values, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+class PipelineError(Exception):
+    """Error raised when any of the tasks failed, once all the others finished"""
+
+    def __init__(
+        self,
+        failures: dict[str, BaseException],
+        outputs: dict[str, str] | None = None,
+    ):
+        self.failures = failures
+        # Outputs of the tasks that did not fail nor depend on a failed one
+        self.outputs = outputs or {}
+        super().__init__(
+            "Tasks failed: "
+            + ", ".join(f"{name} ({error!r})" for name, error in failures.items())
+        )
+
+
+class Task(ABC):
+    """Node of the graph that generates an output from the outputs of the tasks it
+    depends on
+
+    A task without inputs is a source: it always runs and the fingerprint of its
+    output is known once it finished. Any other task is fingerprinted before running
+    from its version and the fingerprints of its inputs.
+    """
+
+    def __init__(self, name: str, inputs: list[str] | None = None):
+        self.name = name
+        self.inputs = inputs or []
+
+    def version(self) -> str:
+        """Get the version of the code and schema of the task, a new version re-runs
+        the task and the ones depending on it
+
+        Returns:
+            str: version of the task
+        """
+        return code_version(inspect.getmodule(type(self)))
+
+    def fingerprint(
+        self,
+        version: str,
+        inputs: dict[str, str | None],
+        previous: str | None = None,
+    ) -> str | None:
+        """Get the fingerprint of the output of the task before running it
+
+        Args:
+            version (str): version of the task
+            inputs (dict[str, str | None]): fingerprints of the inputs by task name
+            previous (str | None, optional): fingerprint of the previous output the
+                task builds on. Defaults to None.
+
+        Returns:
+            str | None: fingerprint of the output, None for a source or if the
+                fingerprint of any input is unknown
+        """
+        if not self.inputs or None in inputs.values():
+            return None
+        return fingerprint(
+            task=self.name, version=version, inputs=inputs, previous=previous
+        )
+
+    def output_fingerprint(self, output: str) -> str | None:
+        """Get the fingerprint of the output of a source once it finished
+
+        Args:
+            output (str): path of the output
+
+        Returns:
+            str | None: fingerprint of the output, None if unknown
+        """
+        return None
+
+    def link(self, output: str, input_path: str) -> str:
+        """Link the output of an up to date task in the snapshot of its input
+
+        Args:
+            output (str): path of the output already generated
+            input_path (str): path of the first input of the task
+
+        Returns:
+            str: path of the output in the snapshot of the input
+        """
+        return link_output(output, input_path)
+
+    @abstractmethod
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str | None:
+        """Run the task
+
+        Args:
+            inputs (dict[str, str]): paths of the outputs of the inputs by task name
+            previous_output (str | None): previous output to build on when running
+                incrementally
+
+        Returns:
+            str | None: path of the output, None if there is nothing new and the
+                tasks depending on it have to be skipped
+        """
+        pass
+
+
+class TaskGraph:
+    """Class to run a graph of tasks in a pool of threads or processes
+
+    The tasks whose fingerprint already has an output are skipped and their output
+    is linked, the rest run as soon as their inputs are available so independent
+    tasks run concurrently. A failing task does not stop the others, only the tasks
+    depending on it, and all the failures are reported together at the end.
+
+    The status of every task is reported to the `progress` callback as it changes,
+    with the name of the task and one of `TASK_STATUSES`.
+    """
+
+    def __init__(
+        self,
+        tasks: list[Task],
+        state: TaskState | None = None,
+        max_workers: int | None = None,
+        mode: str = "thread",
+        incremental: bool = False,
+        progress: Callable[[str, str], None] | None = None,
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"Unknown executor mode {mode!r}, use one of {list(EXECUTOR_MODES)}"
+            )
+        self.tasks = self.sort(tasks)
+        self.state = state or TaskState()
+        self.max_workers = max_workers
+        self.mode = mode
+        self.incremental = incremental
+        self.progress = progress or (lambda task, status: None)
+
+    @staticmethod
+    def sort(tasks: list[Task]) -> list[Task]:
+        """Sort the tasks so every task comes after its inputs
+
+        Args:
+            tasks (list[Task]): tasks of the graph
+
+        Raises:
+            ValueError: if a name is repeated, an input is unknown or there is a cycle
+
+        Returns:
+            list[Task]: tasks in topological order
+        """
+        names = [task.name for task in tasks]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Repeated task names in {names}")
+        unknown = {name for task in tasks for name in task.inputs} - set(names)
+        if unknown:
+            raise ValueError(f"Unknown task inputs {sorted(unknown)}")
+        sorted_tasks: list[Task] = []
+        pending = list(tasks)
+        while pending:
+            sorted_names = {task.name for task in sorted_tasks}
+            ready = [
+                task
+                for task in pending
+                if all(name in sorted_names for name in task.inputs)
+            ]
+            if not ready:
+                raise ValueError(
+                    f"Cycle between the tasks {[task.name for task in pending]}"
+                )
+            sorted_tasks += ready
+            pending = [task for task in pending if task not in ready]
+        return sorted_tasks
+
+    def previous_run(self, versions: dict[str, str]) -> dict[str, tuple[str, str]]:
+        """Get the outputs of the last run to build on when running incrementally
+
+        The last run is only used if every task has an output generated with its
+        current version from the last outputs of its inputs.
+
+        Args:
+            versions (dict[str, str]): version of every task by name
+
+        Returns:
+            dict[str, tuple[str, str]]: fingerprint and path of the last output of
+                every task, empty if everything has to be recomputed
+        """
+        if not self.incremental:
+            return {}
+        latest = {task.name: self.state.latest(task.name) for task in self.tasks}
+        for task in self.tasks:
+            task_latest = latest[task.name]
+            if task_latest is None or task_latest[1]["version"] != versions[task.name]:
+                return {}
+            if task_latest[1]["inputs"] != {
+                name: latest[name][0] for name in task.inputs
+            }:
+                return {}
+        return {
+            name: (task_fingerprint, entry["output"])
+            for name, (task_fingerprint, entry) in latest.items()
+        }
+
+    def run(self) -> dict[str, str]:
+        """Run the tasks that are not up to date and wait for all of them
+
+        Raises:
+            PipelineError: if any task failed
+
+        Returns:
+            dict[str, str]: path of the output of every task by name, without the
+                tasks that were skipped
+        """
+        versions = {task.name: task.version() for task in self.tasks}
+        previous = self.previous_run(versions)
+        outputs: dict[str, str] = {}
+        fingerprints: dict[str, str | None] = {}
+        failures: dict[str, BaseException] = {}
+        stopped: set[str] = set()
+        pending = list(self.tasks)
+        running: dict[Future, tuple[Task, str | None, float]] = {}
+        for task in self.tasks:
+            self.progress(task.name, "pending")
+        executor: Executor = EXECUTOR_MODES[self.mode](max_workers=self.max_workers)
+        with executor:
+            while pending or running:
+                ready = [
+                    task
+                    for task in pending
+                    if all(name in outputs or name in stopped for name in task.inputs)
+                ]
+                for task in ready:
+                    pending.remove(task)
+                    if any(name in stopped for name in task.inputs):
+                        logging.info(f"{task.name} skipped, an input has no output")
+                        stopped.add(task.name)
+                        self.progress(task.name, "skipped")
+                        continue
+                    inputs = {name: outputs[name] for name in task.inputs}
+                    previous_fingerprint, previous_output = previous.get(
+                        task.name, (None, None)
+                    )
+                    task_fingerprint = task.fingerprint(
+                        versions[task.name],
+                        {name: fingerprints[name] for name in task.inputs},
+                        previous_fingerprint,
+                    )
+                    output = self.state.get(task_fingerprint)
+                    if output is None:
+                        self.progress(task.name, "running")
+                        future = executor.submit(task.run, inputs, previous_output)
+                        running[future] = (
+                            task,
+                            task_fingerprint,
+                            time.perf_counter(),
+                        )
+                        continue
+                    outputs[task.name] = task.link(output, inputs[task.inputs[0]])
+                    fingerprints[task.name] = task_fingerprint
+                    self.state.record(
+                        task_fingerprint,
+                        task.name,
+                        versions[task.name],
+                        output,
+                        {name: fingerprints[name] for name in task.inputs},
+                    )
+                    logging.info(
+                        f"{task.name} up to date, reused in {outputs[task.name]}"
+                    )
+                    self.progress(task.name, "reused")
+                if ready or not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, task_fingerprint, start = running.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as error:
+                        logging.error(f"{task.name} failed: {error!r}")
+                        failures[task.name] = error
+                        stopped.add(task.name)
+                        self.progress(task.name, "failed")
+                        continue
+                    if output is None:
+                        logging.info(f"{task.name} has no new output")
+                        stopped.add(task.name)
+                        self.progress(task.name, "no output")
+                        continue
+                    outputs[task.name] = output
+                    fingerprints[task.name] = task_fingerprint or (
+                        task.output_fingerprint(output)
+                    )
+                    self.state.record(
+                        fingerprints[task.name],
+                        task.name,
+                        versions[task.name],
+                        output,
+                        {name: fingerprints[name] for name in task.inputs},
+                    )
+                    logging.info(
+                        f"{task.name} stored in {output} "
+                        f"({time.perf_counter() - start:.2f} s)"
+                    )
+                    self.progress(task.name, "done")
+        if failures:
+            raise PipelineError(failures, outputs)
+        return outputs
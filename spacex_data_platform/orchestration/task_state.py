@@ -0,0 +1,113 @@
+"""Module to keep track of the output generated for every task fingerprint"""
+
+import json
+import os
+import shutil
+
+from spacex_data_platform.ingestion.raw.raw_file import link_or_copy
+
+
+def link_output(output: str, input_path: str) -> str:
+    """Link the output of a previous snapshot in the snapshot of the input data
+
+    The output is linked in a `.part` path moved into place once all its files are
+    linked, so an interrupted link is never taken as a finished one.
+
+    Args:
+        output (str): path of the output of the previous snapshot, a file or the
+            directory of a partitioned dataset
+        input_path (str): path of the input data of the new snapshot
+
+    Returns:
+        str: path of the output in the new snapshot
+    """
+    snapshot = os.path.basename(os.path.dirname(input_path))
+    layer_path = os.path.dirname(os.path.dirname(output))
+    linked_path = os.path.join(layer_path, snapshot, os.path.basename(output))
+    if os.path.exists(linked_path):
+        return linked_path
+    part_path = f"{linked_path}.part"
+    if os.path.isdir(part_path):
+        shutil.rmtree(part_path)
+    elif os.path.exists(part_path):
+        os.remove(part_path)
+    os.makedirs(os.path.dirname(linked_path), exist_ok=True)
+    link_or_copy(output, part_path)
+    os.replace(part_path, linked_path)
+    return linked_path
+
+
+class TaskState:
+    """Class to persist, by fingerprint, the output already generated by every task
+    along with its version and the fingerprints of its inputs, so the tasks that are
+    up to date reuse it"""
+
+    def __init__(self, state_path: str = "data/pipeline_state.json"):
+        self.state_path = state_path
+        self.entries: dict[str, dict] = {}
+        if os.path.exists(state_path):
+            with open(state_path) as file:
+                self.entries = json.load(file)
+
+    def get(self, fingerprint: str | None) -> str | None:
+        """Get the output generated for a fingerprint
+
+        Args:
+            fingerprint (str | None): fingerprint of the task
+
+        Returns:
+            str | None: path of the output, None if it is missing
+        """
+        entry = self.entries.get(fingerprint) if fingerprint else None
+        if entry is None or not os.path.exists(entry["output"]):
+            return None
+        return entry["output"]
+
+    def latest(self, task: str) -> tuple[str, dict] | None:
+        """Get the last output recorded for a task
+
+        Args:
+            task (str): name of the task
+
+        Returns:
+            tuple[str, dict] | None: fingerprint and entry with the `version`,
+                `output` and `inputs` fingerprints, None if the output is missing
+        """
+        for fingerprint in reversed(self.entries):
+            if self.entries[fingerprint]["task"] == task:
+                if self.get(fingerprint) is None:
+                    return None
+                return fingerprint, self.entries[fingerprint]
+        return None
+
+    def record(
+        self,
+        fingerprint: str | None,
+        task: str,
+        version: str,
+        output: str,
+        inputs: dict[str, str],
+    ) -> None:
+        """Record and persist the output generated for a fingerprint
+
+        Args:
+            fingerprint (str | None): fingerprint of the task
+            task (str): name of the task
+            version (str): version of the code and schema of the task
+            output (str): path of the output
+            inputs (dict[str, str]): fingerprints of the inputs by task name
+        """
+        if not fingerprint:
+            return
+        # Keep the state in processing order for `latest`
+        self.entries.pop(fingerprint, None)
+        self.entries[fingerprint] = {
+            "task": task,
+            "version": version,
+            "output": output,
+            "inputs": inputs,
+        }
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(f"{self.state_path}.part", "w") as file:
+            json.dump(self.entries, file, indent=2)
+        os.replace(f"{self.state_path}.part", self.state_path)
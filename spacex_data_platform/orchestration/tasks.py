@@ -0,0 +1,212 @@
+"""Module with the raw, bronze and silver tasks of the data-platform graph"""
+
+import inspect
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+from spacex_data_platform.ingestion import partitioning
+from spacex_data_platform.ingestion.bronze import bronze_data, changes, json_stream
+from spacex_data_platform.ingestion.bronze.bronze_data import SpaceXBronze
+from spacex_data_platform.ingestion.bronze.changes import changes_path, row_hashes_path
+from spacex_data_platform.ingestion.bronze.schemas import launches
+from spacex_data_platform.ingestion.bronze.schemas.launches import BRONZE_SCHEMA
+from spacex_data_platform.ingestion.gold import gold_data
+from spacex_data_platform.ingestion.gold.gold_data import SpaceXGold
+from spacex_data_platform.ingestion.raw import api_spacex_data
+from spacex_data_platform.ingestion.raw.api_spacex_data import ApiSpaceXData
+from spacex_data_platform.ingestion.raw.raw_file import read_checksum
+from spacex_data_platform.ingestion.silver import (
+    flatten,
+    id_dictionary,
+    silver_data,
+    validation,
+)
+from spacex_data_platform.ingestion.silver.id_dictionary import (
+    BRONZE_ID_COLUMNS,
+    IdDictionary,
+    id_dictionary_paths,
+)
+from spacex_data_platform.ingestion.silver.silver_data import (
+    SilverDataInterface,
+    read_bronze,
+)
+from spacex_data_platform.ingestion.silver.validation import ValidationSettings
+from spacex_data_platform.orchestration.task_graph import (
+    Task,
+    code_version,
+    fingerprint,
+)
+from spacex_data_platform.orchestration.task_state import link_output
+
+
+class SharedBronze:
+    """Class to read a bronze version once with the columns of all the silver ETLs,
+    shared by the silver tasks running in threads"""
+
+    def __init__(self, columns: list[str]):
+        self.columns = columns
+        self._lock = threading.Lock()
+        self._bronze_data_path: str | None = None
+        self._bronze: pa.Table | None = None
+
+    def get(self, bronze_data_path: str) -> pa.Table:
+        """Get the bronze table, reading it the first time
+
+        Args:
+            bronze_data_path (str): path of the bronze data
+
+        Returns:
+            pa.Table: bronze table with the columns of all the silver ETLs
+        """
+        with self._lock:
+            if self._bronze_data_path != bronze_data_path:
+                self._bronze = read_bronze(bronze_data_path, self.columns)
+                self._bronze_data_path = bronze_data_path
+            return self._bronze
+
+
+class RawTask(Task):
+    """Source task that gets the data from SpaceX API, fingerprinted by the checksum
+    of the launches"""
+
+    def __init__(self, name: str, raw: ApiSpaceXData):
+        super().__init__(name)
+        self.raw = raw
+
+    def version(self) -> str:
+        return code_version(api_spacex_data)
+
+    def output_fingerprint(self, output: str) -> str | None:
+        return read_checksum(output)
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str | None:
+        return self.raw.get_data_and_store()
+
+
+class BronzeTask(Task):
+    """Task that creates the bronze data from the raw data"""
+
+    def __init__(self, name: str, bronze: SpaceXBronze, raw: str):
+        super().__init__(name, [raw])
+        self.bronze = bronze
+
+    def version(self) -> str:
+        return fingerprint(
+            code=code_version(bronze_data, changes, json_stream, partitioning),
+            schema=code_version(launches),
+            arrow_schema=BRONZE_SCHEMA.to_string(),
+            partitioned=self.bronze.partitioned,
+        )
+
+    def link(self, output: str, input_path: str) -> str:
+        # The row hashes and change log are read next to the bronze data
+        for path in [row_hashes_path(output), changes_path(output)]:
+            if os.path.exists(path):
+                link_output(path, input_path)
+        return link_output(output, input_path)
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str:
+        return self.bronze.create_bronze(inputs[self.inputs[0]], previous_output)
+
+
+class IdsTask(Task):
+    """Task that appends the new ids of the bronze data to the persistent id
+    dictionary and stores the dictionary of the snapshot"""
+
+    def __init__(self, name: str, bronze: str):
+        super().__init__(name, [bronze])
+
+    def version(self) -> str:
+        return code_version(id_dictionary)
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str:
+        bronze_data_path = inputs[self.inputs[0]]
+        snapshot_path, persistent_path = id_dictionary_paths(bronze_data_path)
+        dictionary = IdDictionary.read(persistent_path).update(
+            read_bronze(bronze_data_path, BRONZE_ID_COLUMNS).to_pandas(
+                types_mapper=pd.ArrowDtype
+            )
+        )
+        dictionary.write(persistent_path)
+        return dictionary.write(snapshot_path)
+
+
+class SilverTask(Task):
+    """Task that runs a silver ETL on the bronze data"""
+
+    def __init__(
+        self,
+        name: str,
+        silver: SilverDataInterface,
+        bronze: str,
+        partitioned: bool = False,
+        shared_bronze: SharedBronze | None = None,
+        ids: str | None = None,
+        validation: ValidationSettings | None = None,
+    ):
+        super().__init__(name, [bronze] + ([ids] if ids is not None else []))
+        self.silver = silver
+        self.partitioned = partitioned
+        self.shared_bronze = shared_bronze
+        self.ids = ids
+        # Pickled with the task, so the processes validate with the same settings
+        self.validation = validation
+
+    def version(self) -> str:
+        settings = self.validation or ValidationSettings()
+        return fingerprint(
+            code=code_version(
+                inspect.getmodule(type(self.silver)),
+                silver_data,
+                flatten,
+                id_dictionary,
+                validation,
+            ),
+            schema=code_version(inspect.getmodule(self.silver.schema)),
+            partitioned=self.partitioned,
+            # The outputs validated on a sample are not the ones validated in full
+            validation=[settings.mode, settings.sample],
+        )
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str:
+        bronze_data_path = inputs[self.inputs[0]]
+        return self.silver.run(
+            bronze_data_path,
+            partitioned=self.partitioned,
+            previous_data_path=previous_output,
+            bronze=self.shared_bronze.get(bronze_data_path)
+            if self.shared_bronze is not None
+            else None,
+            id_dictionary_path=inputs[self.ids] if self.ids is not None else None,
+            validation=self.validation,
+        )
+
+
+class GoldTask(Task):
+    """Task that creates the gold aggregates from the silver core timelines and
+    fairings"""
+
+    def __init__(
+        self,
+        name: str,
+        gold: SpaceXGold,
+        core_timelines: str,
+        fairings: str,
+        bronze: str,
+    ):
+        super().__init__(name, [core_timelines, fairings, bronze])
+        self.gold = gold
+
+    def version(self) -> str:
+        return code_version(gold_data)
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str:
+        core_timelines_path, fairings_data_path, bronze_data_path = (
+            inputs[name] for name in self.inputs
+        )
+        return self.gold.run(
+            core_timelines_path, fairings_data_path, bronze_data_path, previous_output
+        )
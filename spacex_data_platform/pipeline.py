@@ -0,0 +1,195 @@
+"""Module with the pipeline of the data-platform, importable without running it"""
+
+import argparse
+import logging
+from collections.abc import Callable
+
+from spacex_data_platform.ingestion.bronze.bronze_data import SpaceXBronze
+from spacex_data_platform.ingestion.gold.gold_data import SpaceXGold
+from spacex_data_platform.ingestion.raw.api_spacex_data import ApiSpaceXData
+from spacex_data_platform.ingestion.silver.core_timelines_data import (
+    SpaceXCoreTimelines,
+)
+from spacex_data_platform.ingestion.silver.cores_data import SpaceXCores
+from spacex_data_platform.ingestion.silver.fairings_data import SpaceXFairings
+from spacex_data_platform.ingestion.silver.silver_data import SilverDataInterface
+from spacex_data_platform.ingestion.silver.validation import (
+    VALIDATION_MODES,
+    ValidationSettings,
+)
+from spacex_data_platform.orchestration.catalog import SnapshotCatalog
+from spacex_data_platform.orchestration.task_graph import (
+    EXECUTOR_MODES,
+    PipelineError,
+    TaskGraph,
+)
+from spacex_data_platform.orchestration.task_state import TaskState
+from spacex_data_platform.orchestration.tasks import (
+    BronzeTask,
+    GoldTask,
+    IdsTask,
+    RawTask,
+    SharedBronze,
+    SilverTask,
+)
+
+
+class Main:
+    """Main class to run the data-platform"""
+
+    def __init__(
+        self,
+        partitioned: bool = False,
+        incremental: bool = False,
+        incremental_fetch: bool = False,
+        fetch_page_size: int = 100,
+        max_workers: int | None = None,
+        mode: str = "thread",
+        validation: str = "full",
+        validation_sample: int | float | None = None,
+        validation_chunk_size: int | None = None,
+        validation_workers: int | None = None,
+        progress: Callable[[str, str], None] | None = None,
+        catalog: SnapshotCatalog | None = None,
+    ):
+        silver: dict[str, SilverDataInterface] = {
+            "space_x_fairings": SpaceXFairings(),
+            "space_x_cores": SpaceXCores(),
+            "space_x_core_timelines": SpaceXCoreTimelines(),
+        }
+        # Given to every silver task instead of configuring the validators of the
+        # silver classes, shared by every Main of the process
+        validation_settings = ValidationSettings(
+            validation,
+            validation_sample,
+            "data/validation",
+            validation_chunk_size,
+            validation_workers,
+        )
+        # The threads share bronze read once with the columns of all the silver
+        # ETLs, the processes read their own columns
+        shared_bronze = None
+        if mode == "thread":
+            shared_bronze = SharedBronze(
+                list(
+                    dict.fromkeys(
+                        column
+                        for silver_data in silver.values()
+                        for column in silver_data.bronze_columns
+                    )
+                )
+            )
+        self._graph = TaskGraph(
+            [
+                RawTask(
+                    "raw",
+                    ApiSpaceXData(
+                        incremental=incremental_fetch, page_size=fetch_page_size
+                    ),
+                ),
+                BronzeTask("bronze", SpaceXBronze(partitioned=partitioned), "raw"),
+                IdsTask("ids", "bronze"),
+                *(
+                    SilverTask(
+                        name,
+                        silver_data,
+                        "bronze",
+                        partitioned,
+                        shared_bronze,
+                        "ids",
+                        validation_settings,
+                    )
+                    for name, silver_data in silver.items()
+                ),
+                GoldTask(
+                    "gold",
+                    SpaceXGold(),
+                    "space_x_core_timelines",
+                    "space_x_fairings",
+                    "bronze",
+                ),
+            ],
+            TaskState(),
+            max_workers,
+            mode,
+            incremental,
+            progress,
+        )
+        self._catalog = catalog or SnapshotCatalog()
+
+    def run(self) -> dict[str, str]:
+        """Run all the data-platform process:
+        - Run the ingestion process, skipping the tasks that are up to date
+        - Create the gold aggregates of the dashboard
+        - Record the snapshot in the catalog, `partial` if any task failed
+
+        Raises:
+            PipelineError: if any task failed
+
+        Returns:
+            dict[str, str]: path of the output of every task by name
+        """
+        logging.info("Starting ingestion process")
+        try:
+            outputs = self._graph.run()
+        except PipelineError as error:
+            self._catalog.record(error.outputs, complete=False)
+            raise
+        # Without new data the tasks are skipped and there is no new snapshot
+        if set(outputs) == {task.name for task in self._graph.tasks}:
+            self._catalog.record(outputs, complete=True)
+        logging.info(f"Ingestion process finished: {outputs}")
+        return outputs
+
+
+def sample_size(value: str) -> int | float:
+    """Parse the validation sample of the command line
+
+    Args:
+        value (str): number of rows, or fraction of them with a decimal point
+
+    Returns:
+        int | float: number or fraction of the rows validated in `sample` mode
+    """
+    return float(value) if "." in value else int(value)
+
+
+def main(args: list[str] | None = None) -> None:
+    """Run the pipeline from the command line
+
+    Args:
+        args (list[str] | None, optional): command line arguments. Defaults to None,
+            the arguments of the process.
+    """
+    parser = argparse.ArgumentParser(
+        prog="spacex-data-platform", description="Run the SpaceX data-platform"
+    )
+    parser.add_argument("--partitioned", action="store_true")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--incremental-fetch", action="store_true")
+    parser.add_argument("--fetch-page-size", type=int, default=100)
+    parser.add_argument("--max-workers", type=int)
+    parser.add_argument("--mode", choices=list(EXECUTOR_MODES), default="thread")
+    parser.add_argument("--validation", choices=list(VALIDATION_MODES), default="full")
+    parser.add_argument("--validation-sample", type=sample_size)
+    parser.add_argument(
+        "--rebuild-catalog",
+        action="store_true",
+        help="record the snapshots missing from the catalog without running",
+    )
+    parsed = parser.parse_args(args)
+    logging.basicConfig(level=logging.INFO)
+    if parsed.rebuild_catalog:
+        snapshots = SnapshotCatalog().backfill()
+        logging.info(f"Recorded {len(snapshots)} snapshots in the catalog")
+        return
+    Main(
+        partitioned=parsed.partitioned,
+        incremental=parsed.incremental,
+        incremental_fetch=parsed.incremental_fetch,
+        fetch_page_size=parsed.fetch_page_size,
+        max_workers=parsed.max_workers,
+        mode=parsed.mode,
+        validation=parsed.validation,
+        validation_sample=parsed.validation_sample,
+    ).run()
@@ -0,0 +1,85 @@
+import os
+
+import duckdb
+import pyarrow as pa
+
+from spacex_data_platform.data_visualization.cache import QueryCache, result_key
+from spacex_data_platform.data_visualization.queries import create_views, run_query
+from tests.data_visualization.test_queries import write_snapshot
+
+LAUNCHES = {
+    "a": ("2020-01-10T00:00:00Z", [("core1", 1)]),
+    "b": ("2020-01-30T00:00:00Z", [("core2", 1), ("core3", 1)]),
+    "c": ("2020-03-05T00:00:00Z", [("core1", 2)]),
+}
+
+
+def result(rows: int) -> pa.Table:
+    return pa.table({"value": pa.array(range(rows), pa.int64())})
+
+
+class TestQueryCache:
+    def test_query_cache_serves_the_results_from_memory_and_disk(self, tmp_path):
+        write_snapshot(tmp_path, "2024_05_09__17_05_33", LAUNCHES)
+        connection = duckdb.connect()
+        create_views(connection, "2024_05_09__17_05_33", str(tmp_path))
+        cache = QueryCache(f"{tmp_path}/cache")
+        query = "cores_used_in_less_than_x_days"
+
+        first = run_query(connection, query, [60], cache, "snapshot")
+        second = run_query(connection, query, [60], cache, "snapshot")
+        run_query(connection, query, [50], cache, "snapshot")
+        run_query(connection, query, [60], cache, "other snapshot")
+
+        assert first.equals(second)
+        assert first["id"].tolist() == ["c"]
+        assert cache.stats() | {"memory_bytes": 0, "disk_bytes": 0} == {
+            "memory_hits": 1,
+            "disk_hits": 0,
+            "misses": 3,
+            "memory_results": 3,
+            "memory_bytes": 0,
+            "disk_results": 3,
+            "disk_bytes": 0,
+        }
+        # The results on disk are read by a new cache without running the query
+        connection.execute("DROP VIEW gold.core_timelines")
+        cache = QueryCache(f"{tmp_path}/cache")
+        assert run_query(connection, query, [60], cache, "snapshot").equals(first)
+        assert cache.stats()["disk_hits"] == 1
+        assert result_key("snapshot", "SELECT  1\n", [60]) == result_key(
+            "snapshot", "SELECT 1", [60]
+        )
+        assert result_key("snapshot", "SELECT 1", [60]) != result_key(
+            "snapshot", "SELECT 1", ["60"]
+        )
+
+    def test_query_cache_evicts_the_least_recently_used_results(self, tmp_path):
+        QueryCache(f"{tmp_path}/cache").put("a", result(1000))
+        disk_size = os.path.getsize(f"{tmp_path}/cache/a.arrow")
+        cache = QueryCache(
+            f"{tmp_path}/cache",
+            max_memory_bytes=2 * result(1000).nbytes,
+            max_disk_bytes=2 * disk_size,
+        )
+
+        cache.put("b", result(1000))
+        assert cache.get("a").equals(result(1000))
+        cache.put("c", result(1000))
+        cache.put("d", result(10**6))
+
+        assert sorted(os.listdir(f"{tmp_path}/cache")) == ["a.arrow", "c.arrow"]
+        assert cache.stats() | {"memory_bytes": 0, "disk_bytes": 0} == {
+            "memory_hits": 0,
+            "disk_hits": 1,
+            "misses": 0,
+            "memory_results": 2,
+            "memory_bytes": 0,
+            "disk_results": 2,
+            "disk_bytes": 0,
+        }
+        assert cache.get("b") is None
+        cache = QueryCache(f"{tmp_path}/cache")
+        os.remove(f"{tmp_path}/cache/c.arrow")
+        assert cache.get("c") is None
+        assert cache.stats()["disk_results"] == 1
@@ -0,0 +1,130 @@
+import os
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from spacex_data_platform.data_visualization.cache import QueryCache
+from spacex_data_platform.data_visualization.diff import (
+    diff_preview,
+    diff_summary,
+    diff_table,
+)
+
+
+def write_cores(tmp_path, snapshot: str, cores: list[tuple]) -> None:
+    data_path = f"{tmp_path}/silver/{snapshot}/cores_flight.parquet"
+    os.makedirs(os.path.dirname(data_path))
+    pd.DataFrame(
+        cores, columns=["id", "core", "flight", "landpad", "create_date"]
+    ).astype({"create_date": "datetime64[ms, UTC]"}).to_parquet(data_path)
+
+
+class TestDiff:
+    @pytest.fixture
+    def snapshots(self, tmp_path) -> str:
+        write_cores(
+            tmp_path,
+            "2024_05_09__17_05_33",
+            [
+                ("a", "core1", 1, "pad1", "2024-05-09"),
+                ("a", "core2", 1, None, "2024-05-09"),
+                ("b", "core1", 2, "pad1", "2024-05-09"),
+                ("c", "core3", 1, "pad2", "2024-05-09"),
+            ],
+        )
+        write_cores(
+            tmp_path,
+            "2024_05_10__17_05_33",
+            [
+                ("a", "core1", 1, "pad1", "2024-05-10"),
+                ("a", "core2", 1, "pad2", "2024-05-10"),
+                ("b", "core1", 3, "pad1", "2024-05-10"),
+                ("d", "core3", 2, "pad2", "2024-05-10"),
+            ],
+        )
+        return str(tmp_path)
+
+    def test_diff_table_streams_the_added_removed_and_changed_rows(self, snapshots):
+        reader = diff_table(
+            duckdb.connect(),
+            "cores_flight",
+            "2024_05_09__17_05_33",
+            "2024_05_10__17_05_33",
+            batch_size=2,
+            data_dir=snapshots,
+        )
+
+        assert isinstance(reader, pa.RecordBatchReader)
+        assert reader.schema.names == [
+            "change",
+            "id",
+            "core",
+            "flight",
+            "landpad",
+            "flight_changed",
+            "landpad_changed",
+        ]
+        rows = sorted(
+            tuple(row.values()) for batch in reader for row in batch.to_pylist()
+        )
+        assert rows == [
+            ("added", "d", "core3", 2, "pad2", None, None),
+            ("changed", "a", "core2", 1, "pad2", False, True),
+            ("changed", "b", "core1", 3, "pad1", True, False),
+            ("removed", "c", "core3", 1, "pad2", None, None),
+        ]
+
+    def test_diff_summary_counts_the_changes_of_every_column(self, snapshots):
+        summary = diff_summary(
+            duckdb.connect(),
+            "cores_flight",
+            "2024_05_09__17_05_33",
+            "2024_05_10__17_05_33",
+            data_dir=snapshots,
+        )
+
+        assert summary == {
+            "added": 1,
+            "removed": 1,
+            "changed": 2,
+            "flight_changed": 1,
+            "landpad_changed": 1,
+        }
+        with pytest.raises(ValueError):
+            diff_summary(duckdb.connect(), "core_timelines", "a", "b", snapshots)
+
+    def test_diff_is_computed_once_for_every_pair_of_snapshots(
+        self, snapshots, tmp_path
+    ):
+        cache = QueryCache(f"{tmp_path}/cache")
+        versions = ("cores_flight", "2024_05_09__17_05_33", "2024_05_10__17_05_33")
+        diffs = [
+            (
+                diff_summary(
+                    duckdb.connect(),
+                    *versions,
+                    snapshots,
+                    cache,
+                    ("old hash", "new hash"),
+                ),
+                diff_preview(
+                    duckdb.connect(),
+                    *versions,
+                    3,
+                    snapshots,
+                    cache,
+                    ("old hash", "new hash"),
+                ),
+            )
+            for _ in range(2)
+        ]
+
+        assert diffs[0][0] == diffs[1][0]
+        assert diffs[0][1].equals(diffs[1][1])
+        assert len(diffs[0][1]) == 3
+        assert cache.stats()["memory_hits"] == 2
+        assert cache.stats()["misses"] == 2
+        diff_summary(duckdb.connect(), *versions, snapshots, cache, (None, "new hash"))
+        assert cache.stats()["misses"] == 2
@@ -0,0 +1,104 @@
+import os
+
+import duckdb
+import pandas as pd
+import pytest
+
+from spacex_data_platform.data_visualization.queries import (
+    count_rows,
+    create_views,
+    page,
+    run_query,
+)
+from spacex_data_platform.ingestion.gold.gold_data import SpaceXGold
+from tests.ingestion.test_gold import write_silver
+
+
+def write_snapshot(tmp_path, snapshot: str, launches: dict[str, tuple]) -> None:
+    timelines_path = write_silver(tmp_path, snapshot, launches)
+    SpaceXGold.run(timelines_path, timelines_path.replace("core_timelines", "fairings"))
+
+
+class TestQueries:
+    @pytest.fixture
+    def launches(self) -> dict[str, tuple]:
+        return {
+            "a": ("2020-01-10T00:00:00Z", [("core1", 1)]),
+            "b": ("2020-01-30T00:00:00Z", [("core2", 1), ("core3", 1)]),
+            "c": ("2020-03-05T00:00:00Z", [("core1", 2)]),
+            "d": ("2020-03-06T00:00:00Z", []),
+        }
+
+    def test_queries_run_over_the_views_of_the_data_version(self, launches, tmp_path):
+        write_snapshot(tmp_path, "2024_05_09__17_05_33", launches)
+        connection = duckdb.connect()
+
+        views = create_views(connection, "2024_05_09__17_05_33", str(tmp_path))
+
+        assert views == [
+            "silver.fairings",
+            "silver.core_timelines",
+            "gold.launch_dates",
+            "gold.core_timelines",
+            "gold.core_usage",
+            "gold.monthly_launches",
+        ]
+        max_flight = run_query(connection, "max_number_of_times_a_core_has_been_used")
+        assert max_flight.values.tolist() == [["core1", 2]]
+        reused = run_query(connection, "cores_used_in_less_than_x_days", [60])
+        assert reused[["id", "previous_id", "gap_days"]].values.tolist() == [
+            ["c", "a", 55.0]
+        ]
+        assert run_query(connection, "cores_used_in_less_than_x_days", [50]).empty
+        months = run_query(connection, "months_with_more_than_x_launches", [1])
+        assert months["number_of_launches"].tolist() == [2, 2]
+
+    def test_create_views_replaces_the_views_of_the_previous_version(
+        self, launches, tmp_path
+    ):
+        write_snapshot(tmp_path, "2024_05_09__17_05_33", launches)
+        del launches["d"]
+        write_snapshot(tmp_path, "2024_05_10__17_05_33", launches)
+        os.remove(f"{tmp_path}/silver/2024_05_10__17_05_33/core_timelines.parquet")
+        connection = duckdb.connect()
+        create_views(connection, "2024_05_09__17_05_33", str(tmp_path))
+
+        views = create_views(connection, "2024_05_10__17_05_33", str(tmp_path))
+
+        assert "silver.core_timelines" not in views
+        with pytest.raises(duckdb.CatalogException):
+            connection.execute("SELECT * FROM silver.core_timelines")
+        assert page(connection, "silver.fairings", 0, 2)["id"].tolist() == ["a", "b"]
+        assert count_rows(connection, "silver.fairings") == 3
+        with pytest.raises(ValueError):
+            page(connection, "main.fairings; DROP VIEW silver.fairings")
+
+    def test_page_sorts_filters_and_pages_the_rows_in_sql(self, launches, tmp_path):
+        write_snapshot(tmp_path, "2024_05_09__17_05_33", launches)
+        connection = duckdb.connect()
+        create_views(connection, "2024_05_09__17_05_33", str(tmp_path))
+
+        pages = [
+            page(connection, "silver.core_timelines", number, 3, "flight", True)
+            for number in range(2)
+        ]
+
+        assert [rows[["id", "core"]].values.tolist() for rows in pages] == [
+            [["c", "core1"], ["a", "core1"], ["b", "core2"]],
+            [["b", "core3"]],
+        ]
+        filters = [("core", "contains", "CORE1"), ("flight", ">", "1")]
+        filtered = page(connection, "silver.core_timelines", filters=filters)
+        assert filtered["id"].tolist() == ["c"]
+        assert count_rows(connection, "silver.core_timelines", filters) == 1
+        assert (
+            count_rows(connection, "silver.core_timelines", [("gap_days", "=", None)])
+            == 0
+        )
+        with pytest.raises(ValueError):
+            page(connection, "silver.core_timelines", filters=[("x", "=", 1)])
+        with pytest.raises(ValueError):
+            page(connection, "silver.core_timelines", sort_by="core; DROP TABLE x")
+        with pytest.raises(ValueError):
+            count_rows(connection, "silver.core_timelines", [("id", "LIKE", "a")])
+        assert isinstance(page(connection, "gold.core_usage"), pd.DataFrame)
@@ -1,16 +1,35 @@
-from datetime import datetime
-from unittest.mock import patch
+import io
+import json
+import os
+from datetime import datetime, timezone
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from freezegun import freeze_time
 
 from spacex_data_platform.ingestion.bronze.bronze_data import SpaceXBronze
+from spacex_data_platform.ingestion.bronze.changes import changes_path, row_hashes_path
+from spacex_data_platform.ingestion.bronze.json_stream import JsonArrayStream
+from spacex_data_platform.ingestion.bronze.schemas.launches import BRONZE_SCHEMA
 from spacex_data_platform.ingestion.constants import DATE_FORMAT, SPACEX_PROVIDER_CODE
+from spacex_data_platform.ingestion.raw.raw_file import write_raw_file
 
 FROZEN_CREATE_DATE = datetime.now().strftime(DATE_FORMAT)
 
 
+def write_raw_data(
+    tmp_path, raw_data: pd.DataFrame, compression: str | None = None
+) -> str:
+    data_path = f"{tmp_path}/raw/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.json"
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    stored_path, _ = write_raw_file(
+        data_path, [raw_data.to_json(orient="records").encode()], compression
+    )
+    return stored_path
+
+
 class TestRaw:
     @pytest.fixture
     def raw_data(self) -> str:
@@ -26,35 +45,186 @@ class TestRaw:
         return pd.DataFrame(
             {
                 "id": ["case"],
-                "create_date": datetime.now().strftime(DATE_FORMAT),
-                "provider_code": [SPACEX_PROVIDER_CODE],
+                "create_date": pd.to_datetime([FROZEN_CREATE_DATE], utc=True).astype(
+                    "datetime64[ms, UTC]"
+                ),
+                "provider_code": pd.Categorical([SPACEX_PROVIDER_CODE]),
             }
         )
 
     @freeze_time(FROZEN_CREATE_DATE)
-    @patch("pandas.read_json")
+    @pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
     def test_spacex_bronze_creates_bronze_data_with_id_as_index(
-        self, mock_read_json, tmp_path, raw_data, bronzified_data
+        self, tmp_path, raw_data, bronzified_data, compression
     ):
-        mock_read_json.return_value = raw_data
+        raw_data_path = write_raw_data(tmp_path, raw_data, compression)
         expected_path = f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet"
 
-        result_path = SpaceXBronze.create_bronze(
-            f"{tmp_path}/raw/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.json"
-        )
+        result_path = SpaceXBronze().create_bronze(raw_data_path)
         assert expected_path == result_path
 
-        result = pd.read_parquet(result_path)
+        assert pq.read_schema(result_path).equals(BRONZE_SCHEMA)
+        result = pd.read_parquet(
+            result_path, columns=["id", "create_date", "provider_code"]
+        )
         pd.testing.assert_frame_equal(result, bronzified_data)
 
-    @patch("pandas.read_json")
-    def test_spacex_bronze_with_duplicated_id_returns_error(
-        self, mock_read_json, tmp_path, raw_data
-    ):
+    def test_spacex_bronze_with_duplicated_id_returns_error(self, tmp_path, raw_data):
         duplicated_raw_data = pd.concat([raw_data, raw_data])
 
-        mock_read_json.return_value = duplicated_raw_data
+        raw_data_path = write_raw_data(tmp_path, duplicated_raw_data)
         with pytest.raises(ValueError):
-            SpaceXBronze.create_bronze(
-                f"{tmp_path}/raw/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.json"
+            SpaceXBronze().create_bronze(raw_data_path)
+
+    def test_spacex_bronze_writes_a_row_group_per_batch(self, tmp_path):
+        raw_data = pd.DataFrame(
+            {
+                "id": ["first", "second", "third"],
+                "cores": [[{"core": "a", "flight": 1}], [], [{"core": "b"}]],
+            }
+        )
+        raw_data_path = write_raw_data(tmp_path, raw_data)
+
+        result_path = SpaceXBronze(batch_size=2).create_bronze(raw_data_path)
+
+        assert pq.ParquetFile(result_path).metadata.num_row_groups == 2
+        result = pd.read_parquet(result_path, columns=["id", "cores"])
+        assert result["id"].tolist() == ["first", "second", "third"]
+        assert [len(cores) for cores in result["cores"]] == [1, 0, 1]
+        assert result["cores"][2][0]["flight"] is None
+
+    def test_spacex_bronze_casts_the_launches_to_the_typed_schema(self, tmp_path):
+        raw_data = pd.DataFrame(
+            {
+                "id": ["first", "second"],
+                "date_utc": ["2020-01-07T02:19:21.000Z", "2020-01-29T14:06:00.000Z"],
+                "rocket": ["falcon9", "falcon9"],
+                "success": [True, None],
+                "unknown": ["dropped", "dropped"],
+            }
+        )
+        raw_data_path = write_raw_data(tmp_path, raw_data)
+
+        result_path = SpaceXBronze(row_group_size=1, compression="zstd").create_bronze(
+            raw_data_path
+        )
+
+        metadata = pq.ParquetFile(result_path).metadata
+        assert metadata.num_row_groups == 2
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+        result = pq.read_table(
+            result_path, columns=["date_utc", "rocket", "success", "fairings"]
+        )
+        assert result.schema == pa.schema(
+            [BRONZE_SCHEMA.field(name) for name in result.schema.names]
+        )
+        assert result["date_utc"].to_pylist() == [
+            datetime(2020, 1, 7, 2, 19, 21, tzinfo=timezone.utc),
+            datetime(2020, 1, 29, 14, 6, tzinfo=timezone.utc),
+        ]
+        assert result["success"].to_pylist() == [True, None]
+        assert result["fairings"].to_pylist() == [None, None]
+
+    def test_spacex_bronze_partitions_the_launches_by_year_and_month(self, tmp_path):
+        raw_data = pd.DataFrame(
+            {
+                "id": ["first", "second", "third"],
+                "date_utc": [
+                    "2019-12-31T23:00:00.000Z",
+                    "2020-01-07T02:19:21.000Z",
+                    "2020-01-29T14:06:00.000Z",
+                ],
+            }
+        )
+        raw_data_path = write_raw_data(tmp_path, raw_data)
+
+        result_path = SpaceXBronze(batch_size=2, partitioned=True).create_bronze(
+            raw_data_path
+        )
+
+        bronze_path = os.path.dirname(raw_data_path).replace("raw", "bronze")
+        assert result_path == f"{bronze_path}/spacex_data"
+        assert sorted(
+            os.path.relpath(os.path.join(directory, file), result_path)
+            for directory, _, files in os.walk(result_path)
+            for file in files
+        ) == ["year=2019/month=12/part-0.parquet", "year=2020/month=1/part-0.parquet"]
+        result = pd.read_parquet(
+            result_path, columns=["id"], filters=[("year", "=", 2020)]
+        )
+        assert sorted(result["id"]) == ["second", "third"]
+
+    def test_spacex_bronze_stores_only_the_changed_launches_and_a_change_log(
+        self, tmp_path
+    ):
+        with freeze_time("2024-05-09 17:05:33"):
+            previous_raw_data = pd.DataFrame(
+                {"id": ["kept", "updated", "deleted"], "details": ["a", "b", "c"]}
+            )
+            previous_path = SpaceXBronze().create_bronze(
+                write_raw_data(tmp_path, previous_raw_data)
+            )
+        with freeze_time("2024-05-10 17:05:33"):
+            raw_data = pd.DataFrame(
+                {"id": ["kept", "updated", "inserted"], "details": ["a", "B", "d"]}
             )
+            result_path = SpaceXBronze(batch_size=1).create_bronze(
+                write_raw_data(tmp_path, raw_data), previous_path
+            )
+
+        result = pd.read_parquet(result_path, columns=["id", "details"])
+        assert result.to_dict("records") == [
+            {"id": "updated", "details": "B"},
+            {"id": "inserted", "details": "d"},
+        ]
+        previous_hashes = pd.read_parquet(row_hashes_path(previous_path))
+        changes = pd.read_parquet(changes_path(result_path))
+        assert changes[["id", "operation"]].astype(str).to_dict("records") == [
+            {"id": "updated", "operation": "update"},
+            {"id": "inserted", "operation": "insert"},
+            {"id": "deleted", "operation": "delete"},
+        ]
+        assert changes["previous_row_hash"].tolist() == [
+            previous_hashes["row_hash"][1],
+            None,
+            previous_hashes["row_hash"][2],
+        ]
+        assert pd.read_parquet(row_hashes_path(result_path))["id"].tolist() == [
+            "kept",
+            "updated",
+            "inserted",
+        ]
+
+    def test_spacex_bronze_with_duplicated_id_in_another_batch_returns_error(
+        self, tmp_path
+    ):
+        raw_data = pd.DataFrame({"id": ["first", "second", "first"]})
+        raw_data_path = write_raw_data(tmp_path, raw_data)
+
+        with pytest.raises(ValueError):
+            SpaceXBronze(batch_size=2).create_bronze(raw_data_path)
+        assert not os.path.exists(
+            os.path.dirname(raw_data_path).replace("raw", "bronze")
+            + "/spacex_data.parquet"
+        )
+
+
+class TestJsonArrayStream:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+    def test_json_array_stream_yields_every_element_across_chunks(self, chunk_size):
+        elements = [
+            {"id": "a", "cores": [{"core": "ñ", "flight": 12345}], "window": None},
+            12345,
+            "text, with ] and [",
+            [1.5, True, False],
+            {},
+        ]
+        content = json.dumps(elements, indent=1, ensure_ascii=False).encode()
+
+        stream = JsonArrayStream(io.BytesIO(content), chunk_size=chunk_size)
+
+        assert list(stream.batches(2)) == [elements[0:2], elements[2:4], elements[4:]]
+
+    def test_json_array_stream_rejects_a_document_that_is_not_an_array(self):
+        with pytest.raises(ValueError):
+            list(JsonArrayStream(io.BytesIO(b'{"id": "a"}')))
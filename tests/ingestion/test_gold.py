@@ -0,0 +1,126 @@
+import os
+
+import pandas as pd
+import pytest
+
+from spacex_data_platform.ingestion.bronze.changes import changes_path
+from spacex_data_platform.ingestion.gold.gold_data import GOLD_TABLES, SpaceXGold
+from spacex_data_platform.ingestion.silver.core_timelines_data import (
+    add_previous_launches,
+)
+
+
+def write_silver(tmp_path, snapshot: str, launches: dict[str, tuple]) -> str:
+    ids = list(launches)
+    launch_keys = {id: sorted("abcdef").index(id) for id in ids}
+    dates = pd.to_datetime([date for date, _ in launches.values()], utc=True).astype(
+        "datetime64[ms, UTC]"
+    )
+    core_launches = pd.DataFrame(
+        [
+            (id, core, flight, date)
+            for (id, (_, cores)), date in zip(launches.items(), dates)
+            for core, flight in cores
+        ],
+        columns=["id", "core", "flight", "date_utc"],
+    ).astype({"date_utc": "datetime64[ms, UTC]"})
+    core_launches["launch_key"] = pd.array(
+        core_launches["id"].map(launch_keys), dtype="Int32"
+    )
+    core_launches["core_key"] = pd.array(
+        [int(core[-1]) for core in core_launches["core"]], dtype="Int32"
+    )
+    fairings_df = pd.DataFrame(
+        {
+            "id": ids,
+            "launch_key": pd.array([launch_keys[id] for id in ids], dtype="Int32"),
+            "date_utc": dates,
+        }
+    )
+    timelines_path = f"{tmp_path}/silver/{snapshot}/core_timelines.parquet"
+    os.makedirs(os.path.dirname(timelines_path), exist_ok=True)
+    add_previous_launches(core_launches).to_parquet(timelines_path)
+    fairings_df.to_parquet(timelines_path.replace("core_timelines", "fairings"))
+    return timelines_path
+
+
+class TestSpaceXGold:
+    @pytest.fixture
+    def launches(self) -> dict[str, tuple]:
+        return {
+            "a": ("2020-01-10T00:00:00Z", [("core1", 1)]),
+            "b": ("2020-01-30T00:00:00Z", [("core2", 1), ("core3", 1)]),
+            "c": ("2020-03-05T00:00:00Z", [("core1", 2)]),
+            "d": ("2020-03-06T00:00:00Z", []),
+        }
+
+    def test_spacex_gold_creates_the_aggregates_of_the_dashboard(
+        self, launches, tmp_path
+    ):
+        timelines_path = write_silver(tmp_path, "2024_05_09__17_05_33", launches)
+
+        result_path = SpaceXGold.run(
+            timelines_path, timelines_path.replace("core_timelines", "fairings")
+        )
+
+        assert result_path == f"{tmp_path}/gold/2024_05_09__17_05_33/spacex_data"
+        assert sorted(os.listdir(result_path)) == sorted(
+            f"{name}.parquet" for name in GOLD_TABLES
+        )
+        timelines = pd.read_parquet(f"{result_path}/core_timelines.parquet")
+        assert timelines[["core", "id", "previous_id"]].values.tolist() == [
+            ["core1", "c", "a"],
+            ["core1", "a", None],
+            ["core2", "b", None],
+            ["core3", "b", None],
+        ]
+        assert timelines["gap_days"].tolist()[0] == 55
+        usage = pd.read_parquet(f"{result_path}/core_usage.parquet")
+        assert usage[["core", "launches", "max_flight"]].values.tolist() == [
+            ["core1", 2, 2],
+            ["core2", 1, 1],
+            ["core3", 1, 1],
+        ]
+        monthly = pd.read_parquet(f"{result_path}/monthly_launches.parquet")
+        assert monthly["month"].dt.strftime("%Y-%m").tolist() == ["2020-01", "2020-03"]
+        assert monthly["launches"].tolist() == [2, 2]
+
+    def test_spacex_gold_updates_only_the_changed_launches_as_the_whole_data(
+        self, launches, tmp_path
+    ):
+        timelines_path = write_silver(tmp_path, "2024_05_09__17_05_33", launches)
+        previous_path = SpaceXGold.run(
+            timelines_path, timelines_path.replace("core_timelines", "fairings")
+        )
+        launches["b"] = ("2020-02-15T00:00:00Z", [("core1", 3)])
+        launches["e"] = ("2020-03-20T00:00:00Z", [("core3", 2)])
+        del launches["a"]
+        timelines_path = write_silver(tmp_path, "2024_05_10__17_05_33", launches)
+        bronze_path = f"{tmp_path}/bronze/2024_05_10__17_05_33/spacex_data.parquet"
+        os.makedirs(os.path.dirname(bronze_path))
+        pd.DataFrame(
+            {"id": ["a", "b", "e"], "operation": ["delete", "update", "insert"]}
+        ).to_parquet(changes_path(bronze_path))
+
+        result_path = SpaceXGold.run(
+            timelines_path,
+            timelines_path.replace("core_timelines", "fairings"),
+            bronze_path,
+            previous_path,
+        )
+
+        expected_path = SpaceXGold.store(
+            f"{tmp_path}/silver/expected/core_timelines.parquet",
+            SpaceXGold.generate_gold_data(
+                pd.read_parquet(timelines_path),
+                pd.read_parquet(timelines_path.replace("core_timelines", "fairings")),
+            ),
+        )
+        for name in GOLD_TABLES:
+            result = pd.read_parquet(f"{result_path}/{name}.parquet")
+            expected = pd.read_parquet(f"{expected_path}/{name}.parquet")
+            key = list(result.columns[:2])
+            pd.testing.assert_frame_equal(
+                result.sort_values(key, ignore_index=True),
+                expected.sort_values(key, ignore_index=True),
+            )
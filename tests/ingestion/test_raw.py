@@ -1,9 +1,126 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch
 
 import pytest
+from freezegun import freeze_time
 
 from spacex_data_platform.ingestion.raw.api_spacex_data import ApiSpaceXData
+from spacex_data_platform.ingestion.raw.raw_file import open_raw_file, read_checksum
+
+
+class SpaceXApiStandIn(BaseHTTPRequestHandler):
+    """Serves the collections with an `ETag` and the paginated `/v5/launches/query`"""
+
+    def _send_json(self, payload, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start(self, method: str) -> bool:
+        with self.server.lock:
+            self.server.requests.append((method, self.path))
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(
+                self.server.max_in_flight, self.server.in_flight
+            )
+            failures = self.server.failures.get(self.path, 0)
+            self.server.failures[self.path] = failures - 1
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if failures > 0:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._start("GET"):
+            return
+        payload = self.server.collections[self.path]
+        etag = '"' + hashlib.sha256(json.dumps(payload).encode()).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self._send_json(payload, {"ETag": etag})
+
+    def do_POST(self):
+        if not self._start("POST"):
+            return
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        since = body["query"]["date_utc"]["$gte"]
+        page, limit = body["options"]["page"], body["options"]["limit"]
+        docs = [
+            launch for launch in self.server.launches if launch["date_utc"] >= since
+        ]
+        page_docs = docs[(page - 1) * limit : page * limit]
+        has_next_page = page * limit < len(docs)
+        self._send_json(
+            {
+                "docs": page_docs,
+                "hasNextPage": has_next_page,
+                "nextPage": page + 1 if has_next_page else None,
+            }
+        )
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def spacex_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SpaceXApiStandIn)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.failures = {}
+    server.delay = 0
+    server.in_flight = server.max_in_flight = 0
+    server.launches = [
+        {"id": "a", "date_utc": "2020-01-01T00:00:00.000Z", "upcoming": False},
+        {"id": "b", "date_utc": "2020-02-01T00:00:00.000Z", "upcoming": False},
+        {"id": "c", "date_utc": "2020-03-01T00:00:00.000Z", "upcoming": True},
+    ]
+    server.collections = {
+        "/v5/launches": server.launches,
+        "/v4/rockets": [{"id": "falcon9"}],
+        "/v4/launchpads": [{"id": "slc40"}],
+        "/v4/ships": [{"id": "ocisly"}],
+        "/v4/cores": [{"id": "b1049"}],
+    }
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def api_spacex_data(spacex_api, tmp_path, **kwargs) -> ApiSpaceXData:
+    return ApiSpaceXData(
+        url=f"{spacex_api.url}/v5/launches",
+        raw_data_path=tmp_path,
+        collections={},
+        backoff_factor=0,
+        **kwargs,
+    )
+
+
+def read_launches(data_path: str) -> list[dict]:
+    with open_raw_file(data_path) as raw_file:
+        return json.load(raw_file)
 
 
 class TestRaw:
@@ -11,14 +128,172 @@ class TestRaw:
     def json_data(self) -> str:
         return "{'test': 'case'}"
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_api_spacex_data_get_data_and_store_takes_json_and_save_it_in_raw_folder(
         self, mock_request, tmp_path, json_data
     ):
         expected_path = f"{tmp_path}/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.json"
-        mock_response = Mock()
-        mock_response.text = json_data
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.iter_content.return_value = [json_data.encode()]
         mock_request.return_value = mock_response
-        api_spacex_data = ApiSpaceXData(raw_data_path=tmp_path)
+        api_spacex_data = ApiSpaceXData(raw_data_path=tmp_path, collections={})
         result_path = api_spacex_data.get_data_and_store()
         assert expected_path == result_path
+        with open(result_path) as file:
+            assert file.read() == json_data
+
+    @patch("requests.Session.get")
+    def test_api_spacex_data_streams_compressed_chunks_and_records_checksum(
+        self, mock_request, tmp_path, json_data
+    ):
+        expected_path = f"{tmp_path}/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.json.gz"
+        chunks = [json_data[:5].encode(), json_data[5:].encode()]
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.iter_content.return_value = chunks
+        mock_request.return_value = mock_response
+        api_spacex_data = ApiSpaceXData(
+            raw_data_path=tmp_path, collections={}, compression="gzip"
+        )
+        result_path = api_spacex_data.get_data_and_store()
+        assert expected_path == result_path
+        mock_request.assert_called_once_with(
+            api_spacex_data.url, stream=True, headers={}, timeout=30
+        )
+
+        with gzip.open(result_path) as file:
+            assert file.read() == json_data.encode()
+        expected_checksum = hashlib.sha256(json_data.encode()).hexdigest()
+        assert read_checksum(result_path) == expected_checksum
+        assert api_spacex_data.checksum == expected_checksum
+
+    def test_api_spacex_data_skips_the_snapshot_when_the_api_answers_not_modified(
+        self, spacex_api, tmp_path
+    ):
+        with freeze_time("2024-05-09 17:05:33"):
+            first_path = api_spacex_data(spacex_api, tmp_path).get_data_and_store()
+        assert read_launches(first_path) == spacex_api.launches
+
+        assert api_spacex_data(spacex_api, tmp_path).get_data_and_store() is None
+        assert sorted(os.listdir(tmp_path)) == [
+            "2024_05_09__17_05_33",
+            "fetch_state.json",
+            "objects",
+        ]
+
+        spacex_api.launches[2]["upcoming"] = False
+        with freeze_time("2024-05-10 17:05:33"):
+            second_path = api_spacex_data(spacex_api, tmp_path).get_data_and_store()
+        assert second_path == f"{tmp_path}/2024_05_10__17_05_33/spacex_data.json"
+        assert read_launches(second_path) == spacex_api.launches
+
+    def test_api_spacex_data_incremental_fetches_only_changed_launches(
+        self, spacex_api, tmp_path
+    ):
+        with freeze_time("2024-05-09 17:05:33"):
+            api_spacex_data(spacex_api, tmp_path, incremental=True).get_data_and_store()
+
+        spacex_api.launches[2]["upcoming"] = False
+        spacex_api.launches.append(
+            {"id": "d", "date_utc": "2020-04-01T00:00:00.000Z", "upcoming": True}
+        )
+        spacex_api.requests.clear()
+        incremental_api = api_spacex_data(
+            spacex_api, tmp_path, incremental=True, page_size=1
+        )
+        with freeze_time("2024-05-10 17:05:33"):
+            result_path = incremental_api.get_data_and_store()
+
+        assert spacex_api.requests == [("POST", "/v5/launches/query")] * 2
+        assert read_launches(result_path) == spacex_api.launches
+        assert incremental_api.checksum == read_checksum(result_path)
+
+        assert (
+            api_spacex_data(spacex_api, tmp_path, incremental=True).get_data_and_store()
+            is None
+        )
+
+    def test_api_spacex_data_fetches_all_collections_concurrently_in_the_same_snapshot(
+        self, spacex_api, tmp_path
+    ):
+        spacex_api.delay = 0.2
+        spacex_api.failures = {"/v4/rockets": 1}
+        collections = {
+            name: f"{spacex_api.url}/v4/{name}"
+            for name in ["rockets", "launchpads", "ships", "cores"]
+        }
+        fetcher = api_spacex_data(spacex_api, tmp_path, max_workers=5)
+        fetcher.collections = collections
+
+        start = time.perf_counter()
+        launches_path = fetcher.get_data_and_store()
+        elapsed = time.perf_counter() - start
+
+        assert spacex_api.max_in_flight > 1
+        assert elapsed < len(spacex_api.requests) * spacex_api.delay
+        snapshot_path = os.path.dirname(launches_path)
+        for name in collections:
+            assert (
+                read_launches(f"{snapshot_path}/{name}.json")
+                == (spacex_api.collections[f"/v4/{name}"])
+            )
+        assert spacex_api.requests.count(("GET", "/v4/rockets")) == 2
+
+    def test_api_spacex_data_requests_the_launches_and_every_collection_at_once(
+        self, tmp_path
+    ):
+        fetcher = ApiSpaceXData(raw_data_path=tmp_path)
+
+        assert fetcher.max_workers == len(fetcher.collections) + 1
+
+    def test_api_spacex_data_retries_the_failed_launches_queries(
+        self, spacex_api, tmp_path
+    ):
+        with freeze_time("2024-05-09 17:05:33"):
+            api_spacex_data(spacex_api, tmp_path, incremental=True).get_data_and_store()
+
+        spacex_api.launches[2]["upcoming"] = False
+        spacex_api.requests.clear()
+        spacex_api.failures = {"/v5/launches/query": 1}
+        with freeze_time("2024-05-10 17:05:33"):
+            result_path = api_spacex_data(
+                spacex_api, tmp_path, incremental=True
+            ).get_data_and_store()
+
+        assert spacex_api.requests == [("POST", "/v5/launches/query")] * 2
+        assert read_launches(result_path) == spacex_api.launches
+
+    def test_api_spacex_data_links_the_unchanged_collections_from_the_previous_snapshot(
+        self, spacex_api, tmp_path
+    ):
+        fetcher = api_spacex_data(spacex_api, tmp_path)
+        fetcher.collections = {"rockets": f"{spacex_api.url}/v4/rockets"}
+        with freeze_time("2024-05-09 17:05:33"):
+            first_path = fetcher.get_data_and_store()
+
+        spacex_api.collections["/v4/rockets"].append({"id": "falcon_heavy"})
+        fetcher = api_spacex_data(spacex_api, tmp_path)
+        fetcher.collections = {"rockets": f"{spacex_api.url}/v4/rockets"}
+        with freeze_time("2024-05-10 17:05:33"):
+            second_path = fetcher.get_data_and_store()
+
+        assert os.path.samefile(first_path, second_path)
+        assert read_checksum(second_path) == read_checksum(first_path)
+        assert (
+            read_launches(f"{os.path.dirname(second_path)}/rockets.json")
+            == (spacex_api.collections["/v4/rockets"])
+        )
+
+    def test_api_spacex_data_stores_identical_payloads_once(self, spacex_api, tmp_path):
+        with freeze_time("2024-05-09 17:05:33"):
+            first_path = api_spacex_data(
+                spacex_api, tmp_path, conditional=False
+            ).get_data_and_store()
+        with freeze_time("2024-05-10 17:05:33"):
+            second_path = api_spacex_data(
+                spacex_api, tmp_path, conditional=False
+            ).get_data_and_store()
+
+        assert first_path != second_path
+        assert os.path.samefile(first_path, second_path)
+        checksum = read_checksum(second_path)
+        assert os.listdir(f"{tmp_path}/objects") == [f"{checksum}.json"]
@@ -1,22 +1,45 @@
+import os
 from datetime import datetime
-from unittest.mock import patch
 
 import pandas as pd
+import pandera
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from freezegun import freeze_time
 
-from spacex_data_platform.ingestion.constants import DATE_FORMAT, SPACEX_PROVIDER_CODE
+from spacex_data_platform.ingestion.bronze.changes import changes_path
+from spacex_data_platform.ingestion.bronze.schemas.launches import BRONZE_SCHEMA
+from spacex_data_platform.ingestion.constants import SPACEX_PROVIDER_CODE
+from spacex_data_platform.ingestion.silver.core_timelines_data import (
+    SpaceXCoreTimelines,
+)
 from spacex_data_platform.ingestion.silver.cores_data import SpaceXCores
 from spacex_data_platform.ingestion.silver.fairings_data import SpaceXFairings
+from spacex_data_platform.ingestion.silver.flatten import explode_structs
+from spacex_data_platform.ingestion.silver.id_dictionary import IdDictionary
 from spacex_data_platform.ingestion.silver.schemas.cores_flights import (
     CoresFlightsSchema,
 )
 from spacex_data_platform.ingestion.silver.schemas.fairings import (
     FairingsSchema,
 )
+from spacex_data_platform.ingestion.silver.silver_data import (
+    read_bronze,
+    split_local_dates,
+)
+from spacex_data_platform.ingestion.silver.validation import (
+    ValidationErrors,
+    ValidationSettings,
+    Validator,
+)
 from tests.ingestion.test_bronze import FROZEN_CREATE_DATE
 
 
+def utc_timestamps(dates: list[str | None]) -> pd.Series:
+    return pd.Series(pd.to_datetime(dates, utc=True)).astype("datetime64[ms, UTC]")
+
+
 @freeze_time(FROZEN_CREATE_DATE)
 @pytest.fixture
 def bronzified_data() -> pd.DataFrame:
@@ -65,10 +88,9 @@ def bronzified_data() -> pd.DataFrame:
                 },
                 {},
             ],
-            "static_fire_date_utc": [
-                "2020-03-13T18:37:00.000Z",
-                "2020-07-11T17:58:00.000Z",
-            ],
+            "static_fire_date_utc": utc_timestamps(
+                ["2020-03-13T18:37:00.000Z", "2020-07-11T17:58:00.000Z"]
+            ),
             "static_fire_date_unix": ["1584124620.0", "1594490280.0"],
             "net": False,
             "window": 0,
@@ -125,10 +147,9 @@ def bronzified_data() -> pd.DataFrame:
                 "Failure Case",
                 "Success Case",
             ],
-            "date_utc": [
-                "2020-11-25T02:13:00.000Z",
-                "2020-11-25T02:13:00.000Z",
-            ],
+            "date_utc": utc_timestamps(
+                ["2020-11-25T02:13:00.000Z", "2020-11-25T02:13:00.000Z"]
+            ),
             "date_unix": ["1606270380", "1606270380"],
             "date_local": ["2020-11-24T21:13:00-05:00", "2020-11-24T21:13:00-05:00"],
             "date_precision": "hour",
@@ -164,53 +185,143 @@ def bronzified_data() -> pd.DataFrame:
             "auto_update": True,
             "tbd": False,
             "launch_library_id": None,
-            "create_date": datetime.now().strftime(DATE_FORMAT),
+            "create_date": utc_timestamps([FROZEN_CREATE_DATE] * 2),
             "provider_code": SPACEX_PROVIDER_CODE,
         }
     )
 
 
-class TestSpaceXCores:
-    @pytest.fixture
-    def cores_flights_data(self) -> pd.DataFrame:
-        data = pd.DataFrame(
-            {
-                "id": ["failure_case", "success_case"],
-                "create_date": datetime.now().strftime(DATE_FORMAT),
-                "provider_code": SPACEX_PROVIDER_CODE,
-                "core": ["5e9e289df35918033d3b2623", "5f57c54a0622a633027900a1"],
-                "flight": [1, 7],
-                "gridfins": [False, True],
-                "landing_attempt": [False, True],
-                "landing_success": [None, True],
-                "landing_type": [None, "ASDS"],
-                "landpad": [None, "5e9e3032383ecb6bb234e7ca"],
-                "legs": [False, True],
-                "reused": [False, True],
-            }
-        )
-        for col in ["gridfins", "landing_attempt", "landing_success", "legs", "reused"]:
-            data[col] = data[col].astype("boolean")
-        CoresFlightsSchema.to_schema().validate(data)
-        return data
+def bronze_table(bronze_df: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(bronze_df, preserve_index=False)
+
 
+@pytest.fixture
+def cores_flights_data() -> pd.DataFrame:
+    data = pd.DataFrame(
+        {
+            "id": ["failure_case", "success_case"],
+            "create_date": utc_timestamps([FROZEN_CREATE_DATE] * 2),
+            "provider_code": SPACEX_PROVIDER_CODE,
+            "core": ["5e9e289df35918033d3b2623", "5f57c54a0622a633027900a1"],
+            "flight": [1, 7],
+            "gridfins": [False, True],
+            "landing_attempt": [False, True],
+            "landing_success": [None, True],
+            "landing_type": [None, "ASDS"],
+            "landpad": [None, "5e9e3032383ecb6bb234e7ca"],
+            "legs": [False, True],
+            "reused": [False, True],
+        }
+    )
+    for col in ["gridfins", "landing_attempt", "landing_success", "legs", "reused"]:
+        data[col] = data[col].astype("boolean")
+    data["launch_key"] = pd.array([0, 1], dtype="Int32")
+    data["core_key"] = pd.array([0, 1], dtype="Int32")
+    data["landpad_key"] = pd.array([None, 0], dtype="Int32")
+    CoresFlightsSchema.to_schema().validate(data)
+    return data
+
+
+class TestSpaceXCores:
     @freeze_time(FROZEN_CREATE_DATE)
     def test_spacex_cores_creates_cores_flight_data(
         self, bronzified_data, cores_flights_data, tmp_path
     ):
-        with patch(
-            "spacex_data_platform.ingestion.silver.cores_data.pd.read_parquet"
-        ) as read_parquet_mock:
-            read_parquet_mock.return_value = bronzified_data
-            expected_path = f"{tmp_path}/silver/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/cores_flight.parquet"
-            result_path = SpaceXCores.run(
-                f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet"
-            )
+        expected_path = f"{tmp_path}/silver/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/cores_flight.parquet"
+        result_path = SpaceXCores.run(
+            f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet",
+            bronze=bronze_table(bronzified_data),
+        )
         assert expected_path == result_path
 
         result = pd.read_parquet(result_path)
         pd.testing.assert_frame_equal(result, cores_flights_data)
 
+    @freeze_time(FROZEN_CREATE_DATE)
+    def test_spacex_cores_merges_the_changed_launches_into_the_previous_data(
+        self, bronzified_data, cores_flights_data, tmp_path
+    ):
+        previous_data = pd.concat(
+            [
+                cores_flights_data.assign(flight=[1, 6]),
+                cores_flights_data.iloc[[0]].assign(id="deleted_case"),
+            ],
+            ignore_index=True,
+        )
+        previous_path = f"{tmp_path}/silver/previous/cores_flight.parquet"
+        os.makedirs(os.path.dirname(previous_path))
+        previous_data.to_parquet(previous_path)
+        bronze_path = f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet"
+        os.makedirs(os.path.dirname(bronze_path))
+        bronzified_data.iloc[[1]].drop(columns=["links"]).to_parquet(bronze_path)
+        pd.DataFrame(
+            {"id": ["success_case", "deleted_case"], "operation": ["update", "delete"]}
+        ).to_parquet(changes_path(bronze_path))
+
+        id_dictionary_path = (
+            IdDictionary()
+            .update(bronzified_data)
+            .write(f"{tmp_path}/ids/id_dictionary.parquet")
+        )
+
+        result_path = SpaceXCores.run(
+            bronze_path,
+            previous_data_path=previous_path,
+            id_dictionary_path=id_dictionary_path,
+        )
+
+        result = pd.read_parquet(result_path)
+        pd.testing.assert_frame_equal(result, cores_flights_data)
+        # The full and incremental runs write the same columns, without the index
+        full_path = SpaceXCores.run(
+            f"{tmp_path}/full/bronze/2024_05_09__17_05_33/spacex_data.parquet",
+            bronze=bronze_table(bronzified_data),
+        )
+        assert (
+            pq.read_schema(result_path).remove_metadata()
+            == pq.read_schema(full_path).remove_metadata()
+        )
+        assert "__index_level_0__" not in pq.read_schema(full_path).names
+
+    def test_explode_structs_matches_explode_and_apply_series(self):
+        df = pd.DataFrame(
+            {
+                "id": ["heavy", "no_cores", "single", "null_cores"],
+                "cores": [
+                    [{"core": "a", "flight": 1}, {"core": None, "flight": None}],
+                    [],
+                    [{"core": "b", "flight": 3}],
+                    None,
+                ],
+            },
+            index=[10, 20, 30, 40],
+        )
+
+        result = explode_structs(df, "cores")
+
+        exploded = df.explode("cores").dropna(subset=["cores"])
+        expected = pd.concat(
+            [exploded.drop(columns="cores"), exploded["cores"].apply(pd.Series)], axis=1
+        )
+        assert result.index.tolist() == [10, 10, 30]
+        pd.testing.assert_frame_equal(
+            result.astype(object).where(result.notna(), None),
+            expected.astype(object).where(expected.notna(), None),
+        )
+
+    def test_read_bronze_projects_the_columns_of_the_etl(self, tmp_path):
+        bronze = pa.table({"id": ["a", "b"], "cores": [[], []], "details": ["x", "y"]})
+        bronze_path = f"{tmp_path}/spacex_data.parquet"
+        pq.write_table(bronze, bronze_path)
+
+        from_file = read_bronze(bronze_path, ["id", "cores"], [("id", "=", "b")])
+        from_shared = read_bronze(
+            "unused.parquet", ["id", "cores"], [("id", "=", "b")], bronze
+        )
+
+        assert from_file.equals(from_shared)
+        assert from_file.to_pydict() == {"id": ["b"], "cores": [[]]}
+
 
 class TestSpaceXFires:
     @pytest.fixture
@@ -219,7 +330,7 @@ class TestSpaceXFires:
             {
                 "id": ["failure_case", "success_case"],
                 "provider_code": SPACEX_PROVIDER_CODE,
-                "create_date": datetime.now().strftime(DATE_FORMAT),
+                "create_date": utc_timestamps([FROZEN_CREATE_DATE] * 2),
                 "recovered": [False, True],
                 "recovery_attempt": [False, True],
                 "reused": [False, True],
@@ -227,10 +338,9 @@ class TestSpaceXFires:
                     [],
                     ["5ea6ed2e080df4000697c909", "5ea6ed2f080df4000697c90c"],
                 ],
-                "static_fire_date_utc": [
-                    "2020-03-13T18:37:00.000Z",
-                    "2020-07-11T17:58:00.000Z",
-                ],
+                "static_fire_date_utc": utc_timestamps(
+                    ["2020-03-13T18:37:00.000Z", "2020-07-11T17:58:00.000Z"]
+                ),
                 "net": False,
                 "window": 0,
                 "rocket": "5e9d0d95eda69973a809d1ec",
@@ -261,19 +371,25 @@ class TestSpaceXFires:
                     "Failure Case",
                     "Success Case",
                 ],
-                "date_utc": [
-                    "2020-11-25T02:13:00.000Z",
-                    "2020-11-25T02:13:00.000Z",
-                ],
-                "date_local": [
-                    "2020-11-24T21:13:00-05:00",
-                    "2020-11-24T21:13:00-05:00",
-                ],
+                "date_utc": utc_timestamps(
+                    ["2020-11-25T02:13:00.000Z", "2020-11-25T02:13:00.000Z"]
+                ),
+                "date_local": utc_timestamps(
+                    ["2020-11-25T02:13:00.000Z", "2020-11-25T02:13:00.000Z"]
+                ),
+                "date_local_offset": pd.array([-300, -300], dtype="Int16"),
                 "date_precision": "hour",
                 "upcoming": False,
                 "auto_update": True,
                 "tbd": False,
                 "launch_library_id": None,
+                "launch_key": [0, 1],
+                "rocket_key": 0,
+                "launchpad_key": [0, 1],
+                "recovery_ship_keys": [[], [1, 2]],
+                "ship_keys": [[], [0]],
+                "capsule_keys": [[], [0]],
+                "payload_keys": [[0], [1]],
             }
         )
         for col in [
@@ -288,6 +404,8 @@ class TestSpaceXFires:
             data[col] = data[col].astype("boolean")
         for col in ["window", "success"]:
             data[col] = data[col].astype("Int64")
+        for col in ["launch_key", "rocket_key", "launchpad_key"]:
+            data[col] = data[col].astype("Int32")
         FairingsSchema.to_schema().validate(data)
         return data
 
@@ -295,15 +413,323 @@ class TestSpaceXFires:
     def test_spacex_fairings_creates_fairings_data(
         self, bronzified_data, fairings_data, tmp_path
     ):
-        with patch(
-            "spacex_data_platform.ingestion.silver.cores_data.pd.read_parquet"
-        ) as read_parquet_mock:
-            read_parquet_mock.return_value = bronzified_data
-            expected_path = f"{tmp_path}/silver/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/fairings.parquet"
-            result_path = SpaceXFairings.run(
-                f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet"
-            )
+        expected_path = f"{tmp_path}/silver/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/fairings.parquet"
+        result_path = SpaceXFairings.run(
+            f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet",
+            bronze=bronze_table(bronzified_data),
+        )
         assert expected_path == result_path
 
         result = pd.read_parquet(result_path)
         pd.testing.assert_frame_equal(result, fairings_data)
+
+    @freeze_time(FROZEN_CREATE_DATE)
+    def test_spacex_fairings_stores_the_fairings_partitioned_by_launch_month(
+        self, bronzified_data, fairings_data, tmp_path
+    ):
+        bronze_path = f"{tmp_path}/bronze/{datetime.now().strftime('%Y_%m_%d__%H_%M_%S')}/spacex_data.parquet"
+        result_path = SpaceXFairings.run(
+            bronze_path, partitioned=True, bronze=bronze_table(bronzified_data)
+        )
+        assert result_path == bronze_path.replace("bronze", "silver").replace(
+            "spacex_data.parquet", "fairings"
+        )
+        assert os.listdir(result_path) == ["year=2020"]
+
+        result = pd.read_parquet(
+            result_path, filters=[("year", "=", 2020), ("month", "=", 11)]
+        )
+        assert result["id"].tolist() == fairings_data["id"].tolist()
+        assert pd.read_parquet(result_path, filters=[("month", "=", 1)]).empty
+
+    def test_split_local_dates_keeps_the_original_offsets(self):
+        dates = pd.Series(
+            ["2020-11-24T21:13:00-05:00", "2021-01-20T07:00:00+05:30"], index=[3, 7]
+        )
+
+        timestamps, offsets = split_local_dates(dates)
+
+        pd.testing.assert_series_equal(
+            timestamps,
+            utc_timestamps(["2020-11-25T02:13:00Z", "2021-01-20T01:30:00Z"]).set_axis(
+                [3, 7]
+            ),
+        )
+        assert offsets.tolist() == [-300, 330]
+        assert str(offsets.dtype) == "Int16"
+
+
+def core_launches_table(launches: dict[str, tuple]) -> pa.Table:
+    return pa.Table.from_pylist(
+        [
+            {
+                "id": id,
+                "date_utc": pd.Timestamp(date),
+                "cores": [{"core": core, "flight": flight} for core, flight in cores],
+            }
+            for id, (date, cores) in launches.items()
+        ],
+        schema=pa.schema(
+            [BRONZE_SCHEMA.field(name) for name in ["id", "date_utc", "cores"]]
+        ),
+    )
+
+
+class TestSpaceXCoreTimelines:
+    @pytest.fixture
+    def launches(self) -> dict[str, tuple]:
+        return {
+            "a": ("2020-01-10T00:00:00Z", [("core1", 1)]),
+            "b": ("2020-01-30T00:00:00Z", [("core2", 1), ("core3", 1)]),
+            "c": ("2020-03-05T00:00:00Z", [("core1", 2)]),
+            "d": ("2020-03-06T00:00:00Z", []),
+        }
+
+    def test_spacex_core_timelines_adds_the_previous_launch_of_every_core(
+        self, launches, tmp_path
+    ):
+        result_path = SpaceXCoreTimelines.run(
+            f"{tmp_path}/bronze/2024_05_09__17_05_33/spacex_data.parquet",
+            bronze=core_launches_table(launches),
+        )
+
+        assert (
+            result_path
+            == f"{tmp_path}/silver/2024_05_09__17_05_33/core_timelines.parquet"
+        )
+        result = pd.read_parquet(result_path)
+        assert result[["core", "id", "flight", "previous_id"]].values.tolist() == [
+            ["core1", "a", 1, None],
+            ["core1", "c", 2, "a"],
+            ["core2", "b", 1, None],
+            ["core3", "b", 1, None],
+        ]
+        assert result["core_key"].tolist() == [0, 0, 1, 2]
+        assert result["previous_date_utc"].tolist()[1] == pd.Timestamp(
+            "2020-01-10T00:00:00Z"
+        )
+        assert result["gap_days"].tolist()[1] == 55
+        assert result["gap_days"].isna().tolist() == [True, False, True, True]
+
+    def test_spacex_core_timelines_updates_the_neighbours_of_the_changed_launches(
+        self, launches, tmp_path
+    ):
+        previous_path = SpaceXCoreTimelines.run(
+            f"{tmp_path}/bronze/2024_05_09__17_05_33/spacex_data.parquet",
+            bronze=core_launches_table(launches),
+        )
+        launches["c"] = ("2020-03-05T00:00:00Z", [("core1", 3)])
+        launches["e"] = ("2020-02-04T00:00:00Z", [("core1", 2)])
+        bronze_path = f"{tmp_path}/bronze/2024_05_10__17_05_33/spacex_data.parquet"
+        os.makedirs(os.path.dirname(bronze_path))
+        pq.write_table(
+            core_launches_table({id: launches[id] for id in ["c", "e"]}), bronze_path
+        )
+        pd.DataFrame({"id": ["c", "e"], "operation": ["update", "insert"]}).to_parquet(
+            changes_path(bronze_path)
+        )
+        id_dictionary_path = (
+            IdDictionary()
+            .update(core_launches_table(launches).to_pandas(types_mapper=pd.ArrowDtype))
+            .write(f"{tmp_path}/ids/id_dictionary.parquet")
+        )
+
+        result_path = SpaceXCoreTimelines.run(
+            bronze_path,
+            previous_data_path=previous_path,
+            id_dictionary_path=id_dictionary_path,
+        )
+
+        result = pd.read_parquet(result_path)
+        assert result[["core", "id", "flight", "previous_id"]].values.tolist() == [
+            ["core1", "a", 1, None],
+            ["core1", "e", 2, "a"],
+            ["core1", "c", 3, "e"],
+            ["core2", "b", 1, None],
+            ["core3", "b", 1, None],
+        ]
+        assert result["gap_days"].tolist()[1:3] == [25, 30]
+
+
+class TestIdDictionary:
+    def test_id_dictionary_keeps_the_keys_across_snapshots(self, tmp_path):
+        path = f"{tmp_path}/ids/id_dictionary.parquet"
+        IdDictionary().update(
+            pd.DataFrame({"id": ["a", "b"], "ships": [["s1"], None]})
+        ).write(path)
+
+        dictionary = IdDictionary.read(path).update(
+            pd.DataFrame({"id": ["c", "a"], "ships": [["s2", "s1"], []]})
+        )
+
+        assert dictionary.keys(
+            "launch", pa.array(["a", "b", "c", None])
+        ).to_pylist() == [
+            0,
+            1,
+            2,
+            None,
+        ]
+        assert dictionary.keys("ship", pa.array(["s1", "s2"])).to_pylist() == [0, 1]
+        with pytest.raises(KeyError):
+            dictionary.keys("launch", pa.array(["unknown"]))
+
+    def test_id_dictionary_adds_the_keys_of_the_id_columns(self):
+        df = pd.DataFrame(
+            {
+                "id": ["a", "b", "c"],
+                "cores": [
+                    [{"core": "c1", "landpad": None}],
+                    [{"core": "c2", "landpad": "l1"}, {"core": "c1", "landpad": "l1"}],
+                    [],
+                ],
+                "payloads": [["p1", "p2"], None, ["p2"]],
+            },
+            index=[10, 20, 30],
+        )
+        dictionary = IdDictionary().update(df)
+
+        result = dictionary.add_keys(
+            explode_structs(df, "cores"),
+            {"core_key": ("core", "core"), "payload_keys": ("payloads", "payload")},
+        )
+
+        assert result.index.tolist() == [10, 20, 20]
+        assert result["core_key"].tolist() == [0, 1, 0]
+        assert str(result["core_key"].dtype) == "Int32"
+        assert [
+            None if keys is None else keys.tolist() for keys in result["payload_keys"]
+        ] == [[0, 1], None, None]
+        assert dictionary.keys("landpad", pa.array(["l1"])).to_pylist() == [0]
+
+
+class TestValidator:
+    def test_validator_times_the_schema_and_every_check(self, cores_flights_data):
+        validator = Validator(CoresFlightsSchema)
+
+        validated = validator.validate(cores_flights_data.astype({"flight": str}))
+
+        assert validated["flight"].tolist() == [1, 7]
+        assert set(validator.timings) == {
+            "schema",
+            "primary_key",
+            "if_landing_success_landpad_and_landing_type_are_filled",
+            "if_core_is_reused_flight_bigger_than_one",
+        }
+
+    def test_validator_raises_the_failing_check(self, cores_flights_data):
+        with pytest.raises(pandera.errors.SchemaError) as error:
+            Validator(CoresFlightsSchema).validate(cores_flights_data.assign(flight=1))
+
+        assert error.value.check.name == "if_core_is_reused_flight_bigger_than_one"
+
+    def test_validator_checks_only_a_sample_of_the_rows(self, cores_flights_data):
+        data = pd.concat([cores_flights_data] * 5, ignore_index=True).assign(
+            id=[f"launch_{number}" for number in range(10)]
+        )
+        validator = Validator(CoresFlightsSchema, mode="sample", sample=0.3)
+
+        validated = validator.validate(data)
+
+        assert len(validated) == 10
+        assert "coercion" in validator.timings
+        with pytest.raises(ValueError):
+            validator.configure(mode="sample")
+        with pytest.raises(ValueError):
+            validator.configure(mode="lazy")
+
+    def test_validator_skips_the_data_already_validated(
+        self, cores_flights_data, tmp_path
+    ):
+        Validator(CoresFlightsSchema, mode="skip", state_dir=tmp_path).validate(
+            cores_flights_data
+        )
+        validator = Validator(CoresFlightsSchema, mode="skip", state_dir=tmp_path)
+
+        validated = validator.validate(cores_flights_data)
+
+        pd.testing.assert_frame_equal(validated, cores_flights_data)
+        assert validator.timings == {}
+        validator.validate(cores_flights_data.assign(flight=[2, 7]))
+        assert "primary_key" in validator.timings
+
+    def test_validator_validates_with_the_settings_of_every_validation(
+        self, cores_flights_data, tmp_path
+    ):
+        validator = Validator(CoresFlightsSchema)
+        settings = ValidationSettings("skip", state_dir=tmp_path)
+
+        validator.validate(cores_flights_data, settings)
+        validator.validate(cores_flights_data, settings)
+
+        assert validator.timings == {}
+        assert os.path.exists(f"{tmp_path}/CoresFlightsSchema.json")
+        assert validator.settings.mode == "full"
+        validator.validate(cores_flights_data)
+        assert "primary_key" in validator.timings
+
+    def test_validator_reports_the_failures_of_all_the_chunks_and_global_checks(
+        self, cores_flights_data
+    ):
+        data = pd.concat([cores_flights_data] * 3).set_axis([10, 11, 12, 13, 14, 15])
+        data["id"] = ["a", "b", "c", "d", "a", "e"]
+        data["core"] = data["core"].where(data.index != 13, None)
+        data.loc[11, "flight"] = 1
+        data.loc[14, "core"] = data.loc[10, "core"]
+        validator = Validator(
+            CoresFlightsSchema,
+            global_checks=["primary_key"],
+            chunk_size=2,
+            max_workers=2,
+        )
+
+        with pytest.raises(ValidationErrors) as error:
+            validator.validate(data)
+
+        failures = error.value.failure_cases.drop_duplicates(["check", "index"])
+        assert sorted(zip(failures["check"], failures["index"])) == [
+            ("if_core_is_reused_flight_bigger_than_one", 11),
+            ("not_nullable", 13),
+            ("primary_key", 14),
+        ]
+
+    def test_validator_reports_the_failing_rows_of_a_duplicated_index(
+        self, cores_flights_data
+    ):
+        # The exploded cores of a launch share its index
+        data = pd.concat([cores_flights_data] * 2).set_axis([0, 0, 1, 1])
+        data["id"] = ["a", "a", "b", "b"]
+        data["core"] = ["core1", "core2", "core1", "core2"]
+        data["flight"] = 1
+        validator = Validator(
+            CoresFlightsSchema, global_checks=["primary_key"], chunk_size=2
+        )
+
+        with pytest.raises(ValidationErrors) as error:
+            validator.validate(data)
+
+        failures = error.value.failure_cases.drop_duplicates(["check", "row"])
+        assert sorted(zip(failures["check"], failures["row"], failures["index"])) == [
+            ("if_core_is_reused_flight_bigger_than_one", 1, 0),
+            ("if_core_is_reused_flight_bigger_than_one", 3, 1),
+        ]
+        assert error.value.error_counts == {
+            "if_core_is_reused_flight_bigger_than_one": 2
+        }
+
+    def test_validator_validates_the_chunks_as_the_whole_data(self, cores_flights_data):
+        data = pd.concat([cores_flights_data] * 3, ignore_index=True)
+        data["id"] = [f"launch_{number}" for number in range(6)]
+        validator = Validator(
+            CoresFlightsSchema,
+            global_checks=["primary_key"],
+            chunk_size=4,
+            max_workers=2,
+        )
+
+        validated = validator.validate(data.astype({"flight": str}))
+
+        pd.testing.assert_frame_equal(
+            validated, Validator(CoresFlightsSchema).validate(data)
+        )
+        assert "primary_key" in validator.timings
@@ -0,0 +1,50 @@
+import threading
+
+from spacex_data_platform.orchestration.background import PipelineRunner
+
+
+class TestPipelineRunner:
+    def test_pipeline_runner_runs_a_single_job_at_a_time(self):
+        release = threading.Event()
+        runs = []
+
+        def run(progress):
+            runs.append(len(runs))
+            progress("raw", "running")
+            release.wait(5)
+            progress("raw", "done")
+            return {"raw": "raw.json"}
+
+        runner = PipelineRunner(run)
+
+        job, started = runner.start()
+        same_job, started_again = runner.start()
+
+        assert started and not started_again
+        assert same_job is job
+        assert runner.running
+        release.set()
+        assert job.wait(5)
+        assert not runner.running
+        assert runs == [0]
+        assert job.progress() == {"raw": "done"}
+        assert job.outputs == {"raw": "raw.json"}
+        new_job, started = runner.start()
+        assert started and new_job is not job
+        assert new_job.wait(5)
+        assert runs == [0, 1]
+
+    def test_pipeline_runner_keeps_the_error_of_a_failed_job(self):
+        def run(progress):
+            progress("bronze", "failed")
+            raise ValueError("invalid bronze")
+
+        runner = PipelineRunner(run)
+
+        job, _ = runner.start()
+
+        assert job.wait(5)
+        assert isinstance(job.error, ValueError)
+        assert job.outputs is None
+        assert job.progress() == {"bronze": "failed"}
+        assert runner.job is job
@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+
+from spacex_data_platform.ingestion.gold.gold_data import GOLD_TABLES, SpaceXGold
+from spacex_data_platform.ingestion.raw.raw_file import link_or_copy
+from spacex_data_platform.orchestration.catalog import SnapshotCatalog
+from tests.ingestion.test_gold import write_silver
+
+LAUNCHES = {
+    "a": ("2020-01-10T00:00:00Z", [("core1", 1)]),
+    "b": ("2020-01-30T00:00:00Z", [("core2", 1), ("core3", 1)]),
+    "c": ("2020-03-05T00:00:00Z", [("core1", 2)]),
+}
+
+
+def snapshot_outputs(tmp_path, snapshot: str) -> dict[str, str]:
+    timelines_path = write_silver(tmp_path, snapshot, LAUNCHES)
+    fairings_path = timelines_path.replace("core_timelines", "fairings")
+    return {
+        "space_x_core_timelines": timelines_path,
+        "space_x_fairings": fairings_path,
+        "gold": SpaceXGold.run(timelines_path, fairings_path),
+    }
+
+
+class TestSnapshotCatalog:
+    def test_snapshot_catalog_records_the_metadata_of_the_tables(self, tmp_path):
+        outputs = snapshot_outputs(tmp_path, "2024_05_09__17_05_33")
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+
+        snapshot = catalog.record(outputs, complete=True)
+
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+        assert snapshot == "2024_05_09__17_05_33"
+        assert catalog.snapshot_ids() == [snapshot]
+        assert catalog.latest_complete == snapshot
+        assert sorted(catalog.snapshots[snapshot]["tables"]) == sorted(
+            ["silver.core_timelines", "silver.fairings"]
+            + [f"gold.{name}" for name in GOLD_TABLES]
+        )
+        fairings = catalog.table(snapshot, "silver.fairings")
+        assert fairings["path"] == outputs["space_x_fairings"]
+        assert fairings["rows"] == 3
+        assert fairings["bytes"] == os.path.getsize(outputs["space_x_fairings"])
+        assert fairings["columns"]["id"] == {"min": "a", "max": "c"}
+        assert fairings["columns"]["date_utc"]["max"].startswith("2020-03-05")
+        timelines = catalog.table(snapshot, "gold.core_timelines")
+        assert timelines["rows"] == len(
+            pd.read_parquet(f"{outputs['gold']}/core_timelines.parquet")
+        )
+        assert timelines["columns"]["gap_days"] == {"min": 55.0, "max": 55.0}
+
+    def test_snapshot_catalog_offers_only_the_complete_snapshots(self, tmp_path):
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+        first = snapshot_outputs(tmp_path, "2024_05_09__17_05_33")
+        catalog.record(first, complete=True)
+        linked = {
+            name: output.replace("2024_05_09__17_05_33", "2024_05_10__17_05_33")
+            for name, output in first.items()
+        }
+        for name, output in first.items():
+            os.makedirs(os.path.dirname(linked[name]), exist_ok=True)
+            link_or_copy(output, linked[name])
+        del linked["gold"]
+
+        catalog.record(linked, complete=False)
+
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+        assert catalog.snapshot_ids() == ["2024_05_09__17_05_33"]
+        assert catalog.snapshot_ids(complete_only=False) == [
+            "2024_05_10__17_05_33",
+            "2024_05_09__17_05_33",
+        ]
+        assert catalog.latest_complete == "2024_05_09__17_05_33"
+        assert catalog.snapshots["2024_05_10__17_05_33"]["status"] == "partial"
+        first_fairings = catalog.table("2024_05_09__17_05_33", "silver.fairings")
+        linked_fairings = catalog.table("2024_05_10__17_05_33", "silver.fairings")
+        assert linked_fairings["path"] == linked["space_x_fairings"]
+        assert linked_fairings["hash"] == first_fairings["hash"]
+        assert catalog.snapshot_hash("2024_05_09__17_05_33") != catalog.snapshot_hash(
+            "2024_05_10__17_05_33"
+        )
+        assert catalog.snapshot_hash("2024_05_11__17_05_33") is None
+        assert catalog.table("2024_05_10__17_05_33", "gold.core_usage") is None
+
+    def test_snapshot_catalog_backfills_the_snapshots_written_before_it(self, tmp_path):
+        first = snapshot_outputs(tmp_path, "2024_05_09__17_05_33")
+        second = snapshot_outputs(tmp_path, "2024_05_10__17_05_33")
+        os.makedirs(f"{tmp_path}/silver/2024_05_10__17_05_33/fairings.part")
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+        catalog.record(first, complete=False)
+
+        assert catalog.snapshot_ids() == []
+        assert catalog.backfill() == ["2024_05_10__17_05_33"]
+
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+        assert catalog.snapshot_ids() == ["2024_05_10__17_05_33"]
+        assert catalog.latest_complete == "2024_05_10__17_05_33"
+        assert sorted(catalog.snapshots["2024_05_10__17_05_33"]["tables"]) == sorted(
+            ["silver.core_timelines", "silver.fairings"]
+            + [f"gold.{name}" for name in GOLD_TABLES]
+        )
+        assert (
+            catalog.table("2024_05_10__17_05_33", "silver.fairings")["path"]
+            == second["space_x_fairings"]
+        )
+        assert catalog.backfill() == []
+        os.remove(f"{tmp_path}/catalog.json")
+        assert SnapshotCatalog(f"{tmp_path}/catalog.json").backfill() == [
+            "2024_05_09__17_05_33",
+            "2024_05_10__17_05_33",
+        ]
+
+    def test_snapshot_catalog_backfills_the_gold_tables_linked_in_part_as_partial(
+        self, tmp_path
+    ):
+        outputs = snapshot_outputs(tmp_path, "2024_05_10__17_05_33")
+        os.remove(os.path.join(outputs["gold"], f"{GOLD_TABLES[-1]}.parquet"))
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+
+        assert catalog.backfill() == ["2024_05_10__17_05_33"]
+
+        catalog = SnapshotCatalog(f"{tmp_path}/catalog.json")
+        assert catalog.snapshot_ids() == []
+        assert catalog.latest_complete is None
+        assert catalog.snapshots["2024_05_10__17_05_33"]["status"] == "partial"
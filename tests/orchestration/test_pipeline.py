@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+from spacex_data_platform import pipeline
+from spacex_data_platform.ingestion.silver.cores_data import SpaceXCores
+from spacex_data_platform.orchestration.tasks import SilverTask
+
+
+class TestPipeline:
+    def test_importing_the_main_module_does_not_run_the_pipeline(self, tmp_path):
+        subprocess.run(
+            [sys.executable, "-c", "import spacex_data_platform.__main__"],
+            cwd=tmp_path,
+            env={**os.environ, "PYTHONPATH": os.getcwd()},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert not os.path.exists(f"{tmp_path}/data")
+
+    def test_main_runs_the_pipeline_with_the_command_line_options(self, monkeypatch):
+        runs = []
+
+        class FakeMain:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+            def run(self):
+                runs.append(self.kwargs)
+
+        monkeypatch.setattr(pipeline, "Main", FakeMain)
+
+        pipeline.main(
+            ["--incremental", "--max-workers", "2", "--validation", "sample"]
+            + ["--validation-sample", "0.1", "--incremental-fetch"]
+            + ["--fetch-page-size", "50"]
+        )
+
+        assert runs == [
+            {
+                "partitioned": False,
+                "incremental": True,
+                "incremental_fetch": True,
+                "fetch_page_size": 50,
+                "max_workers": 2,
+                "mode": "thread",
+                "validation": "sample",
+                "validation_sample": 0.1,
+            }
+        ]
+
+    def test_every_main_validates_with_its_own_settings(self):
+        sampled = pipeline.Main(validation="sample", validation_sample=0.1)
+        pipeline.Main(mode="process")
+
+        settings = {
+            task.name: task.validation
+            for task in sampled._graph.tasks
+            if isinstance(task, SilverTask)
+        }
+        assert len(settings) == 3
+        assert all(
+            validation.mode == "sample" and validation.sample == 0.1
+            for validation in settings.values()
+        )
+        assert SpaceXCores.validator.settings.mode == "full"
+        raw = sampled._graph.tasks[0].raw
+        assert not raw.incremental
+        assert pipeline.Main(incremental_fetch=True)._graph.tasks[0].raw.incremental
+
+    def test_main_rebuilds_the_catalog_without_running_the_pipeline(self, monkeypatch):
+        backfills = []
+
+        class FakeCatalog:
+            def backfill(self):
+                backfills.append(True)
+                return ["2024_05_09__17_05_33"]
+
+        monkeypatch.setattr(pipeline, "SnapshotCatalog", FakeCatalog)
+        monkeypatch.setattr(pipeline, "Main", None)
+
+        pipeline.main(["--rebuild-catalog"])
+
+        assert backfills == [True]
@@ -0,0 +1,506 @@
+import os
+import time
+
+import pandas as pd
+import pandera
+import pytest
+from pandera.typing import Series
+
+from benchmarks.bronze_streaming import write_synthetic_launches
+from spacex_data_platform.ingestion.bronze.bronze_data import SpaceXBronze
+from spacex_data_platform.ingestion.gold.gold_data import SpaceXGold
+from spacex_data_platform.ingestion.silver.core_timelines_data import (
+    SpaceXCoreTimelines,
+)
+from spacex_data_platform.ingestion.silver.cores_data import SpaceXCores
+from spacex_data_platform.ingestion.silver.fairings_data import SpaceXFairings
+from spacex_data_platform.ingestion.silver.schemas.cores_flights import (
+    CoresFlightsSchema,
+)
+from spacex_data_platform.ingestion.silver.validation import ValidationSettings
+from spacex_data_platform.orchestration.task_graph import (
+    PipelineError,
+    Task,
+    TaskGraph,
+)
+from spacex_data_platform.orchestration.task_state import TaskState, link_output
+from spacex_data_platform.orchestration.tasks import (
+    BronzeTask,
+    GoldTask,
+    IdsTask,
+    SharedBronze,
+    SilverTask,
+)
+
+
+class SourceTask(Task):
+    def __init__(self, name: str, output: str | None, checksum: str = "checksum"):
+        super().__init__(name)
+        self.output = output
+        self.checksum = checksum
+
+    def output_fingerprint(self, output: str) -> str | None:
+        return self.checksum
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str | None:
+        return self.output
+
+
+class FileTask(Task):
+    def __init__(
+        self,
+        name: str,
+        inputs: list[str],
+        runs: list[tuple[str, str | None]] | None = None,
+        task_version: str = "1",
+        sleep: float = 0.0,
+        error: Exception | None = None,
+        barrier: tuple[str, int] | None = None,
+    ):
+        super().__init__(name, inputs)
+        self.runs = runs
+        self.task_version = task_version
+        self.sleep = sleep
+        self.error = error
+        self.barrier = barrier
+
+    def version(self) -> str:
+        return self.task_version
+
+    def run(self, inputs: dict[str, str], previous_output: str | None) -> str:
+        if self.runs is not None:
+            self.runs.append((self.name, previous_output))
+        time.sleep(self.sleep)
+        if self.barrier is not None:
+            # Every task waits for the others to start, so they only finish if they
+            # run at the same time, in threads or processes
+            barrier_dir, parties = self.barrier
+            open(os.path.join(barrier_dir, self.name), "w").close()
+            deadline = time.monotonic() + 10
+            while len(os.listdir(barrier_dir)) < parties:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{self.name} did not run with the others")
+                time.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        input_path = inputs[self.inputs[0]]
+        snapshot_path = os.path.dirname(input_path)
+        data_path = os.path.join(
+            os.path.dirname(os.path.dirname(snapshot_path)),
+            self.name,
+            os.path.basename(snapshot_path),
+            f"{self.name}.txt",
+        )
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        with open(data_path, "w") as file:
+            file.write(self.name)
+        return data_path
+
+
+def raw_file(tmp_path, snapshot: str) -> str:
+    raw_data_path = f"{tmp_path}/raw/{snapshot}/spacex_data.json"
+    os.makedirs(os.path.dirname(raw_data_path), exist_ok=True)
+    with open(raw_data_path, "w") as file:
+        file.write("[]")
+    return raw_data_path
+
+
+def pipeline(
+    raw_data_path: str | None,
+    runs: list[tuple[str, str | None]],
+    checksum: str = "checksum",
+    versions: dict[str, str] | None = None,
+) -> list[Task]:
+    versions = versions or {}
+    return [
+        SourceTask("raw", raw_data_path, checksum),
+        FileTask("bronze", ["raw"], runs, versions.get("bronze", "1")),
+        FileTask("cores", ["bronze"], runs, versions.get("cores", "1")),
+        FileTask("fairings", ["bronze"], runs, versions.get("fairings", "1")),
+    ]
+
+
+class CoresFlightsSchemaWithoutLegs(CoresFlightsSchema):
+    legs: Series[pd.BooleanDtype] = pandera.Field(nullable=True, coerce=True)
+
+
+class TestTaskGraph:
+    def test_task_graph_skips_the_tasks_that_are_up_to_date(self, tmp_path):
+        state = TaskState(f"{tmp_path}/state.json")
+        runs: list[tuple[str, str | None]] = []
+        first_outputs = TaskGraph(
+            pipeline(raw_file(tmp_path, "2024_05_09__17_05_33"), runs), state
+        ).run()
+
+        outputs = TaskGraph(
+            pipeline(raw_file(tmp_path, "2024_05_10__17_05_33"), runs),
+            TaskState(f"{tmp_path}/state.json"),
+        ).run()
+
+        assert sorted(runs) == [("bronze", None), ("cores", None), ("fairings", None)]
+        assert outputs["cores"] == f"{tmp_path}/cores/2024_05_10__17_05_33/cores.txt"
+        for name in ["bronze", "cores", "fairings"]:
+            assert os.path.samefile(outputs[name], first_outputs[name])
+
+    def test_task_graph_reruns_only_the_new_versions_and_the_tasks_depending_on_them(
+        self, tmp_path
+    ):
+        state_path = f"{tmp_path}/state.json"
+        raw_data_path = raw_file(tmp_path, "2024_05_09__17_05_33")
+        TaskGraph(pipeline(raw_data_path, []), TaskState(state_path)).run()
+
+        cores_runs: list[tuple[str, str | None]] = []
+        TaskGraph(
+            pipeline(raw_data_path, cores_runs, versions={"cores": "2"}),
+            TaskState(state_path),
+        ).run()
+        bronze_runs: list[tuple[str, str | None]] = []
+        TaskGraph(
+            pipeline(
+                raw_data_path, bronze_runs, versions={"bronze": "2", "cores": "2"}
+            ),
+            TaskState(state_path),
+        ).run()
+
+        assert cores_runs == [("cores", None)]
+        assert sorted(bronze_runs) == [
+            ("bronze", None),
+            ("cores", None),
+            ("fairings", None),
+        ]
+
+    def test_task_graph_skips_the_tasks_depending_on_a_source_without_output(
+        self, tmp_path
+    ):
+        runs: list[tuple[str, str | None]] = []
+
+        outputs = TaskGraph(
+            pipeline(None, runs), TaskState(f"{tmp_path}/state.json")
+        ).run()
+
+        assert outputs == {}
+        assert runs == []
+
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_task_graph_runs_the_independent_tasks_in_parallel(self, mode, tmp_path):
+        raw_data_path = raw_file(tmp_path, "2024_05_09__17_05_33")
+        os.makedirs(f"{tmp_path}/barrier")
+        tasks = [SourceTask("raw", raw_data_path)] + [
+            FileTask(f"silver_{number}", ["raw"], barrier=(f"{tmp_path}/barrier", 3))
+            for number in range(3)
+        ]
+
+        outputs = TaskGraph(
+            tasks, TaskState(f"{tmp_path}/state.json"), max_workers=3, mode=mode
+        ).run()
+
+        assert sorted(os.listdir(f"{tmp_path}/barrier")) == [
+            "silver_0",
+            "silver_1",
+            "silver_2",
+        ]
+        assert (
+            outputs["silver_0"]
+            == f"{tmp_path}/silver_0/2024_05_09__17_05_33/silver_0.txt"
+        )
+
+    def test_task_graph_collects_the_failures_without_stopping_the_others(
+        self, tmp_path
+    ):
+        runs: list[tuple[str, str | None]] = []
+        tasks = [
+            SourceTask("raw", raw_file(tmp_path, "2024_05_09__17_05_33")),
+            FileTask("failing", ["raw"], runs, error=ValueError("invalid")),
+            FileTask("depending", ["failing"], runs),
+            FileTask("independent", ["raw"], runs, sleep=0.1),
+        ]
+
+        with pytest.raises(PipelineError) as error:
+            TaskGraph(tasks, TaskState(f"{tmp_path}/state.json")).run()
+
+        assert list(error.value.failures) == ["failing"]
+        assert sorted(runs) == [("failing", None), ("independent", None)]
+        assert os.path.exists(
+            f"{tmp_path}/independent/2024_05_09__17_05_33/independent.txt"
+        )
+
+    def test_task_graph_builds_on_the_last_run_only_when_running_incrementally(
+        self, tmp_path
+    ):
+        state_path = f"{tmp_path}/state.json"
+        first_outputs = TaskGraph(
+            pipeline(raw_file(tmp_path, "2024_05_09__17_05_33"), []),
+            TaskState(state_path),
+        ).run()
+
+        runs: list[tuple[str, str | None]] = []
+        raw_data_path = raw_file(tmp_path, "2024_05_10__17_05_33")
+        TaskGraph(
+            pipeline(raw_data_path, runs, "new_checksum"),
+            TaskState(state_path),
+            incremental=True,
+        ).run()
+        new_version_runs: list[tuple[str, str | None]] = []
+        TaskGraph(
+            pipeline(raw_data_path, new_version_runs, "new_checksum", {"cores": "2"}),
+            TaskState(state_path),
+            incremental=True,
+        ).run()
+
+        assert sorted(runs) == [
+            (name, first_outputs[name]) for name in ["bronze", "cores", "fairings"]
+        ]
+        assert sorted(new_version_runs) == [
+            ("bronze", None),
+            ("cores", None),
+            ("fairings", None),
+        ]
+
+    def test_task_graph_reports_the_progress_of_every_task(self, tmp_path):
+        statuses: list[tuple[str, str]] = []
+        tasks = [
+            *pipeline(raw_file(tmp_path, "2024_05_09__17_05_33"), []),
+            FileTask("gold", ["cores"]),
+        ]
+        tasks[2] = FileTask("cores", ["bronze"], error=ValueError("invalid cores"))
+
+        with pytest.raises(PipelineError) as error:
+            TaskGraph(
+                tasks,
+                TaskState(f"{tmp_path}/state.json"),
+                progress=lambda task, status: statuses.append((task, status)),
+            ).run()
+
+        assert sorted(error.value.outputs) == ["bronze", "fairings", "raw"]
+        assert statuses[:5] == [
+            ("raw", "pending"),
+            ("bronze", "pending"),
+            ("cores", "pending"),
+            ("fairings", "pending"),
+            ("gold", "pending"),
+        ]
+        final = dict(statuses)
+        assert final == {
+            "raw": "done",
+            "bronze": "done",
+            "cores": "failed",
+            "fairings": "done",
+            "gold": "skipped",
+        }
+        assert [status for task, status in statuses if task == "cores"] == [
+            "pending",
+            "running",
+            "failed",
+        ]
+
+    def test_task_graph_rejects_invalid_graphs(self):
+        with pytest.raises(ValueError):
+            TaskGraph([FileTask("bronze", ["raw"])])
+        with pytest.raises(ValueError):
+            TaskGraph(
+                [FileTask("cores", ["fairings"]), FileTask("fairings", ["cores"])]
+            )
+        with pytest.raises(ValueError):
+            TaskGraph([SourceTask("raw", None)], mode="cluster")
+
+    def test_task_graph_recomputes_only_the_cores_after_a_change_of_their_schema(
+        self, tmp_path, monkeypatch
+    ):
+        state_path = f"{tmp_path}/state.json"
+        first_snapshot = f"{tmp_path}/raw/2024_05_09__17_05_33/spacex_data.json"
+        write_synthetic_launches(first_snapshot, 3)
+        first_outputs = TaskGraph(
+            self.tasks(first_snapshot), TaskState(state_path)
+        ).run()
+
+        monkeypatch.setattr(SpaceXCores, "schema", CoresFlightsSchemaWithoutLegs)
+        second_snapshot = f"{tmp_path}/raw/2024_05_10__17_05_33/spacex_data.json"
+        write_synthetic_launches(second_snapshot, 3)
+        outputs = TaskGraph(self.tasks(second_snapshot), TaskState(state_path)).run()
+
+        assert os.path.samefile(outputs["bronze"], first_outputs["bronze"])
+        assert os.path.samefile(
+            outputs["space_x_fairings"], first_outputs["space_x_fairings"]
+        )
+        assert not os.path.samefile(
+            outputs["space_x_cores"], first_outputs["space_x_cores"]
+        )
+        assert len(pd.read_parquet(outputs["space_x_cores"])) == 3
+        assert os.path.exists(f"{tmp_path}/ids/id_dictionary.parquet")
+        assert os.path.samefile(
+            outputs["space_x_core_timelines"], first_outputs["space_x_core_timelines"]
+        )
+        assert not os.path.samefile(outputs["gold"], first_outputs["gold"])
+        assert len(pd.read_parquet(f"{outputs['gold']}/core_timelines.parquet")) == 3
+
+    def test_silver_task_version_depends_on_the_validation_mode(self):
+        def version(validation: ValidationSettings | None) -> str:
+            return SilverTask(
+                "cores", SpaceXCores, "bronze", validation=validation
+            ).version()
+
+        assert version(None) == version(ValidationSettings("full"))
+        assert version(ValidationSettings("sample", 10)) != version(None)
+        assert version(ValidationSettings("sample", 10)) != version(
+            ValidationSettings("sample", 0.5)
+        )
+
+    def test_task_graph_collects_the_data_quality_errors_of_the_silver_tasks(
+        self, tmp_path, monkeypatch
+    ):
+        raw_data_path = f"{tmp_path}/raw/2024_05_09__17_05_33/spacex_data.json"
+        write_synthetic_launches(raw_data_path, 3)
+        monkeypatch.setattr(
+            SpaceXCores,
+            "generate_cores_flight_data",
+            pandera.check_output(CoresFlightsSchema.to_schema())(
+                lambda df, id_dictionary, validation: pd.DataFrame(
+                    {"id": df["id"], "core": None}
+                )
+            ),
+        )
+
+        with pytest.raises(PipelineError) as error:
+            TaskGraph(
+                self.tasks(raw_data_path), TaskState(f"{tmp_path}/state.json")
+            ).run()
+
+        assert isinstance(
+            error.value.failures["space_x_cores"], pandera.errors.SchemaError
+        )
+        assert list(error.value.failures) == ["space_x_cores"]
+        assert os.path.exists(
+            f"{tmp_path}/silver/2024_05_09__17_05_33/fairings.parquet"
+        )
+
+    @staticmethod
+    def tasks(raw_data_path: str) -> list[Task]:
+        silver = {
+            "space_x_fairings": SpaceXFairings(),
+            "space_x_cores": SpaceXCores(),
+            "space_x_core_timelines": SpaceXCoreTimelines(),
+        }
+        shared_bronze = SharedBronze(
+            list(
+                dict.fromkeys(
+                    column
+                    for silver_data in silver.values()
+                    for column in silver_data.bronze_columns
+                )
+            )
+        )
+        return [
+            SourceTask("raw", raw_data_path),
+            BronzeTask("bronze", SpaceXBronze(), "raw"),
+            IdsTask("ids", "bronze"),
+            *(
+                SilverTask(
+                    name, silver_data, "bronze", shared_bronze=shared_bronze, ids="ids"
+                )
+                for name, silver_data in silver.items()
+            ),
+            GoldTask(
+                "gold",
+                SpaceXGold(),
+                "space_x_core_timelines",
+                "space_x_fairings",
+                "bronze",
+            ),
+        ]
+
+
+class TestTaskState:
+    def test_task_state_gets_the_outputs_that_still_exist(self, tmp_path):
+        output = f"{tmp_path}/bronze/2024_05_09__17_05_33/spacex_data.parquet"
+        os.makedirs(os.path.dirname(output))
+        with open(output, "w") as file:
+            file.write("parquet")
+        state = TaskState(f"{tmp_path}/state.json")
+        state.record("fingerprint", "bronze", "1", output, {"raw": "checksum"})
+        state.record("missing", "bronze", "1", f"{tmp_path}/missing.parquet", {})
+
+        state = TaskState(f"{tmp_path}/state.json")
+        assert state.get("fingerprint") == output
+        assert state.get("missing") is None
+        assert state.get("other_fingerprint") is None
+
+    def test_task_state_latest_returns_the_last_recorded_output_of_a_task(
+        self, tmp_path
+    ):
+        for name in ["first", "second", "cores"]:
+            with open(f"{tmp_path}/{name}.parquet", "w") as file:
+                file.write("parquet")
+        state = TaskState(f"{tmp_path}/state.json")
+        assert state.latest("bronze") is None
+
+        state.record("first", "bronze", "1", f"{tmp_path}/first.parquet", {})
+        state.record("second", "bronze", "1", f"{tmp_path}/second.parquet", {})
+        state.record("first", "bronze", "1", f"{tmp_path}/first.parquet", {})
+        state.record("cores", "cores", "1", f"{tmp_path}/cores.parquet", {})
+
+        assert TaskState(f"{tmp_path}/state.json").latest("bronze") == (
+            "first",
+            {
+                "task": "bronze",
+                "version": "1",
+                "output": f"{tmp_path}/first.parquet",
+                "inputs": {},
+            },
+        )
+
+    def test_link_output_links_an_output_in_the_snapshot_of_the_input(self, tmp_path):
+        output = f"{tmp_path}/silver/2024_05_09__17_05_33/cores_flight.parquet"
+        os.makedirs(os.path.dirname(output))
+        with open(output, "w") as file:
+            file.write("parquet")
+
+        linked_output = link_output(
+            output, f"{tmp_path}/bronze/2024_05_10__17_05_33/spacex_data.parquet"
+        )
+
+        assert (
+            linked_output
+            == f"{tmp_path}/silver/2024_05_10__17_05_33/cores_flight.parquet"
+        )
+        assert os.path.samefile(linked_output, output)
+
+    def test_link_output_links_every_file_of_a_partitioned_output(self, tmp_path):
+        output = f"{tmp_path}/silver/2024_05_09__17_05_33/fairings"
+        partition_file = f"{output}/year=2020/month=1/part-0.parquet"
+        os.makedirs(os.path.dirname(partition_file))
+        with open(partition_file, "w") as file:
+            file.write("parquet")
+
+        linked_output = link_output(
+            output, f"{tmp_path}/raw/2024_05_10__17_05_33/spacex_data.json"
+        )
+
+        assert linked_output == f"{tmp_path}/silver/2024_05_10__17_05_33/fairings"
+        assert os.path.samefile(
+            f"{linked_output}/year=2020/month=1/part-0.parquet", partition_file
+        )
+
+    def test_link_output_relinks_an_interrupted_link(self, tmp_path):
+        output = f"{tmp_path}/silver/2024_05_09__17_05_33/fairings"
+        partition_files = [
+            f"{output}/year=2020/month={month}/part-0.parquet" for month in [1, 2]
+        ]
+        for partition_file in partition_files:
+            os.makedirs(os.path.dirname(partition_file))
+            with open(partition_file, "w") as file:
+                file.write("parquet")
+        interrupted = f"{tmp_path}/silver/2024_05_10__17_05_33/fairings.part"
+        os.makedirs(f"{interrupted}/year=2020/month=1")
+        os.link(partition_files[0], f"{interrupted}/year=2020/month=1/part-0.parquet")
+
+        linked_output = link_output(
+            output, f"{tmp_path}/raw/2024_05_10__17_05_33/spacex_data.json"
+        )
+
+        assert linked_output == f"{tmp_path}/silver/2024_05_10__17_05_33/fairings"
+        assert not os.path.exists(interrupted)
+        for month, partition_file in zip([1, 2], partition_files):
+            assert os.path.samefile(
+                f"{linked_output}/year=2020/month={month}/part-0.parquet",
+                partition_file,
+            )